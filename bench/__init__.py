@@ -0,0 +1 @@
+"""Babel benchmarks -- run from the project root, e.g. ``python -m bench.writer_batch``."""
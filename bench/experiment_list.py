@@ -0,0 +1,108 @@
+"""Experiment listing latency by page depth: OFFSET + SELECT * vs keyset + projection.
+
+Seeds a temp database with experiments carrying realistically large text
+columns (system prompt, config, documentary), then times fetching page 1
+through page N both the old way (SELECT e.* ... LIMIT/OFFSET) and through
+Database.list_experiments with a keyset cursor. Keyset latency should stay
+flat with depth; OFFSET grows linearly.
+
+Usage:
+    python -m bench.experiment_list [--experiments 12000] [--page-size 20] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from server.db import Database, encode_list_cursor
+
+_OFFSET_SQL = (
+    "SELECT e.*, "
+    "CASE WHEN cm.initiative_a IS NOT NULL "
+    "THEN ROUND((1.0 - ABS(cm.initiative_a - cm.initiative_b) + cm.surprise_index) / 2.0, 4) "
+    "ELSE NULL END AS chm_score "
+    "FROM experiments e "
+    "LEFT JOIN collaboration_metrics cm ON cm.experiment_id = e.id "
+    "ORDER BY e.created_at DESC LIMIT ? OFFSET ?"
+)
+
+
+async def _seed(db: Database, count: int) -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    prompt = "You are a linguist inventing a shared language. " * 80
+    documentary = "In the beginning there was ZYLOK. " * 250
+    rows = [
+        (
+            uuid.uuid4().hex[:12],
+            (start + timedelta(minutes=i)).isoformat(),
+            "anthropic/claude-sonnet-4-20250514", "openai/gpt-4o", "conlang",
+            "Invent a word for the color of silence.", prompt, 15, 15, "completed",
+            json.dumps({"temperature": 0.7, "max_tokens": 1500, "notes": "x" * 500}),
+            documentary,
+        )
+        for i in range(count)
+    ]
+    async with db._write_lock:
+        await db.db.executemany(
+            """INSERT INTO experiments
+               (id, created_at, model_a, model_b, preset, seed, system_prompt,
+                rounds_planned, rounds_completed, status, config_json, documentary)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+        await db.db.commit()
+
+
+async def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(samples), 2)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--experiments", type=int, default=12000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    size = args.page_size
+    pages = [p for p in (1, 10, 100, 250, 500) if (p - 1) * size < args.experiments]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        await db.connect()
+        try:
+            await _seed(db, args.experiments)
+            # Cursor for the row just before each page, as a client would hold it
+            ordered = await db.fetchall(
+                "SELECT created_at, id FROM experiments ORDER BY created_at DESC, id DESC"
+            )
+            results = []
+            for page in pages:
+                offset = (page - 1) * size
+                cursor = None
+                if offset:
+                    prev = ordered[offset - 1]
+                    cursor = encode_list_cursor(prev["created_at"], prev["id"])
+                old_ms = await _time(lambda: db.fetchall(_OFFSET_SQL, (size, offset)), args.repeat)
+                new_ms = await _time(lambda: db.list_experiments(limit=size, cursor=cursor), args.repeat)
+                results.append({"page": page, "offset_select_star_ms": old_ms, "keyset_projection_ms": new_ms})
+        finally:
+            await db.close()
+
+    print(json.dumps({"experiments": args.experiments, "page_size": size, "pages": results}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
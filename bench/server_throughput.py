@@ -0,0 +1,301 @@
+"""End-to-end server throughput: relays, replications, RPG, tournaments and SSE viewers.
+
+Boots create_app() under uvicorn on a free localhost port, against a temp
+database and the fake LLM provider (server/fake_profiles/<--profile>, rate
+limits and the response cache off). For each concurrency level L it opens
+--viewers SSE clients on /api/relay/stream, then launches through the HTTP API:
+
+  L x POST /api/relay/start                   (2-agent standard relays)
+  1 x POST /api/relay/replicate                (replication_count = L, max 10)
+  ceil(L/4) x POST /api/relay/start mode=rpg   (DM + two AI companions)
+  ceil(L/8) x POST /api/tournaments/start      (3 models -> 3 matches)
+
+and waits for every experiment and tournament to finish. Per level it reports
+turns/sec, turn-to-SSE delivery latency (event publish timestamp to viewer
+receipt, p50/p95/p99), writer queue depth, event-loop lag and RSS. The JSON
+report is meant to be diffed between versions (--out to also write a file).
+
+The load generator and viewers share the server's process and event loop,
+so loop lag and RSS include them; compare reports taken with the same flags.
+
+Usage:
+    python -m bench.server_throughput [--levels 1,4,16] [--viewers 8] [--rounds 3]
+        [--profile bench] [--out report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Server modules read these at import: point the database at a temp file and
+# keep every call on the fake provider, unthrottled and uncached.
+_TMP = tempfile.TemporaryDirectory(prefix="babel-bench-")
+os.environ["BABEL_DB_PATH"] = str(Path(_TMP.name) / "babel.db")
+os.environ["LLM_CACHE_ENABLED"] = "0"
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+import httpx
+import uvicorn
+
+from server import fake_llm
+from server.app import create_app
+from server.config import PROVIDER_RATE_LIMITS
+
+MODELS = ["openai/gpt-4.1-nano", "gemini/gemini-2.5-flash-lite", "openai/gpt-4.1-mini"]
+_DONE = {"completed", "failed", "stopped", "cancelled"}
+_SAMPLE_S = 0.1
+_POLL_S = 0.5
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb() -> float | None:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1)], 2)
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+class _Sampler:
+    """Event-loop lag, writer queue depth and RSS every _SAMPLE_S seconds."""
+
+    def __init__(self, db) -> None:
+        self.db = db
+        self.lag_ms: list[float] = []
+        self.queue_depth: list[int] = []
+        self.rss_mb: list[float] = []
+
+    async def run(self) -> None:
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(_SAMPLE_S)
+            self.lag_ms.append((time.perf_counter() - t0 - _SAMPLE_S) * 1000)
+            self.queue_depth.append(self.db.metrics()["writer"]["queue_depth"])
+            if (rss := _rss_mb()) is not None:
+                self.rss_mb.append(rss)
+
+
+async def _viewer(client: httpx.AsyncClient, turns: set, delivery_ms: list[float], ready: asyncio.Event) -> None:
+    """One SSE client: records every relay.turn and how long it took to arrive."""
+    async with client.stream("GET", "/api/relay/stream", params={"include_history": "false"}) as resp:
+        ready.set()
+        async for line in resp.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[6:])
+            if event.get("type") == "relay.turn":
+                delivery_ms.append((time.time() - event["timestamp"]) * 1000)
+                turns.add((event.get("match_id"), event.get("turn_id")))
+
+
+async def _launch(client: httpx.AsyncClient, level: int, rounds: int) -> tuple[list[str], list[str]]:
+    relay = {
+        "model_a": MODELS[0], "model_b": MODELS[1], "rounds": rounds,
+        "max_tokens": 300, "enable_scoring": True, "enable_verdict": True,
+    }
+    rpg = {
+        "mode": "rpg", "rounds": rounds, "max_tokens": 300,
+        "participants": [
+            {"name": "Narrator", "model": MODELS[0], "role": "dm"},
+            {"name": "Aria", "model": MODELS[1], "role": "companion"},
+            {"name": "Bram", "model": MODELS[2], "role": "companion"},
+        ],
+    }
+    tournament = {"name": f"bench L{level}", "models": MODELS, "rounds": rounds, "max_tokens": 300}
+
+    calls = [client.post("/api/relay/start", json=relay) for _ in range(level)]
+    calls.append(client.post("/api/relay/replicate", json={**relay, "replication_count": min(level, 10)}))
+    calls += [client.post("/api/relay/start", json=rpg) for _ in range(math.ceil(level / 4))]
+    calls += [client.post("/api/tournaments/start", json=tournament) for _ in range(math.ceil(level / 8))]
+    experiments: list[str] = []
+    tournaments: list[str] = []
+    for resp in await asyncio.gather(*calls):
+        resp.raise_for_status()
+        body = resp.json()
+        if "tournament_id" in body:
+            tournaments.append(body["tournament_id"])
+        elif "experiment_ids" in body:
+            experiments += body["experiment_ids"]
+        else:
+            experiments.append(body["match_id"])
+    return experiments, tournaments
+
+
+async def _wait(client: httpx.AsyncClient, experiments: list[str], tournaments: list[str], timeout: float) -> dict:
+    """Poll until everything launched is finished; returns experiment status counts."""
+    deadline = time.monotonic() + timeout
+    pending = [f"/api/experiments/{e}" for e in experiments] + [f"/api/tournaments/{t}" for t in tournaments]
+    statuses: dict[str, str] = {}
+    while pending:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{len(pending)} experiment(s)/tournament(s) still running after {timeout}s")
+        await asyncio.sleep(_POLL_S)
+        still = []
+        for url, resp in zip(pending, await asyncio.gather(*[client.get(url) for url in pending])):
+            status = resp.json()["status"] if resp.status_code == 200 else "running"
+            if status in _DONE:
+                statuses[url] = status
+            else:
+                still.append(url)
+        pending = still
+    counts: dict[str, int] = {}
+    for url, status in statuses.items():
+        if url.startswith("/api/experiments/"):
+            counts[status] = counts.get(status, 0) + 1
+    return counts
+
+
+async def _level(client: httpx.AsyncClient, db, level: int, args) -> dict:
+    turns: set = set()
+    delivery_ms: list[float] = []
+    readies = [asyncio.Event() for _ in range(args.viewers)]
+    viewers = [asyncio.create_task(_viewer(client, turns, delivery_ms, r)) for r in readies]
+    await asyncio.wait_for(asyncio.gather(*[r.wait() for r in readies]), 10)
+
+    sampler = _Sampler(db)
+    sampling = asyncio.create_task(sampler.run())
+    rss_start = _rss_mb()
+    t0 = time.perf_counter()
+    try:
+        experiments, tournaments = await _launch(client, level, args.rounds)
+        statuses = await _wait(client, experiments, tournaments, args.timeout)
+        elapsed = time.perf_counter() - t0
+        await asyncio.sleep(_POLL_S)  # let the last SSE frames land
+    finally:
+        sampling.cancel()
+        for task in viewers:
+            task.cancel()
+        await asyncio.gather(sampling, *viewers, return_exceptions=True)
+
+    # Tournament matches are experiments too, so count the ones seen on the stream
+    matches = {match_id for match_id, _ in turns}
+    return {
+        "level": level,
+        "experiments": len(matches),
+        "tournaments": len(tournaments),
+        "statuses": statuses,
+        "elapsed_s": round(elapsed, 2),
+        "turns": len(turns),
+        "turns_per_sec": round(len(turns) / elapsed, 2),
+        "delivery_ms": {
+            "samples": len(delivery_ms),
+            "p50": _pct(delivery_ms, 50),
+            "p95": _pct(delivery_ms, 95),
+            "p99": _pct(delivery_ms, 99),
+            "max": _pct(delivery_ms, 100),
+        },
+        "loop_lag_ms": {
+            "p50": _pct(sampler.lag_ms, 50),
+            "p99": _pct(sampler.lag_ms, 99),
+            "max": _pct(sampler.lag_ms, 100),
+        },
+        "writer_queue_depth": {
+            "mean": round(sum(sampler.queue_depth) / len(sampler.queue_depth), 2) if sampler.queue_depth else None,
+            "max": max(sampler.queue_depth, default=None),
+        },
+        "rss_mb": {"start": rss_start, "peak": max(sampler.rss_mb, default=rss_start)},
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--viewers", type=int, default=8, help="SSE clients on /api/relay/stream")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--profile", default="bench", help="fake LLM profile name or YAML path")
+    parser.add_argument("--seed", type=int, default=0, help="fake LLM seed")
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds to wait per level")
+    parser.add_argument("--out", type=Path, help="also write the report here")
+    args = parser.parse_args()
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    if args.viewers < 1:
+        parser.error("--viewers must be at least 1 (turns are counted on the stream)")
+
+    for provider in PROVIDER_RATE_LIMITS:
+        os.environ[f"RATE_LIMIT_{provider.upper()}"] = "0,0"
+    fake_llm.install(args.profile, seed=args.seed)
+
+    app = create_app()
+    server = uvicorn.Server(uvicorn.Config(
+        app, host="127.0.0.1", port=_free_port(), log_level="warning", timeout_graceful_shutdown=5,
+    ))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()
+        await asyncio.sleep(0.05)
+
+    host, port = server.servers[0].sockets[0].getsockname()[:2]
+    limits = httpx.Limits(max_connections=args.viewers + 64)
+    results = []
+    try:
+        async with httpx.AsyncClient(base_url=f"http://{host}:{port}", timeout=60, limits=limits) as client:
+            for level in levels:
+                results.append(await _level(client, app.state.db, level, args))
+                print(f"level {level}: {results[-1]['turns_per_sec']} turns/s", file=sys.stderr)
+    finally:
+        server.should_exit = True
+        await serving
+        fake_llm.uninstall()
+
+    report = {
+        "bench": "server_throughput",
+        "git": _git_rev(),
+        "python": platform.python_version(),
+        "settings": {
+            "levels": levels, "viewers": args.viewers, "rounds": args.rounds,
+            "profile": args.profile, "seed": args.seed, "models": MODELS,
+        },
+        "levels": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        args.out.write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    finally:
+        _TMP.cleanup()
@@ -0,0 +1,97 @@
+"""Turn-assembly latency: two DB reads per turn vs the layered-context cache.
+
+Seeds a temp database with matches that carry a cold summary and a world
+bible, then times fetching layered context for every turn of every match
+both the old way (get_latest_cold_summary + get_world_state) and through
+Database.get_layered_context, with background relay writes in flight so
+the reads compete for the pool the way they do under load. Summaries are
+refreshed every second round, as update_layered_context does.
+
+Usage:
+    python -m bench.turn_context [--matches 8] [--rounds 30] [--agents 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from server.db import Database
+
+BIBLE = json.dumps({
+    "npcs": [{"name": f"NPC {i}", "status": "wary " * 20} for i in range(12)],
+    "locations": [{"name": f"Place {i}", "status": "ruined " * 15} for i in range(8)],
+    "items": [],
+})
+
+
+async def _match(db: Database, rounds: int, agents: int, cached: bool) -> list[float]:
+    match_id = await db.create_experiment(
+        model_a="bench/a", model_b="bench/b", seed="seed",
+        system_prompt="bench", rounds_planned=rounds,
+    )
+    await db.save_cold_summary(match_id, 0, "The party met at the ruined gate. " * 6)
+    await db.save_world_state(match_id, BIBLE)
+    samples: list[float] = []
+    try:
+        for round_num in range(1, rounds + 1):
+            for idx in range(agents):
+                t0 = time.perf_counter()
+                if cached:
+                    layered = await db.get_layered_context(match_id)
+                    _ = (layered.cold_summary, layered.world_bible)
+                else:
+                    await db.get_latest_cold_summary(match_id)
+                    await db.get_world_state(match_id)
+                samples.append((time.perf_counter() - t0) * 1000)
+                await db.add_turn(
+                    experiment_id=match_id, round_num=round_num, speaker=f"P{idx}",
+                    model="bench/a", content="The torchlight flickers. " * 30,
+                    latency_seconds=1.0, token_count=200,
+                )
+            if round_num % 2 == 0:
+                await db.save_cold_summary(match_id, round_num, f"Recap through round {round_num}. " * 6)
+                await db.save_world_state(match_id, BIBLE)
+    finally:
+        db.evict_layered_context(match_id)
+    return samples
+
+
+async def _run(matches: int, rounds: int, agents: int, cached: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        await db.connect()
+        try:
+            per_match = await asyncio.gather(*[_match(db, rounds, agents, cached) for _ in range(matches)])
+            cache = db.metrics()["context_cache"]
+        finally:
+            await db.close()
+    samples = sorted(s for group in per_match for s in group)
+    return {
+        "turns": len(samples),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "total_ms": round(sum(samples), 1),
+        "cache": cache if cached else None,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--matches", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--agents", type=int, default=3)
+    args = parser.parse_args()
+
+    before = await _run(args.matches, args.rounds, args.agents, cached=False)
+    after = await _run(args.matches, args.rounds, args.agents, cached=True)
+    print(json.dumps({"db_reads": before, "context_cache": after}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
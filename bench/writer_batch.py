@@ -0,0 +1,96 @@
+"""Writer-queue throughput: per-statement commit vs group commit.
+
+Simulates N concurrent relay sessions each writing the rows a real round
+produces (turn insert, a few vocab upserts, status update, rpg_state upsert)
+against a temp database, once with write_batch_size=1 (one commit per
+statement, the pre-group-commit behaviour) and once with the configured
+batch size. Prints rows/sec for each and the speedup.
+
+Usage:
+    python -m bench.writer_batch [--sessions 8] [--rounds 20] [--batch 64] [--flush-ms 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from server.config import DB_WRITE_BATCH_SIZE, DB_WRITE_FLUSH_MS
+from server.db import Database
+
+WORDS_PER_TURN = 4
+
+
+async def _session(db: Database, rounds: int) -> int:
+    """Write one session's worth of rows. Returns the number of statements issued."""
+    match_id = await db.create_experiment(
+        model_a="bench/a", model_b="bench/b", seed="seed",
+        system_prompt="bench", rounds_planned=rounds,
+    )
+    rows = 1
+    for round_num in range(1, rounds + 1):
+        for speaker in ("A", "B"):
+            await db.add_turn(
+                experiment_id=match_id, round_num=round_num, speaker=speaker,
+                model=f"bench/{speaker.lower()}", content="ZYLOK KRAVT " * 40,
+                latency_seconds=1.5, token_count=300,
+            )
+            await asyncio.gather(*[
+                db.upsert_word(match_id, f"W{round_num}{speaker}{i}", meaning="m",
+                               coined_by=speaker, coined_round=round_num)
+                for i in range(WORDS_PER_TURN)
+            ])
+            await db.save_rpg_state(match_id, round_num, 0, False)
+            rows += 2 + WORDS_PER_TURN
+        await db.update_experiment_status(match_id, "running", rounds_completed=round_num)
+        rows += 1
+    return rows
+
+
+async def _run(batch_size: int, flush_ms: float, sessions: int, rounds: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db", write_batch_size=batch_size, write_flush_ms=flush_ms)
+        await db.connect()
+        try:
+            t0 = time.perf_counter()
+            counts = await asyncio.gather(*[_session(db, rounds) for _ in range(sessions)])
+            elapsed = time.perf_counter() - t0
+            writer = db.metrics()["writer"]
+        finally:
+            await db.close()
+    total = sum(counts)
+    return {
+        "batch_size": batch_size,
+        "flush_ms": flush_ms,
+        "rows": total,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_sec": round(total / elapsed, 1),
+        "avg_batch": writer["avg_batch"],
+        "max_batch": writer["max_batch"],
+        "writes_elided": writer["writes_elided"],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=DB_WRITE_BATCH_SIZE)
+    parser.add_argument("--flush-ms", type=float, default=DB_WRITE_FLUSH_MS)
+    args = parser.parse_args()
+
+    baseline = await _run(1, 0.0, args.sessions, args.rounds)
+    grouped = await _run(args.batch, args.flush_ms, args.sessions, args.rounds)
+    print(json.dumps({
+        "per_statement_commit": baseline,
+        "group_commit": grouped,
+        "speedup": round(grouped["rows_per_sec"] / baseline["rows_per_sec"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
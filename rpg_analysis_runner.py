@@ -366,11 +366,6 @@ for i, cfg in enumerate(sessions, 1):
         results.append({"name": cfg["name"], "status": f"error: {e}",
                         "match_id": "?", "dm": dm_label})
 
-    if i < len(sessions):
-        pause = 10 if cfg["rounds"] >= 8 else 6
-        print(f"  (pausing {pause}s)")
-        time.sleep(pause)
-
 print("\n" + "="*70)
 print("ANALYSIS RUNNER SUMMARY")
 print("="*70)
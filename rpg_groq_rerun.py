@@ -428,7 +428,7 @@ if __name__ == "__main__":
                 "max_tokens":         600,
                 "temperature_a":      0.8,
                 "temperature_b":      0.8,
-                "turn_delay_seconds": 2,
+                "turn_delay_seconds": 0,
                 "seed":               cfg["seed"],
                 "participants":       cfg["participants"],
                 "rpg_config":         cfg["rpg_config"],
@@ -465,11 +465,7 @@ if __name__ == "__main__":
                 "dm":       dm_label,
                 "rounds":   "?",
             })
-
-        if i < len(sessions):
-            pause = 30
-            print(f"  (pausing {pause}s before next session...)\n")
-            time.sleep(pause)
+        print()
 
     print("\n" + "=" * 70)
     print("RERUN SUMMARY")
@@ -252,10 +252,6 @@ for i, cfg in enumerate(sessions, 1):
         results.append({"name": cfg["name"], "status": f"error: {e}", "match_id": "?",
                         "dm": dm_label, "players": player_labels})
 
-    if i < len(sessions):
-        print("  (pausing 8s before next session)")
-        time.sleep(8)
-
 print("\n" + "="*70)
 print("MULTI-PLAYER SUMMARY")
 print("="*70)
@@ -339,10 +339,6 @@ for i, cfg in enumerate(sessions, 1):
         results.append({"name": cfg["name"], "match_id": "?", "status": f"error: {e}",
                          "dm": dm_label, "players": player_labels})
 
-    if i < len(sessions):
-        print("  (pausing 5s before next session)")
-        time.sleep(5)
-
 # ---------------------------------------------------------------------------
 # Summary
 # ---------------------------------------------------------------------------
@@ -13,9 +13,8 @@ Pattern targets:
   P13  -- hidden-information deception persistence (1 session, Deepseek as secret culprit)
   rerun-- samemodel-claude-v2 with simplified negotiator framing (replaces failed adversarial run)
 
-Run order is interleaved to distribute Claude/Anthropic API calls and avoid rate-limit bursts.
-Between-session pause: 30 seconds.
-Per-turn delay: 2 seconds (reduces burst rate on all providers).
+Run order is interleaved to distribute Claude/Anthropic API calls.
+No fixed pauses: the server's per-provider rate limiter paces model calls.
 """
 import sqlite3
 import time
@@ -821,7 +820,7 @@ if __name__ == "__main__":
                 "max_tokens":         600,
                 "temperature_a":      0.8,
                 "temperature_b":      0.8,
-                "turn_delay_seconds": 2,       # rate-limit protection
+                "turn_delay_seconds": 0,
                 "seed":               cfg["seed"],
                 "participants":       cfg["participants"],
                 "rpg_config":         cfg["rpg_config"],
@@ -858,11 +857,7 @@ if __name__ == "__main__":
                 "dm":       dm_label,
                 "rounds":   "?",
             })
-
-        if i < len(sessions):
-            pause = 30      # generous pause -- reduces Anthropic/Groq rate-limit risk
-            print(f"  (pausing {pause}s before next session...)\n")
-            time.sleep(pause)
+        print()
 
     print("\n" + "=" * 70)
     print("STRESS RUNNER SUMMARY")
@@ -18,9 +18,11 @@ os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from server import cassette
 from server.db import Database
 from server.event_hub import EventHub
 from server.presets import load_presets
+from server.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +96,8 @@ async def lifespan(app: FastAPI):
         await db.save_system_events(events_to_save)
         logger.info("Persisted %d events to system_events", len(events_to_save))
 
+    await response_cache.close()
+    await cassette.flush()
     await db.close()
     logger.info("Babel shutdown complete")
 
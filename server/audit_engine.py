@@ -140,7 +140,6 @@ async def run_audit(
                 hub=hub,
                 db=db,
                 relay_config=RelayConfig(
-                    turn_delay_seconds=1.0,
                     preset="audit",
                     enable_verdict=True,
                     parent_experiment_id=source_experiment_id,
@@ -0,0 +1,332 @@
+"""Record/replay cassettes for outbound LLM calls.
+
+Every completion the server makes (relay turns, judge, summarizer, RPG menus,
+documentaries) goes through acompletion() below. With a cassette active:
+
+  record  the call goes to the provider as usual; request, response content,
+          usage and latency are appended to <LLM_CASSETTE_DIR>/<name>.jsonl
+          (by a background writer thread, in call order; flush() waits for it)
+  replay  the call is answered from the cassette with no network; a request
+          that was never recorded raises CassetteMiss (a 404-style error, so
+          call_model fails fast instead of retrying)
+
+Recordings are keyed by a hash of the normalized request (model, role +
+content of each message, temperature, max_tokens, response_format), so API
+keys never reach the file and the same session replays deterministically.
+Identical requests replay in recorded order; the last answer then repeats.
+
+A cassette is chosen per process (LLM_CASSETTE_MODE / LLM_CASSETTE) or per
+experiment (RelayConfig / RPGConfig cassette_mode + cassette_name, held in a
+context variable so concurrent experiments don't see each other's cassette).
+While one is active the response cache is bypassed, so every call is captured,
+and replayed calls skip the rate limiter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+import litellm
+
+from server import fake_llm
+from server.config import (
+    LLM_CASSETTE,
+    LLM_CASSETTE_DIR,
+    LLM_CASSETTE_MODE,
+    LLM_CASSETTE_REPLAY_LATENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+OFF, RECORD, REPLAY = "off", "record", "replay"
+_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,99}$")
+_REPLAY_STREAM_CHUNKS = 8   # deltas per replayed streamed response
+
+
+class CassetteMiss(litellm.NotFoundError):
+    """Replay found no recording for a request."""
+
+    def __init__(self, cassette: str, model: str, key: str) -> None:
+        super().__init__(
+            message=f"No recording in cassette '{cassette}' for {model} request {key[:12]}",
+            model=model,
+            llm_provider="cassette",
+        )
+
+
+def valid_name(name: str) -> bool:
+    """Cassette names become file names: letters, digits, '_', '.', '-' only."""
+    return bool(_NAME_RE.match(name)) and ".." not in name
+
+
+def request_key(kwargs: dict) -> str:
+    """sha256 over the parts of a completion request that determine its answer."""
+    messages = [
+        {"role": m.get("role"), "content": m.get("content")}
+        for m in kwargs.get("messages") or []
+    ]
+    payload = json.dumps(
+        [kwargs["model"], messages, kwargs.get("temperature"),
+         kwargs.get("max_tokens"), kwargs.get("response_format")],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _usage_dict(usage) -> dict | None:
+    if usage is None:
+        return None
+    if not isinstance(usage, dict):
+        usage = {k: getattr(usage, k, None) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
+    return {
+        k: usage[k] for k in ("prompt_tokens", "completion_tokens", "total_tokens")
+        if usage.get(k) is not None
+    } or None
+
+
+class Cassette:
+    """One JSONL recording file, opened for either record or replay."""
+
+    def __init__(
+        self,
+        name: str,
+        mode: str,
+        directory: Path = LLM_CASSETTE_DIR,
+        replay_latency: bool = LLM_CASSETTE_REPLAY_LATENCY,
+    ) -> None:
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode '{mode}'")
+        if not valid_name(name):
+            raise ValueError(f"Invalid cassette name '{name}'")
+        self.name = name
+        self.mode = mode
+        self.path = directory / f"{name}.jsonl"
+        self.replay_latency = replay_latency
+        self._entries: dict[str, list[dict]] | None = None
+        self._cursor: dict[str, int] = {}
+        self._pending: list[str] = []   # recorded lines not yet on disk, in call order
+        self._writer: asyncio.Task | None = None
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    def _load(self) -> dict[str, list[dict]]:
+        if self._entries is None:
+            entries: dict[str, list[dict]] = {}
+            if self.path.exists():
+                with self.path.open(encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            rec = json.loads(line)
+                            entries.setdefault(rec["key"], []).append(rec)
+            self._entries = entries
+            logger.info("Cassette %s: %d recorded requests", self.name, len(entries))
+        return self._entries
+
+    def lookup(self, key: str) -> dict | None:
+        recs = self._load().get(key)
+        if not recs:
+            self.misses += 1
+            return None
+        i = self._cursor.get(key, 0)
+        self._cursor[key] = i + 1
+        self.replayed += 1
+        return recs[min(i, len(recs) - 1)]
+
+    def record(
+        self,
+        key: str,
+        kwargs: dict,
+        content: str,
+        finish_reason: str | None,
+        usage: dict | None,
+        latency_s: float,
+    ) -> None:
+        rec = {
+            "key": key,
+            "model": kwargs["model"],
+            "request": {
+                "messages": [
+                    {"role": m.get("role"), "content": m.get("content")}
+                    for m in kwargs.get("messages") or []
+                ],
+                "temperature": kwargs.get("temperature"),
+                "max_tokens": kwargs.get("max_tokens"),
+                "response_format": kwargs.get("response_format"),
+            },
+            "content": content,
+            "finish_reason": finish_reason,
+            "usage": usage,
+            "latency_s": round(latency_s, 3),
+            "recorded_at": time.time(),
+        }
+        # Order is fixed here; one writer task appends batches off the event loop
+        self._pending.append(json.dumps(rec, ensure_ascii=False) + "\n")
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._drain())
+            _writers.add(self._writer)   # outlives this cassette being replaced in _cassettes
+            self._writer.add_done_callback(_writers.discard)
+
+    async def _drain(self) -> None:
+        while self._pending:
+            lines, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError as exc:
+                logger.warning("Cassette %s: write of %d record(s) failed: %s", self.name, len(lines), exc)
+                continue
+            self.recorded += len(lines)
+
+    def _append(self, lines: list[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    async def flush(self) -> None:
+        """Wait until every recorded call is on disk."""
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "path": str(self.path),
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+
+# -- Active cassette ----------------------------------------------------------
+
+_cassettes: dict[tuple[str, str], Cassette] = {}
+_writers: set[asyncio.Task] = set()
+_active: contextvars.ContextVar[Cassette | None] = contextvars.ContextVar("cassette", default=None)
+
+
+def current() -> Cassette | None:
+    """The experiment's cassette, else the process-wide one, else None."""
+    cassette = _active.get()
+    if cassette is None and LLM_CASSETTE_MODE in (RECORD, REPLAY):
+        cassette = _cassettes.get((LLM_CASSETTE, LLM_CASSETTE_MODE))
+        if cassette is None:
+            cassette = _cassettes[(LLM_CASSETTE, LLM_CASSETTE_MODE)] = Cassette(LLM_CASSETTE, LLM_CASSETTE_MODE)
+    return cassette
+
+
+def replaying() -> bool:
+    cassette = current()
+    return cassette is not None and cassette.mode == REPLAY
+
+
+def activate(mode: str, name: str) -> contextvars.Token | None:
+    """Use cassette name for this task and the tasks it spawns ("off" = no-op).
+
+    Each activation opens the file afresh, so an experiment's replay never
+    depends on what earlier replays of the same cassette consumed.
+    """
+    if mode == OFF:
+        return None
+    cassette = _cassettes[(name, mode)] = Cassette(name, mode)
+    return _active.set(cassette)
+
+
+def deactivate(token: contextvars.Token | None) -> None:
+    if token is not None:
+        _active.reset(token)
+
+
+async def flush() -> None:
+    """Wait for every cassette's pending records to reach disk (e.g. at shutdown)."""
+    while _writers:
+        await asyncio.gather(*_writers, return_exceptions=True)
+
+
+def stats() -> dict[str, dict]:
+    return {f"{name} ({mode})": c.stats() for (name, mode), c in sorted(_cassettes.items())}
+
+
+# -- Completion ---------------------------------------------------------------
+
+async def _replay_stream(rec: dict, model: str, delay: float) -> AsyncIterator:
+    content = rec["content"]
+    step = max(1, -(-len(content) // _REPLAY_STREAM_CHUNKS))
+    pieces = [content[i:i + step] for i in range(0, len(content), step)]
+    for piece in pieces:
+        if delay:
+            await asyncio.sleep(delay / len(pieces))
+        yield litellm.ModelResponseStream(
+            model=model, choices=[{"index": 0, "delta": {"content": piece}}],
+        )
+    yield litellm.ModelResponseStream(
+        model=model,
+        choices=[{"index": 0, "delta": {"content": None},
+                  "finish_reason": rec.get("finish_reason") or "stop"}],
+        usage=rec.get("usage") or None,
+    )
+
+
+async def _recording_stream(response, cassette: Cassette, key: str, kwargs: dict, t0: float) -> AsyncIterator:
+    parts: list[str] = []
+    usage = None
+    finish_reason = None
+    async for chunk in response:
+        choices = getattr(chunk, "choices", None) or []
+        if choices:
+            delta = getattr(choices[0].delta, "content", None)
+            if delta:
+                parts.append(delta)
+            finish_reason = getattr(choices[0], "finish_reason", None) or finish_reason
+        usage = getattr(chunk, "usage", None) or usage
+        yield chunk
+    if parts:
+        cassette.record(key, kwargs, "".join(parts), finish_reason, _usage_dict(usage), time.time() - t0)
+
+
+async def acompletion(**kwargs):
+    """litellm.acompletion (or the fake provider), recorded to or replayed from the active cassette."""
+    cassette = current()
+    if cassette is None:
+        return await fake_llm.acompletion(**kwargs)
+    key = request_key(kwargs)
+    model = kwargs["model"]
+    if cassette.mode == REPLAY:
+        rec = cassette.lookup(key)
+        if rec is None:
+            raise CassetteMiss(cassette.name, model, key)
+        delay = rec.get("latency_s", 0.0) if cassette.replay_latency else 0.0
+        if kwargs.get("stream"):
+            return _replay_stream(rec, model, delay)
+        if delay:
+            await asyncio.sleep(delay)
+        return litellm.ModelResponse(
+            model=model,
+            choices=[{
+                "index": 0,
+                "message": {"role": "assistant", "content": rec["content"]},
+                "finish_reason": rec.get("finish_reason") or "stop",
+            }],
+            usage=rec.get("usage") or {},
+        )
+    t0 = time.time()
+    response = await fake_llm.acompletion(**kwargs)
+    if kwargs.get("stream"):
+        return _recording_stream(response, cassette, key, kwargs, t0)
+    choice = response.choices[0]
+    if choice.message.content:
+        cassette.record(
+            key, kwargs, choice.message.content, choice.finish_reason,
+            _usage_dict(getattr(response, "usage", None)), time.time() - t0,
+        )
+    return response
@@ -0,0 +1,162 @@
+"""Per-route circuit breakers fed by call_model outcomes.
+
+A route is a model string, optionally suffixed with the backup-key env var it
+is called with ("gemini/gemini-2.5-flash [GEMINI_API_KEY_BACKUP]"), since a
+second key has its own quota. Each breaker keeps a rolling window of recent
+calls (success + latency):
+
+  closed     normal routing; trips open after CONSECUTIVE_FAILURES failures in
+             a row or an error rate >= ERROR_RATE_TRIP over >= MIN_CALLS calls
+  open       callers route straight to the healthiest fallback; after the
+             cooldown the breaker goes half-open
+  half_open  one background probe (see relay_engine) decides: success closes
+             the breaker, failure re-opens it with a doubled cooldown
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from collections import deque
+
+from server import sim_clock
+
+logger = logging.getLogger(__name__)
+
+WINDOW_CALLS = 20              # rolling window size per route
+WINDOW_S = 600.0               # outcomes older than this are forgotten
+MIN_CALLS = 5                  # error-rate trip needs at least this many calls
+ERROR_RATE_TRIP = 0.5
+CONSECUTIVE_FAILURES = 3
+BASE_COOLDOWN_S = 30.0
+MAX_COOLDOWN_S = 600.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """Rolling health and open/half-open/closed state for one route."""
+
+    def __init__(self, route: str) -> None:
+        self.route = route
+        self.state = CLOSED
+        self._window: deque[tuple[float, bool, float]] = deque(maxlen=WINDOW_CALLS)
+        self._consecutive_failures = 0
+        self._cooldown = BASE_COOLDOWN_S
+        self._open_until = 0.0
+        self._opened_count = 0
+
+    def _prune(self, now: float) -> None:
+        while self._window and now - self._window[0][0] > WINDOW_S:
+            self._window.popleft()
+
+    def error_rate(self) -> float:
+        self._prune(sim_clock.monotonic())
+        if not self._window:
+            return 0.0
+        return sum(1 for _, ok, _ in self._window if not ok) / len(self._window)
+
+    def median_latency(self) -> float | None:
+        self._prune(sim_clock.monotonic())
+        latencies = [lat for _, ok, lat in self._window if ok]
+        return statistics.median(latencies) if latencies else None
+
+    def latency_quantile(self, q: float) -> float | None:
+        """Latency at quantile q of recent successes (None below MIN_CALLS samples)."""
+        self._prune(sim_clock.monotonic())
+        latencies = [lat for _, ok, lat in self._window if ok]
+        if len(latencies) < MIN_CALLS:
+            return None
+        return statistics.quantiles(latencies, n=100, method="inclusive")[round(q * 100) - 1]
+
+    def allows(self) -> bool:
+        """True when normal traffic may use this route."""
+        return self.state == CLOSED
+
+    def health_key(self) -> tuple[bool, float, float]:
+        """Sort key: closed before open, then lower error rate, then lower latency."""
+        return (not self.allows(), self.error_rate(), self.median_latency() or 0.0)
+
+    def record(self, ok: bool, latency: float) -> None:
+        now = sim_clock.monotonic()
+        self._prune(now)
+        self._window.append((now, ok, latency))
+        if ok:
+            self._consecutive_failures = 0
+            if self.state != CLOSED:
+                # A real call got through (e.g. every route was open) -- trust it
+                self._close()
+            return
+        self._consecutive_failures += 1
+        if self.state != CLOSED:
+            return
+        failures = sum(1 for _, good, _ in self._window if not good)
+        if (self._consecutive_failures >= CONSECUTIVE_FAILURES
+                or (len(self._window) >= MIN_CALLS and failures / len(self._window) >= ERROR_RATE_TRIP)):
+            self._open(now)
+
+    def probe_due(self) -> bool:
+        """True once per cooldown expiry: the caller should probe now (breaker goes half-open)."""
+        if self.state == OPEN and sim_clock.monotonic() >= self._open_until:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def probe_result(self, ok: bool) -> None:
+        if ok:
+            logger.info("Circuit for %s closed after successful probe", self.route)
+            self._close()
+        else:
+            self._cooldown = min(MAX_COOLDOWN_S, self._cooldown * 2)
+            self._open(sim_clock.monotonic())
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self._open_until = now + self._cooldown
+        self._opened_count += 1
+        logger.warning(
+            "Circuit for %s opened (error rate %.0f%%, %d consecutive failures); retry in %.0fs",
+            self.route, self.error_rate() * 100, self._consecutive_failures, self._cooldown,
+        )
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self._window.clear()
+        self._consecutive_failures = 0
+        self._cooldown = BASE_COOLDOWN_S
+
+    def stats(self) -> dict:
+        median = self.median_latency()
+        p90 = self.latency_quantile(0.9)
+        return {
+            "state": self.state,
+            "calls": len(self._window),
+            "error_rate": round(self.error_rate(), 3),
+            "median_latency_s": round(median, 2) if median is not None else None,
+            "p90_latency_s": round(p90, 2) if p90 is not None else None,
+            "consecutive_failures": self._consecutive_failures,
+            "opened_count": self._opened_count,
+            "retry_in_s": (
+                round(max(0.0, self._open_until - sim_clock.monotonic()), 1)
+                if self.state == OPEN else None
+            ),
+        }
+
+
+class BreakerRegistry:
+    """Process-wide breakers, created on first use."""
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, route: str) -> CircuitBreaker:
+        breaker = self._breakers.get(route)
+        if breaker is None:
+            breaker = self._breakers[route] = CircuitBreaker(route)
+        return breaker
+
+    def stats(self) -> dict[str, dict]:
+        return {route: b.stats() for route, b in sorted(self._breakers.items())}
+
+
+breakers = BreakerRegistry()
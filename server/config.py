@@ -107,6 +107,50 @@ DEFAULT_SCORING_ENABLED = False
 DEFAULT_VERDICT_ENABLED = False
 
 
+# -- Database Tuning ---------------------------------------------------------
+# Read-only connections serving SELECTs alongside the single writer connection.
+# 0 disables the pool (reads share the writer connection, pre-pool behaviour).
+
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "4"))
+
+# Group commit for the background writer queue: up to DB_WRITE_BATCH_SIZE queued
+# writes share one transaction. DB_WRITE_FLUSH_MS is how long the writer waits
+# for more writes after the first arrives (0 = only drain what is already queued).
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "64"))
+DB_WRITE_FLUSH_MS = float(os.getenv("DB_WRITE_FLUSH_MS", "0"))
+
+
+# -- LLM Response Cache ------------------------------------------------------
+# Disk cache for repeatable secondary calls (judge, summarizer, documentary).
+# Call sites opt in by name; entries expire after the TTL and the least
+# recently used are evicted past the entry cap.
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False")
+LLM_CACHE_PATH = Path(os.getenv("LLM_CACHE_PATH", str(_PROJECT_ROOT / ".babel_data" / "llm_cache.db")))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+
+
+# -- LLM Record/Replay Cassettes ---------------------------------------------
+# "record" appends every completion to LLM_CASSETTE_DIR/<LLM_CASSETTE>.jsonl;
+# "replay" answers from that file with no network (optionally sleeping for the
+# recorded latency). Experiments can pick their own cassette instead
+# (RelayConfig.cassette_mode / cassette_name).
+
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "off").lower()   # off | record | replay
+LLM_CASSETTE = os.getenv("LLM_CASSETTE", "default")
+LLM_CASSETTE_DIR = Path(os.getenv("LLM_CASSETTE_DIR", str(_PROJECT_ROOT / ".babel_data" / "cassettes")))
+LLM_CASSETTE_REPLAY_LATENCY = os.getenv("LLM_CASSETTE_REPLAY_LATENCY", "0") in ("1", "true", "True")
+
+
+# -- Fake LLM Provider -------------------------------------------------------
+# Load testing only: a profile name (server/fake_profiles/<name>.yaml) or path
+# routes every completion to the local fake provider. Empty = real providers.
+
+FAKE_LLM_PROFILE = os.getenv("FAKE_LLM_PROFILE", "")
+FAKE_LLM_SEED = int(os.environ["FAKE_LLM_SEED"]) if os.getenv("FAKE_LLM_SEED") else None
+
+
 # -- Model Version Snapshot --------------------------------------------------
 # Spec 019: resolve the most specific version identifier available at launch.
 
@@ -151,8 +195,8 @@ class RelayConfig:
     system_prompt, rounds) remain as direct run_relay() parameters.
     Everything else lives here.
     """
-    # Timing
-    turn_delay_seconds: float = 2.0
+    # Timing -- read-along pacing only; provider pacing is server.rate_limiter's job
+    turn_delay_seconds: float = 0.0
 
     # Recovery / resume
     start_round: int = 1
@@ -173,6 +217,7 @@ class RelayConfig:
     judge_model: str = field(default_factory=lambda: JUDGE_MODEL)
     enable_scoring: bool = False
     enable_verdict: bool = False
+    score_window: int = 0         # turns per batched judge call; 0 = one round, 1 = per turn
 
     # Memory
     enable_memory: bool = False
@@ -193,6 +238,21 @@ class RelayConfig:
     # Recursive audit (Feature 1)
     enable_audit: bool = False
 
+    # Token streaming: publish relay.token deltas while a turn generates
+    stream_tokens: bool = False
+
+    # "sequential" (round-robin, each agent sees the previous one's reply) or
+    # "simultaneous" (every agent answers the same round state concurrently)
+    turn_mode: str = "sequential"
+
+    # Hedged requests: race the first fallback against turns slower than p90
+    hedge_requests: bool = False
+
+    # Record/replay cassette for this experiment's LLM calls ("off" = process default);
+    # cassette_name defaults to the experiment id
+    cassette_mode: str = "off"
+    cassette_name: str | None = None
+
     # Observer (future use)
     observer_model: str | None = None
     observer_interval: int = 3
@@ -226,6 +286,13 @@ class RPGConfig:
     start_round: int = 1
     start_index: int = 0
 
+    # Token streaming: publish relay.token deltas while a turn generates
+    stream_tokens: bool = False
+
+    # Record/replay cassette ("off" = process default); name defaults to the match id
+    cassette_mode: str = "off"
+    cassette_name: str | None = None
+
 
 # -- Model Registry ----------------------------------------------------------
 # Display name -> litellm model string.
@@ -261,6 +328,74 @@ MODEL_REGISTRY: dict[str, str] = {
 }
 
 
+# -- Prompt Budgets ----------------------------------------------------------
+# Input-token budget per litellm model string for the layered context builder
+# (frozen system prompt + cold recap + as many recent turns as fit). Kept well
+# inside each context window -- verbose models get fewer turns, terse ones more.
+# Groq/Mistral entries track free-tier tokens-per-minute limits, not windows.
+
+DEFAULT_PROMPT_BUDGET = int(os.getenv("DEFAULT_PROMPT_BUDGET", "12000"))
+HOT_MAX_TURNS = int(os.getenv("HOT_MAX_TURNS", "40"))  # cap on hot turns even when more fit
+
+MODEL_PROMPT_BUDGETS: dict[str, int] = {
+    "anthropic/claude-haiku-4-5-20251001":                  16000,
+    "anthropic/claude-sonnet-4-5-20250929":                 16000,
+    "anthropic/claude-opus-4-5-20251101":                   16000,
+    "gemini/gemini-2.5-flash":                              24000,
+    "gemini/gemini-2.5-flash-lite":                         24000,
+    "gemini/gemini-2.5-pro":                                24000,
+    "openai/gpt-4.1-nano":                                  16000,
+    "openai/gpt-4.1-mini":                                  16000,
+    "openai/gpt-4.1":                                       16000,
+    "deepseek/deepseek-chat":                               12000,
+    "deepseek/deepseek-reasoner":                           12000,
+    "groq/llama-3.3-70b-versatile":                          6000,
+    "groq/meta-llama/llama-4-scout-17b-16e-instruct":        6000,
+    "groq/meta-llama/llama-4-maverick-17b-128e-instruct":    6000,
+    "mistral/mistral-small-latest":                          8000,
+    "mistral/mistral-large-latest":                          8000,
+    "openrouter/qwen/qwen3-32b":                             8000,
+    "ai21/jamba-1.5-large":                                 12000,
+}
+
+
+def get_prompt_budget(model_string: str) -> int:
+    """Prompt-token budget for a model, falling back to DEFAULT_PROMPT_BUDGET."""
+    return MODEL_PROMPT_BUDGETS.get(model_string, DEFAULT_PROMPT_BUDGET)
+
+
+# -- Provider Rate Limits ----------------------------------------------------
+# (requests/min, tokens/min) per litellm provider prefix, enforced as token
+# buckets by server.rate_limiter and scaled down on 429s. Defaults track the
+# lowest paid/free tier each provider publishes; override with
+# RATE_LIMIT_<PROVIDER>="rpm,tpm" (e.g. RATE_LIMIT_GROQ=30,12000). 0 = unlimited.
+
+DEFAULT_RATE_LIMIT: tuple[int, int] = (60, 100000)
+
+PROVIDER_RATE_LIMITS: dict[str, tuple[int, int]] = {
+    "anthropic":   (50,   30000),
+    "gemini":      (10,  250000),
+    "openai":      (500,  30000),
+    "deepseek":    (120, 500000),
+    "groq":        (30,    6000),
+    "mistral":     (60,  500000),
+    "openrouter":  (20,  100000),
+    "ai21":        (60,  100000),
+}
+
+
+def get_rate_limits(provider: str) -> tuple[int, int]:
+    """(rpm, tpm) for a provider prefix; RATE_LIMIT_<PROVIDER> env overrides the table."""
+    override = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+    if override:
+        try:
+            rpm, tpm = (int(v) for v in override.split(","))
+            return rpm, tpm
+        except ValueError:
+            pass  # malformed override -- fall back to the table
+    return PROVIDER_RATE_LIMITS.get(provider, DEFAULT_RATE_LIMIT)
+
+
 def get_display_name(model_string: str) -> str:
     """Get a human-friendly name from a litellm model string.
 
@@ -6,17 +6,36 @@ while the relay engine writes. All foreign keys are enforced.
 
 import asyncio
 import aiosqlite
+import base64
 import json
+import logging
 import math
+import os
+import random
+import re
+import time
 import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
 from itertools import combinations
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable
 
-from server.config import get_display_name
+from server.config import (
+    DB_READ_POOL_SIZE,
+    DB_WRITE_BATCH_SIZE,
+    DB_WRITE_FLUSH_MS,
+    get_display_name,
+)
 
-DB_PATH = Path(__file__).resolve().parent.parent / ".babel_data" / "babel.db"
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(
+    os.getenv("BABEL_DB_PATH") or Path(__file__).resolve().parent.parent / ".babel_data" / "babel.db"
+)
 
 # -- Schema ----------------------------------------------------------------------
 
@@ -187,17 +206,608 @@ CREATE TABLE IF NOT EXISTS replication_groups (
 """
 
 
+# -- Migrations ------------------------------------------------------------------
+# Ordered and append-only: never edit or renumber a shipped migration, add a new
+# one. Pending migrations run in a single transaction at connect() and are
+# recorded in schema_version. _AddColumn steps skip columns that already exist,
+# since databases created before schema_version picked them up ad hoc.
+
+
+@dataclass(frozen=True)
+class _AddColumn:
+    table: str
+    column: str
+    ddl: str
+
+
+@dataclass(frozen=True)
+class _Migration:
+    version: int
+    description: str
+    steps: tuple  # of _AddColumn or raw SQL strings
+
+
+_MIGRATIONS: list[_Migration] = [
+    _Migration(1, "vocabulary confidence", (
+        _AddColumn("vocabulary", "confidence", "TEXT DEFAULT 'high'"),
+    )),
+    _Migration(2, "per-model temperatures", (
+        _AddColumn("experiments", "temperature_a", "REAL DEFAULT 0.7"),
+        _AddColumn("experiments", "temperature_b", "REAL DEFAULT 0.7"),
+    )),
+    _Migration(3, "judge scoring and verdicts", (
+        _AddColumn("experiments", "judge_model", "TEXT"),
+        _AddColumn("experiments", "enable_scoring", "INTEGER DEFAULT 0"),
+        _AddColumn("experiments", "enable_verdict", "INTEGER DEFAULT 0"),
+        _AddColumn("experiments", "winner", "TEXT"),
+        _AddColumn("experiments", "verdict_reasoning", "TEXT"),
+    )),
+    _Migration(4, "experiment label", (
+        _AddColumn("experiments", "label", "TEXT"),
+    )),
+    _Migration(5, "Phase 13b: RPG mode", (
+        _AddColumn("experiments", "mode", "TEXT DEFAULT 'standard'"),
+        _AddColumn("experiments", "participants_json", "TEXT"),
+        _AddColumn("turns", "metadata", "TEXT"),
+    )),
+    _Migration(6, "Phase 14-B: experiment forking lineage", (
+        _AddColumn("experiments", "parent_experiment_id", "TEXT"),
+        _AddColumn("experiments", "fork_at_round", "INTEGER"),
+    )),
+    _Migration(7, "Phase 14-C: vocabulary cross-run provenance", (
+        _AddColumn("vocabulary", "origin_experiment_id", "TEXT"),
+    )),
+    _Migration(8, "Phase 15-A: N-way agents config", (
+        _AddColumn("experiments", "agents_config_json", "TEXT"),
+    )),
+    _Migration(9, "Phase 16: AI documentary cache", (
+        _AddColumn("experiments", "documentary", "TEXT"),
+    )),
+    _Migration(10, "Phase 17: asymmetric visibility", (
+        _AddColumn("turns", "visibility_json", "TEXT DEFAULT '[]'"),
+    )),
+    _Migration(11, "Session 27: chemistry, adversarial, evolution, audit", (
+        """CREATE TABLE IF NOT EXISTS collaboration_metrics (
+            experiment_id TEXT PRIMARY KEY
+                REFERENCES experiments(id) ON DELETE CASCADE,
+            initiative_a REAL,
+            initiative_b REAL,
+            influence_a_on_b REAL,
+            influence_b_on_a REAL,
+            convergence_rate REAL,
+            surprise_index REAL,
+            computed_at TEXT
+        )""",
+        _AddColumn("experiments", "hidden_goals_json", "TEXT"),
+        _AddColumn("experiments", "revelation_round", "INTEGER"),
+        _AddColumn("experiments", "vocabulary_seed_id", "TEXT"),
+        _AddColumn("experiments", "audit_experiment_id", "TEXT"),
+    )),
+    _Migration(12, "Spec 019: model version snapshot", (
+        _AddColumn("experiments", "model_a_version", "TEXT"),
+        _AddColumn("experiments", "model_b_version", "TEXT"),
+    )),
+    _Migration(13, "Spec 018: baseline control preset", (
+        _AddColumn("experiments", "baseline_experiment_id", "TEXT"),
+    )),
+    _Migration(14, "Spec 017: replication runs", (
+        _AddColumn("experiments", "replication_group_id", "TEXT"),
+    )),
+    _Migration(15, "Spec 005: hypothesis testing", (
+        _AddColumn("experiments", "hypothesis", "TEXT"),
+        _AddColumn("experiments", "hypothesis_result", "TEXT"),
+        _AddColumn("experiments", "hypothesis_reasoning", "TEXT"),
+    )),
+    _Migration(16, "Spec 006: A/B comparison groups", (
+        _AddColumn("experiments", "comparison_group_id", "TEXT"),
+        _AddColumn("experiments", "comparison_variant", "INTEGER"),
+    )),
+    _Migration(17, "incremental tournament leaderboard accumulators", (
+        """CREATE TABLE IF NOT EXISTS tournament_model_stats (
+            tournament_id TEXT NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+            model TEXT NOT NULL,
+            matches INTEGER NOT NULL DEFAULT 0,
+            latency_n INTEGER NOT NULL DEFAULT 0,
+            latency_sum REAL NOT NULL DEFAULT 0,
+            latency_sumsq REAL NOT NULL DEFAULT 0,
+            tokens_n INTEGER NOT NULL DEFAULT 0,
+            tokens_sum REAL NOT NULL DEFAULT 0,
+            vocab_coined INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tournament_id, model)
+        )""",
+        # Per-round token sums: the engagement slope is fit over per-round means
+        """CREATE TABLE IF NOT EXISTS tournament_model_round_tokens (
+            tournament_id TEXT NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+            model TEXT NOT NULL,
+            round INTEGER NOT NULL,
+            tokens_n INTEGER NOT NULL DEFAULT 0,
+            tokens_sum REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (tournament_id, model, round)
+        )""",
+        _AddColumn("tournament_matches", "stats_applied", "INTEGER NOT NULL DEFAULT 0"),
+    )),
+    _Migration(18, "per-experiment agent rollups maintained by triggers", (
+        # Keyed by speaker (the agent's display name), not model, so N-way runs
+        # and same-model pairings keep one row per agent. Falsy latency/token
+        # values are not counted, matching the stats endpoints' old raw scans.
+        """CREATE TABLE IF NOT EXISTS experiment_agent_rollup (
+            experiment_id TEXT NOT NULL REFERENCES experiments(id) ON DELETE CASCADE,
+            speaker TEXT NOT NULL,
+            model TEXT,
+            first_turn_id INTEGER,
+            turns INTEGER NOT NULL DEFAULT 0,
+            tokens_n INTEGER NOT NULL DEFAULT 0,
+            tokens_sum REAL NOT NULL DEFAULT 0,
+            latency_n INTEGER NOT NULL DEFAULT 0,
+            latency_sum REAL NOT NULL DEFAULT 0,
+            latency_sumsq REAL NOT NULL DEFAULT 0,
+            vocab_coined INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (experiment_id, speaker)
+        )""",
+        """CREATE TABLE IF NOT EXISTS experiment_agent_round_rollup (
+            experiment_id TEXT NOT NULL REFERENCES experiments(id) ON DELETE CASCADE,
+            speaker TEXT NOT NULL,
+            round INTEGER NOT NULL,
+            turns INTEGER NOT NULL DEFAULT 0,
+            tokens_n INTEGER NOT NULL DEFAULT 0,
+            tokens_sum REAL NOT NULL DEFAULT 0,
+            latency_n INTEGER NOT NULL DEFAULT 0,
+            latency_sum REAL NOT NULL DEFAULT 0,
+            vocab_coined INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (experiment_id, speaker, round)
+        )""",
+        # Triggers run inside the INSERT itself, so rollups commit in the same
+        # write batch as add_turn/upsert_word. A re-encountered word takes the
+        # upsert's UPDATE path and is (correctly) not counted again.
+        """CREATE TRIGGER IF NOT EXISTS trg_turns_rollup AFTER INSERT ON turns
+        BEGIN
+            INSERT INTO experiment_agent_rollup
+                (experiment_id, speaker, model, first_turn_id, turns, tokens_n,
+                 tokens_sum, latency_n, latency_sum, latency_sumsq)
+            VALUES (
+                NEW.experiment_id, NEW.speaker, NEW.model, NEW.id, 1,
+                CASE WHEN NEW.token_count THEN 1 ELSE 0 END,
+                COALESCE(NEW.token_count, 0),
+                CASE WHEN NEW.latency_seconds THEN 1 ELSE 0 END,
+                COALESCE(NEW.latency_seconds, 0),
+                COALESCE(NEW.latency_seconds * NEW.latency_seconds, 0))
+            ON CONFLICT (experiment_id, speaker) DO UPDATE SET
+                model = COALESCE(model, excluded.model),
+                first_turn_id = COALESCE(MIN(first_turn_id, excluded.first_turn_id),
+                                         excluded.first_turn_id),
+                turns = turns + 1,
+                tokens_n = tokens_n + excluded.tokens_n,
+                tokens_sum = tokens_sum + excluded.tokens_sum,
+                latency_n = latency_n + excluded.latency_n,
+                latency_sum = latency_sum + excluded.latency_sum,
+                latency_sumsq = latency_sumsq + excluded.latency_sumsq;
+            INSERT INTO experiment_agent_round_rollup
+                (experiment_id, speaker, round, turns, tokens_n, tokens_sum,
+                 latency_n, latency_sum)
+            VALUES (
+                NEW.experiment_id, NEW.speaker, NEW.round, 1,
+                CASE WHEN NEW.token_count THEN 1 ELSE 0 END,
+                COALESCE(NEW.token_count, 0),
+                CASE WHEN NEW.latency_seconds THEN 1 ELSE 0 END,
+                COALESCE(NEW.latency_seconds, 0))
+            ON CONFLICT (experiment_id, speaker, round) DO UPDATE SET
+                turns = turns + 1,
+                tokens_n = tokens_n + excluded.tokens_n,
+                tokens_sum = tokens_sum + excluded.tokens_sum,
+                latency_n = latency_n + excluded.latency_n,
+                latency_sum = latency_sum + excluded.latency_sum;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vocabulary_rollup AFTER INSERT ON vocabulary
+        BEGIN
+            INSERT INTO experiment_agent_rollup (experiment_id, speaker, vocab_coined)
+            VALUES (NEW.experiment_id, COALESCE(NEW.coined_by, ''), 1)
+            ON CONFLICT (experiment_id, speaker) DO UPDATE SET
+                vocab_coined = vocab_coined + 1;
+            INSERT INTO experiment_agent_round_rollup
+                (experiment_id, speaker, round, vocab_coined)
+            VALUES (NEW.experiment_id, COALESCE(NEW.coined_by, ''),
+                    COALESCE(NEW.coined_round, 0), 1)
+            ON CONFLICT (experiment_id, speaker, round) DO UPDATE SET
+                vocab_coined = vocab_coined + 1;
+        END""",
+        # Backfill experiments recorded before the triggers existed
+        """INSERT OR IGNORE INTO experiment_agent_rollup
+            (experiment_id, speaker, model, first_turn_id, turns, tokens_n,
+             tokens_sum, latency_n, latency_sum, latency_sumsq)
+        SELECT experiment_id, speaker, MIN(model), MIN(id), COUNT(*),
+               COUNT(NULLIF(token_count, 0)), TOTAL(token_count),
+               COUNT(NULLIF(latency_seconds, 0)), TOTAL(latency_seconds),
+               TOTAL(latency_seconds * latency_seconds)
+        FROM turns GROUP BY experiment_id, speaker""",
+        """INSERT OR IGNORE INTO experiment_agent_round_rollup
+            (experiment_id, speaker, round, turns, tokens_n, tokens_sum,
+             latency_n, latency_sum)
+        SELECT experiment_id, speaker, round, COUNT(*),
+               COUNT(NULLIF(token_count, 0)), TOTAL(token_count),
+               COUNT(NULLIF(latency_seconds, 0)), TOTAL(latency_seconds)
+        FROM turns GROUP BY experiment_id, speaker, round""",
+        """INSERT INTO experiment_agent_rollup (experiment_id, speaker, vocab_coined)
+        SELECT experiment_id, COALESCE(coined_by, ''), COUNT(*)
+        FROM vocabulary WHERE TRUE GROUP BY experiment_id, COALESCE(coined_by, '')
+        ON CONFLICT (experiment_id, speaker) DO UPDATE SET
+            vocab_coined = excluded.vocab_coined""",
+        """INSERT INTO experiment_agent_round_rollup
+            (experiment_id, speaker, round, vocab_coined)
+        SELECT experiment_id, COALESCE(coined_by, ''), COALESCE(coined_round, 0), COUNT(*)
+        FROM vocabulary WHERE TRUE
+        GROUP BY experiment_id, COALESCE(coined_by, ''), COALESCE(coined_round, 0)
+        ON CONFLICT (experiment_id, speaker, round) DO UPDATE SET
+            vocab_coined = excluded.vocab_coined""",
+    )),
+    _Migration(19, "FTS5 full-text search over turns and vocabulary", (
+        # External-content tables: the index stores only tokens, text stays in
+        # turns/vocabulary. Triggers keep them in sync inside the same write.
+        """CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(
+            content, content='turns', content_rowid='id'
+        )""",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_fts USING fts5(
+            word, meaning, content='vocabulary', content_rowid='id'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS trg_turns_fts_ai AFTER INSERT ON turns BEGIN
+            INSERT INTO turns_fts (rowid, content) VALUES (NEW.id, NEW.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_turns_fts_ad AFTER DELETE ON turns BEGIN
+            INSERT INTO turns_fts (turns_fts, rowid, content)
+                VALUES ('delete', OLD.id, OLD.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_turns_fts_au AFTER UPDATE OF content ON turns BEGIN
+            INSERT INTO turns_fts (turns_fts, rowid, content)
+                VALUES ('delete', OLD.id, OLD.content);
+            INSERT INTO turns_fts (rowid, content) VALUES (NEW.id, NEW.content);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vocabulary_fts_ai AFTER INSERT ON vocabulary BEGIN
+            INSERT INTO vocabulary_fts (rowid, word, meaning)
+                VALUES (NEW.id, NEW.word, NEW.meaning);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vocabulary_fts_ad AFTER DELETE ON vocabulary BEGIN
+            INSERT INTO vocabulary_fts (vocabulary_fts, rowid, word, meaning)
+                VALUES ('delete', OLD.id, OLD.word, OLD.meaning);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_vocabulary_fts_au
+        AFTER UPDATE OF word, meaning ON vocabulary BEGIN
+            INSERT INTO vocabulary_fts (vocabulary_fts, rowid, word, meaning)
+                VALUES ('delete', OLD.id, OLD.word, OLD.meaning);
+            INSERT INTO vocabulary_fts (rowid, word, meaning)
+                VALUES (NEW.id, NEW.word, NEW.meaning);
+        END""",
+        "INSERT INTO turns_fts (turns_fts) VALUES ('rebuild')",
+        "INSERT INTO vocabulary_fts (vocabulary_fts) VALUES ('rebuild')",
+    )),
+    _Migration(20, "keyset pagination indexes for experiment listing", (
+        "CREATE INDEX IF NOT EXISTS idx_experiments_created ON experiments(created_at, id)",
+        """CREATE INDEX IF NOT EXISTS idx_experiments_status_created
+            ON experiments(status, created_at, id)""",
+    )),
+    _Migration(21, "round-ordered turn index for range reads", (
+        "CREATE INDEX IF NOT EXISTS idx_turns_experiment_round ON turns(experiment_id, round, id)",
+    )),
+    _Migration(22, "hedged request counters", (
+        _AddColumn("experiments", "hedges_fired", "INTEGER DEFAULT 0"),
+        _AddColumn("experiments", "hedges_won", "INTEGER DEFAULT 0"),
+    )),
+    _Migration(23, "judge call counter", (
+        _AddColumn("experiments", "judge_calls", "INTEGER DEFAULT 0"),
+    )),
+]
+
+
+# -- Read Connection Pool --------------------------------------------------------
+
+class _ReadPool:
+    """Fixed-size pool of query-only connections for SELECT paths.
+
+    WAL mode lets these readers run while the writer connection holds a
+    transaction, so stats/list/leaderboard queries never queue behind the
+    background writer's commits. Each aiosqlite connection owns its own
+    worker thread, so pool size is also the read concurrency limit.
+    """
+
+    def __init__(self, db_path: Path, size: int):
+        self.db_path = db_path
+        self.size = size
+        self._idle: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._conns: list[aiosqlite.Connection] = []
+        # Metrics
+        self._acquisitions = 0
+        self._contended = 0  # acquisitions that found no idle connection
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def open(self) -> None:
+        for _ in range(self.size):
+            conn = await aiosqlite.connect(str(self.db_path))
+            conn.row_factory = aiosqlite.Row
+            await conn.execute("PRAGMA query_only=ON")
+            self._conns.append(conn)
+            self._idle.put_nowait(conn)
+
+    async def close(self) -> None:
+        for conn in self._conns:
+            await conn.close()
+        self._conns.clear()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Check out an idle connection, recording how long the caller waited."""
+        if self._idle.empty():
+            self._contended += 1
+        t0 = time.perf_counter()
+        conn = await self._idle.get()
+        waited = time.perf_counter() - t0
+        self._acquisitions += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        try:
+            yield conn
+        finally:
+            self._idle.put_nowait(conn)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "in_use": self.size - self._idle.qsize(),
+            "acquisitions": self._acquisitions,
+            "contended": self._contended,
+            "wait_ms_avg": round(self._wait_total / self._acquisitions * 1000, 3)
+            if self._acquisitions else 0.0,
+            "wait_ms_max": round(self._wait_max * 1000, 3),
+        }
+
+
+# -- Layered Context Cache -------------------------------------------------------
+
+@dataclass(frozen=True)
+class LayeredContext:
+    """Cold recap and world bible for a match, as engines see them before a turn."""
+    cold_summary: str | None = None
+    world_bible: str | None = None
+    version: int = 0  # bumped on every applied update
+    cold_round: int = 0  # last round cold_summary covers; hot turns start after it
+
+
+@dataclass
+class _ContextEntry:
+    cold_summary: str | None = None
+    cold_round: int = 0  # through_round of cold_summary; newer rounds win
+    world_bible: str | None = None
+    world_seq: int = 0  # enqueue order of the world_state write; later writes win
+    version: int = 0
+    loader: asyncio.Task | None = None
+
+    def snapshot(self) -> LayeredContext:
+        return LayeredContext(self.cold_summary, self.world_bible, self.version, self.cold_round)
+
+
+class _LayeredContextCache:
+    """Per-match copy of the latest cold summary and world bible.
+
+    Relay and RPG loops read layered context before every turn, but it only
+    changes when the summarizer persists a new recap or bible. Entries are
+    created on first read (one DB load), updated write-through by
+    save_cold_summary/save_world_state, and evicted when the match ends.
+    Updates for matches with no entry are ignored -- the DB already has them.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, _ContextEntry] = {}
+        self._world_seq = 0
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._updates = 0
+        self._evictions = 0
+
+    def next_world_seq(self) -> int:
+        self._world_seq += 1
+        return self._world_seq
+
+    def apply_cold(self, match_id: str, through_round: int, summary: str) -> None:
+        entry = self._entries.get(match_id)
+        if entry is None or through_round < entry.cold_round:
+            return
+        entry.cold_summary, entry.cold_round = summary, through_round
+        entry.version += 1
+        self._updates += 1
+
+    def apply_world(self, match_id: str, seq: int, state_json: str) -> None:
+        entry = self._entries.get(match_id)
+        if entry is None or seq < entry.world_seq:
+            return
+        entry.world_bible, entry.world_seq = state_json, seq
+        entry.version += 1
+        self._updates += 1
+
+    async def get(
+        self,
+        match_id: str,
+        load: Callable[[str, _ContextEntry], Awaitable[None]],
+    ) -> LayeredContext:
+        entry = self._entries.get(match_id)
+        if entry is not None and entry.loader is None:
+            self._hits += 1
+            return entry.snapshot()
+        if entry is None:
+            self._misses += 1
+            # Register before loading so updates that land mid-load are kept
+            entry = self._entries[match_id] = _ContextEntry()
+            entry.loader = asyncio.create_task(load(match_id, entry))
+        try:
+            await asyncio.shield(entry.loader)
+        except Exception:
+            if self._entries.get(match_id) is entry:
+                del self._entries[match_id]
+            raise
+        entry.loader = None
+        return entry.snapshot()
+
+    def evict(self, match_id: str) -> None:
+        if self._entries.pop(match_id, None) is not None:
+            self._evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+            "updates": self._updates,
+            "evictions": self._evictions,
+        }
+
+
+# -- Statistics helpers ----------------------------------------------------------
+
+BOOTSTRAP_RESAMPLES = 1000
+
+
+def _bootstrap_mean_cis(
+    rows: list[dict],
+    keys: tuple[str, ...],
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> dict[str, list[float] | None]:
+    """Percentile bootstrap CI for the mean of each key, in one pass.
+
+    Runs are resampled jointly (one index draw per resample feeds every
+    metric), None values are skipped. Seeded so a group's intervals don't
+    jitter between page loads. Returns None for metrics with < 2 values.
+    """
+    n = len(rows)
+    raw = {k: [r.get(k) for r in rows] for k in keys}
+    # None -> 0 plus a presence mask, so every metric is two plain sums
+    vals = {k: [v if v is not None else 0 for v in col] for k, col in raw.items()}
+    mask = {k: [int(v is not None) for v in col] for k, col in raw.items()}
+    present = {k: sum(m) for k, m in mask.items()}
+    samples: dict[str, list[float]] = {k: [] for k in keys}
+    if n >= 2:
+        rng = random.Random(seed)
+        draws = rng.choices(range(n), k=n * resamples)
+        for start in range(0, len(draws), n):
+            pick = itemgetter(*draws[start:start + n])
+            for k in keys:
+                hits = n if present[k] == n else sum(pick(mask[k]))
+                if hits:
+                    samples[k].append(sum(pick(vals[k])) / hits)
+
+    lo_q = (1 - confidence) / 2
+    out: dict[str, list[float] | None] = {}
+    for k in keys:
+        if present[k] < 2 or not samples[k]:
+            out[k] = None
+            continue
+        est = sorted(samples[k])
+        last = len(est) - 1
+        out[k] = [est[int(lo_q * last)], est[int((1 - lo_q) * last)]]
+    return out
+
+
+# -- Experiment listing helpers ---------------------------------------------------
+
+# Columns the gallery list view renders. Large text blobs (system_prompt, seed,
+# config_json, documentary, hidden goals, verdict text) are left out unless a
+# caller asks for them with fields=.
+_LIST_COLUMNS = (
+    "id", "created_at", "model_a", "model_b", "preset", "mode", "label",
+    "rounds_planned", "rounds_completed", "status", "elapsed_seconds",
+    "judge_model", "winner", "model_a_version", "model_b_version",
+    "vocabulary_seed_id", "replication_group_id", "baseline_experiment_id",
+    "parent_experiment_id", "comparison_group_id",
+    "hypothesis", "hypothesis_result",
+)
+
+
+def encode_list_cursor(created_at: str, experiment_id: str) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    raw = json.dumps([created_at, experiment_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of encode_list_cursor. Raises ValueError on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, experiment_id = json.loads(raw)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(created_at, str) or not isinstance(experiment_id, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, experiment_id
+
+
+# -- Full-text search helpers -----------------------------------------------------
+
+_FTS_TERM_RE = re.compile(r"[\w']+\*?")
+
+
+def _fts_match_expr(query: str) -> str:
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Each word becomes a quoted term (implicit AND); a trailing * keeps prefix
+    matching. Quotes, parentheses and operators in user input are dropped so
+    they can't produce FTS5 syntax errors. Returns "" if nothing searchable.
+    """
+    terms = []
+    for token in _FTS_TERM_RE.findall(query):
+        prefix = token.endswith("*")
+        word = token.rstrip("*").replace('"', "")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms)
+
+
+def _chain_future(target: asyncio.Future, source: asyncio.Future) -> None:
+    """Resolve a superseded write's future with the outcome of the write that replaced it."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
 # -- Database Manager ------------------------------------------------------------
 
 class Database:
-    """Async SQLite database with WAL mode and foreign key enforcement."""
+    """Async SQLite database with WAL mode and foreign key enforcement.
+
+    Writes go through a single connection (direct or via the writer queue);
+    reads are served from a pool of query-only connections when
+    read_pool_size > 0, otherwise from the writer connection.
+    """
 
-    def __init__(self, db_path: Path = DB_PATH):
+    def __init__(
+        self,
+        db_path: Path = DB_PATH,
+        read_pool_size: int = DB_READ_POOL_SIZE,
+        write_batch_size: int = DB_WRITE_BATCH_SIZE,
+        write_flush_ms: float = DB_WRITE_FLUSH_MS,
+    ):
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.write_batch_size = max(1, write_batch_size)
+        self.write_flush_ms = max(0.0, write_flush_ms)
         self._db: aiosqlite.Connection | None = None
+        self._read_pool: _ReadPool | None = None
+        self._experiment_cols: frozenset[str] | None = None
         self._write_lock: asyncio.Lock | None = None
         self._queue: asyncio.Queue = asyncio.Queue()
         self._worker_task: asyncio.Task | None = None
+        # Writer metrics
+        self._write_batches = 0
+        self._write_statements = 0
+        self._write_batch_max = 0
+        # Write coalescing: coalesce_key -> latest pending item for that key
+        self._coalesce_pending: dict[Hashable, tuple] = {}
+        self._superseded: set[asyncio.Future] = set()
+        self._writes_elided = 0
+        self._context_cache = _LayeredContextCache()
 
     async def connect(self) -> None:
         """Open the database connection and initialize schema."""
@@ -214,217 +824,69 @@ class Database:
         await self._db.execute("PRAGMA foreign_keys=ON")
         await self._db.execute("PRAGMA synchronous=NORMAL")
 
+        t0 = time.perf_counter()
         await self._db.executescript(_SCHEMA)
         await self._db.commit()
 
-        # -- Migrations (idempotent ALTER TABLE additions) --
-        # SQLite ignores IF NOT EXISTS on columns, so we catch the error instead.
-        try:
-            await self._db.execute(
-                "ALTER TABLE vocabulary ADD COLUMN confidence TEXT DEFAULT 'high'"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        for col, default in [
-            ("temperature_a", "0.7"),
-            ("temperature_b", "0.7"),
-        ]:
-            try:
-                await self._db.execute(
-                    f"ALTER TABLE experiments ADD COLUMN {col} REAL DEFAULT {default}"
-                )
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
-
-        for col, ddl in [
-            ("judge_model", "TEXT"),
-            ("enable_scoring", "INTEGER DEFAULT 0"),
-            ("enable_verdict", "INTEGER DEFAULT 0"),
-            ("winner", "TEXT"),
-            ("verdict_reasoning", "TEXT"),
-        ]:
-            try:
-                await self._db.execute(
-                    f"ALTER TABLE experiments ADD COLUMN {col} {ddl}"
-                )
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
-
-        try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN label TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Phase 13b: RPG mode columns
-        for col, ddl in [
-            ("mode", "TEXT DEFAULT 'standard'"),
-            ("participants_json", "TEXT"),
-        ]:
-            try:
-                await self._db.execute(
-                    f"ALTER TABLE experiments ADD COLUMN {col} {ddl}"
-                )
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
-
-        try:
-            await self._db.execute(
-                "ALTER TABLE turns ADD COLUMN metadata TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Phase 14-B: experiment forking lineage
-        for col, ddl in [
-            ("parent_experiment_id", "TEXT"),
-            ("fork_at_round", "INTEGER"),
-        ]:
-            try:
-                await self._db.execute(
-                    f"ALTER TABLE experiments ADD COLUMN {col} {ddl}"
-                )
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
-
-        # Phase 14-C: vocabulary cross-run provenance
-        try:
-            await self._db.execute(
-                "ALTER TABLE vocabulary ADD COLUMN origin_experiment_id TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Phase 15-A: N-way agents config
-        try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN agents_config_json TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Phase 16: AI documentary cache
-        try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN documentary TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Phase 17: asymmetric visibility (fog of war)
-        try:
-            await self._db.execute(
-                "ALTER TABLE turns ADD COLUMN visibility_json TEXT DEFAULT '[]'"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
+        applied = await self._migrate()
+        logger.info(
+            "Schema ready in %.1f ms (version %d, applied %s)",
+            (time.perf_counter() - t0) * 1000, _MIGRATIONS[-1].version,
+            [m.version for m in applied] or "none",
+        )
 
-        # Session 27: Collaboration Chemistry metrics
-        try:
-            await self._db.execute("""
-                CREATE TABLE IF NOT EXISTS collaboration_metrics (
-                    experiment_id TEXT PRIMARY KEY
-                        REFERENCES experiments(id) ON DELETE CASCADE,
-                    initiative_a REAL,
-                    initiative_b REAL,
-                    influence_a_on_b REAL,
-                    influence_b_on_a REAL,
-                    convergence_rate REAL,
-                    surprise_index REAL,
-                    computed_at TEXT
-                )
-            """)
-            await self._db.commit()
-        except Exception:
-            pass  # table already exists
+        # Read pool opens after schema setup so readers see every table.
+        # An in-memory database cannot be shared across connections.
+        if self.read_pool_size > 0 and str(self.db_path) != ":memory:":
+            self._read_pool = _ReadPool(self.db_path, self.read_pool_size)
+            await self._read_pool.open()
 
-        # Session 27: Recursive Adversarial Mode columns
-        for col, ddl in [
-            ("hidden_goals_json", "TEXT"),
-            ("revelation_round", "INTEGER"),
-        ]:
-            try:
-                await self._db.execute(
-                    f"ALTER TABLE experiments ADD COLUMN {col} {ddl}"
-                )
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
+    async def _migrate(self) -> list["_Migration"]:
+        """Apply pending migrations in one transaction and record them.
 
-        # Session 27: Linguistic Evolution vocabulary_seed_id
-        try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN vocabulary_seed_id TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
+        Returns the migrations that ran (empty when already up to date).
+        """
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            " version INTEGER PRIMARY KEY,"
+            " description TEXT NOT NULL,"
+            " applied_at TEXT NOT NULL)"
+        )
+        await self._db.commit()
+        cursor = await self._db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+        current = (await cursor.fetchone())[0]
+        pending = [m for m in _MIGRATIONS if m.version > current]
+        if not pending:
+            return []
 
-        # Session 27: Audit experiment back-reference
+        columns: dict[str, set[str]] = {}
+        now = datetime.now(timezone.utc).isoformat()
+        await self._db.execute("BEGIN")
         try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN audit_experiment_id TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Spec 019: Model version snapshot (best-effort; null for pre-019 experiments)
-        for col in ("model_a_version", "model_b_version"):
-            try:
+            for migration in pending:
+                for step in migration.steps:
+                    if isinstance(step, _AddColumn):
+                        if step.table not in columns:
+                            cursor = await self._db.execute(f"PRAGMA table_info({step.table})")
+                            columns[step.table] = {row[1] for row in await cursor.fetchall()}
+                        if step.column in columns[step.table]:
+                            continue  # pre-versioning database already has it
+                        await self._db.execute(
+                            f"ALTER TABLE {step.table} ADD COLUMN {step.column} {step.ddl}"
+                        )
+                        columns[step.table].add(step.column)
+                    else:
+                        await self._db.execute(step)
                 await self._db.execute(
-                    f"ALTER TABLE experiments ADD COLUMN {col} TEXT"
+                    "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                    (migration.version, migration.description, now),
                 )
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
-
-        # Spec 018: Baseline Control Preset
-        try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN baseline_experiment_id TEXT"
-            )
             await self._db.commit()
         except Exception:
-            pass  # column already exists
-
-        # Spec 017: Replication Runs
-        try:
-            await self._db.execute(
-                "ALTER TABLE experiments ADD COLUMN replication_group_id TEXT"
-            )
-            await self._db.commit()
-        except Exception:
-            pass  # column already exists
-
-        # Spec 005: Hypothesis Testing Mode
-        for col in ("hypothesis TEXT", "hypothesis_result TEXT", "hypothesis_reasoning TEXT"):
-            try:
-                await self._db.execute(f"ALTER TABLE experiments ADD COLUMN {col}")
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
-
-        # Spec 006: A/B Comparison groups
-        for col in ("comparison_group_id TEXT", "comparison_variant INTEGER"):
-            try:
-                await self._db.execute(f"ALTER TABLE experiments ADD COLUMN {col}")
-                await self._db.commit()
-            except Exception:
-                pass  # column already exists
+            await self._db.rollback()
+            logger.exception("Schema migration failed; database left at version %d", current)
+            raise
+        return pending
 
     async def close(self) -> None:
         """Close the database connection."""
@@ -434,34 +896,150 @@ class Database:
                 await self._worker_task
             except asyncio.CancelledError:
                 pass
+        if self._read_pool:
+            await self._read_pool.close()
+            self._read_pool = None
         if self._db:
             await self._db.close()
             self._db = None
 
     async def _writer_worker(self):
-        """Sequential background worker for all INSERT/UPDATE/DELETE operations."""
+        """Sequential background worker for all INSERT/UPDATE/DELETE operations.
+
+        Group commit: after the first queued write arrives, drain whatever else
+        is pending (up to write_batch_size, waiting at most write_flush_ms for
+        stragglers) and run the lot in one transaction.
+        """
+        loop = asyncio.get_running_loop()
         while True:
             try:
-                sql, params, future = await self._queue.get()
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.write_flush_ms / 1000
+                while len(batch) < self.write_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
                 try:
-                    async with self._write_lock: # Still use lock for internal safety
-                        cursor = await self.db.execute(sql, params)
-                        await self.db.commit()
-                        if future and not future.done():
-                            future.set_result(cursor)
-                except Exception as e:
-                    if future and not future.done():
-                        future.set_exception(e)
-                    logger.error("DB Writer worker error on SQL [%s]: %s", sql, e)
+                    live = self._drop_superseded(batch)
+                    if live:
+                        await self._run_write_batch(live)
                 finally:
-                    self._queue.task_done()
+                    for _ in batch:
+                        self._queue.task_done()
             except asyncio.CancelledError:
                 break
 
-    async def _execute_queued(self, sql: str, params: Any = ()) -> Any:
-        """Queue a write operation and wait for its completion."""
+    def _drop_superseded(self, batch: list[tuple]) -> list[tuple]:
+        """Filter out writes replaced by a newer write with the same coalesce key.
+
+        Items drawn into a batch stop being coalescing targets, so a write that
+        arrives while this batch executes is queued normally behind it.
+        """
+        live = []
+        for item in batch:
+            future, key = item[2], item[3]
+            if future in self._superseded:
+                self._superseded.discard(future)
+                continue
+            if key is not None and self._coalesce_pending.get(key) is item:
+                del self._coalesce_pending[key]
+            live.append(item)
+        return live
+
+    async def _run_single_write(self, sql: str, params: Any) -> tuple[Any, Exception | None]:
+        """Execute and commit one statement. Returns (cursor, error)."""
+        try:
+            cursor = await self.db.execute(sql, params)
+            await self.db.commit()
+            return cursor, None
+        except Exception as e:
+            logger.error("DB Writer worker error on SQL [%s]: %s", sql, e)
+            if self.db.in_transaction:
+                await self.db.rollback()
+            return None, e
+
+    async def _run_write_batch(self, batch: list[tuple]) -> None:
+        """Execute a batch of queued writes in one transaction.
+
+        Each statement runs inside its own savepoint: a failing write is rolled
+        back to it and reported on its own future without aborting the rest of
+        the batch. If the transaction itself is lost (or BEGIN/COMMIT fails),
+        the batch is replayed one statement per commit. Futures resolve only
+        after their writes are committed, with the statement's own cursor --
+        read rowcount/lastrowid from it, not changes() on the connection.
+        """
+        outcomes: list[tuple[asyncio.Future | None, Any, Exception | None]] = []
+        async with self._write_lock:  # Still use lock for internal safety
+            if len(batch) == 1:
+                sql, params, future, _ = batch[0]
+                outcomes.append((future, *await self._run_single_write(sql, params)))
+            else:
+                try:
+                    await self.db.execute("BEGIN")
+                    for sql, params, future, _ in batch:
+                        await self.db.execute("SAVEPOINT write")
+                        try:
+                            cursor = await self.db.execute(sql, params)
+                        except Exception as e:
+                            logger.error("DB Writer worker error on SQL [%s]: %s", sql, e)
+                            outcomes.append((future, None, e))
+                            if not self.db.in_transaction:
+                                raise
+                            await self.db.execute("ROLLBACK TO write")
+                        else:
+                            outcomes.append((future, cursor, None))
+                        await self.db.execute("RELEASE write")
+                    await self.db.commit()
+                except Exception as e:
+                    logger.warning("DB Writer batch of %d aborted (%s); replaying individually",
+                                   len(batch), e)
+                    if self.db.in_transaction:
+                        await self.db.rollback()
+                    outcomes = [
+                        (future, *await self._run_single_write(sql, params))
+                        for sql, params, future, _ in batch
+                    ]
+
+        self._write_batches += 1
+        self._write_statements += len(batch)
+        self._write_batch_max = max(self._write_batch_max, len(batch))
+        for future, cursor, exc in outcomes:
+            if future is None or future.done():
+                continue
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(cursor)
+
+    async def _execute_queued(
+        self, sql: str, params: Any = (), coalesce_key: Hashable | None = None
+    ) -> Any:
+        """Queue a write operation and wait for its completion.
+
+        coalesce_key marks a last-write-wins write, e.g. ("rpg_state", match_id).
+        If an earlier write with the same key is still waiting in the queue it
+        is dropped and its caller resolves with this write's outcome. Only use
+        it for writes whose whole effect is replaced by the newer one.
+        """
         future = asyncio.get_running_loop().create_future()
-        await self._queue.put((sql, params, future))
+        item = (sql, params, future, coalesce_key)
+        if coalesce_key is not None:
+            prev = self._coalesce_pending.get(coalesce_key)
+            if prev is not None:
+                self._superseded.add(prev[2])
+                future.add_done_callback(partial(_chain_future, prev[2]))
+                self._writes_elided += 1
+            self._coalesce_pending[coalesce_key] = item
+        await self._queue.put(item)
         return await future
 
     @property
@@ -470,6 +1048,48 @@ class Database:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._db
 
+    # -- Reads ----------------------------------------------------------------
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Yield a connection for SELECTs: pooled if available, else the writer."""
+        if self._read_pool is None:
+            yield self.db
+            return
+        async with self._read_pool.connection() as conn:
+            yield conn
+
+    async def fetchall(self, sql: str, params: Any = ()) -> list[aiosqlite.Row]:
+        """Run a read-only query on a pooled connection and return all rows."""
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            return await cursor.fetchall()
+
+    async def fetchone(self, sql: str, params: Any = ()) -> aiosqlite.Row | None:
+        """Run a read-only query on a pooled connection and return the first row."""
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            return await cursor.fetchone()
+
+    def metrics(self) -> dict:
+        """Operational counters for sizing the DB layer under load."""
+        return {
+            "read_pool": self._read_pool.stats() if self._read_pool else {"size": 0},
+            "context_cache": self._context_cache.stats(),
+            "writer": {
+                "queue_depth": self._queue.qsize(),
+                "batch_size_limit": self.write_batch_size,
+                "flush_ms": self.write_flush_ms,
+                "batches": self._write_batches,
+                "statements": self._write_statements,
+                "avg_batch": round(self._write_statements / self._write_batches, 2)
+                if self._write_batches else 0.0,
+                "max_batch": self._write_batch_max,
+                "writes_elided": self._writes_elided,
+                "coalesce_pending": len(self._coalesce_pending),
+            },
+        }
+
     # -- Experiments ----------------------------------------------------------
 
     async def create_experiment(
@@ -565,34 +1185,71 @@ class Database:
 
     async def get_replication_group(self, group_id: str) -> dict | None:
         """Fetch a single replication group by ID."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT * FROM replication_groups WHERE id = ?", (group_id,)
         )
-        row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def list_replication_groups(
         self, limit: int = 20, offset: int = 0
     ) -> list[dict]:
         """List replication groups, most recent first."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT * FROM replication_groups ORDER BY created_at DESC LIMIT ? OFFSET ?",
             (limit, offset),
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
+
+    async def get_replication_group_members(self, group_id: str) -> list[dict]:
+        """Member experiments of a replication group with per-run aggregates.
+
+        One set-based query over json_each(experiment_ids_json), in launch
+        order. Members whose experiment row is gone have status None.
+        """
+        rows = await self.fetchall(
+            """WITH members AS (
+                   SELECT j.key AS ord, j.value AS id
+                   FROM replication_groups g, json_each(g.experiment_ids_json) j
+                   WHERE g.id = ?
+               ),
+               vocab AS (
+                   SELECT v.experiment_id, COUNT(*) AS cnt
+                   FROM members m JOIN vocabulary v ON v.experiment_id = m.id
+                   GROUP BY v.experiment_id
+               ),
+               scores AS (
+                   SELECT t.experiment_id,
+                          AVG(CASE WHEN t.model = e.model_a THEN
+                              (ts.creativity + ts.coherence + ts.engagement + ts.novelty) / 4.0
+                          END) AS avg_score_a,
+                          AVG(CASE WHEN t.model = e.model_b THEN
+                              (ts.creativity + ts.coherence + ts.engagement + ts.novelty) / 4.0
+                          END) AS avg_score_b
+                   FROM members m
+                   JOIN experiments e ON e.id = m.id
+                   JOIN turns t ON t.experiment_id = e.id
+                   JOIN turn_scores ts ON ts.turn_id = t.id
+                   GROUP BY t.experiment_id
+               )
+               SELECT m.id, e.status, e.winner, e.rounds_completed, e.created_at,
+                      COALESCE(vocab.cnt, 0) AS vocab_count,
+                      scores.avg_score_a, scores.avg_score_b
+               FROM members m
+               LEFT JOIN experiments e ON e.id = m.id
+               LEFT JOIN vocab ON vocab.experiment_id = m.id
+               LEFT JOIN scores ON scores.experiment_id = m.id
+               ORDER BY m.ord""",
+            (group_id,),
+        )
+        return [dict(row) for row in rows]
 
     async def update_replication_group_status(self, group_id: str) -> None:
         """Re-derive group status from its member experiments."""
-        group = await self.get_replication_group(group_id)
-        if not group:
-            return
-        exp_ids = json.loads(group["experiment_ids_json"])
-        statuses = []
-        for exp_id in exp_ids:
-            exp = await self.get_experiment(exp_id)
-            if exp:
-                statuses.append(exp.get("status", "running"))
-
+        statuses = [
+            m["status"]
+            for m in await self.get_replication_group_members(group_id)
+            if m["status"] is not None
+        ]
         if not statuses:
             return
 
@@ -614,33 +1271,22 @@ class Database:
             (new_status, group_id),
         )
 
-    async def get_replication_group_stats(self, group_id: str) -> dict:
+    async def get_replication_group_stats(
+        self, group_id: str, members: list[dict] | None = None,
+    ) -> dict:
         """Compute aggregate statistics for a replication group.
 
         Only completed experiments contribute to numeric stats.
         Failed experiments are counted but excluded from means/stddev.
+        Pass ``members`` (from get_replication_group_members) to skip the query.
+        Each mean carries a 95% bootstrap CI ("ci": [lo, hi]) over runs.
         """
-        group = await self.get_replication_group(group_id)
-        if not group:
-            return {}
-
-        exp_ids = json.loads(group["experiment_ids_json"])
+        if members is None:
+            if not await self.get_replication_group(group_id):
+                return {}
+            members = await self.get_replication_group_members(group_id)
 
-        completed: list[dict] = []
-        failed_count = 0
-        running_count = 0
-
-        for exp_id in exp_ids:
-            exp = await self.get_experiment(exp_id)
-            if not exp:
-                continue
-            status = exp.get("status", "running")
-            if status == "completed":
-                completed.append(exp)
-            elif status in ("failed", "stopped"):
-                failed_count += 1
-            else:
-                running_count += 1
+        completed = [m for m in members if m["status"] == "completed"]
 
         def _mean(values: list) -> float | None:
             return sum(values) / len(values) if values else None
@@ -651,21 +1297,15 @@ class Database:
             mu = sum(values) / len(values)
             return math.sqrt(sum((x - mu) ** 2 for x in values) / len(values))
 
-        # Vocab counts (one query per completed experiment)
-        vocab_values: list[int] = []
-        for exp in completed:
-            cursor = await self.db.execute(
-                "SELECT COUNT(*) AS cnt FROM vocabulary WHERE experiment_id = ?",
-                (exp["id"],),
-            )
-            row = await cursor.fetchone()
-            vocab_values.append(row["cnt"] if row else 0)
+        vocab_values = [m["vocab_count"] for m in completed]
+        rounds_values = [m["rounds_completed"] or 0 for m in completed]
+        score_a_values = [m["avg_score_a"] for m in completed if m["avg_score_a"] is not None]
+        score_b_values = [m["avg_score_b"] for m in completed if m["avg_score_b"] is not None]
 
         # Winner tallies
         winner_counts: dict[str, int] = {"A": 0, "B": 0, "tie": 0, "none": 0}
-        rounds_values: list[int] = []
-        for exp in completed:
-            w = exp.get("winner")
+        for m in completed:
+            w = m["winner"]
             if w == "agent_0":
                 winner_counts["A"] += 1
             elif w == "agent_1":
@@ -674,30 +1314,16 @@ class Database:
                 winner_counts["tie"] += 1
             else:
                 winner_counts["none"] += 1
-            rounds_values.append(exp.get("rounds_completed") or 0)
-
-        # Per-agent avg scores (join turn_scores on turns.model)
-        score_a_values: list[float] = []
-        score_b_values: list[float] = []
-        for exp in completed:
-            exp_id = exp["id"]
-            for model_col, acc in [(exp["model_a"], score_a_values), (exp["model_b"], score_b_values)]:
-                cursor = await self.db.execute(
-                    """SELECT AVG((ts.creativity + ts.coherence + ts.engagement + ts.novelty) / 4.0)
-                           AS avg_score
-                       FROM turn_scores ts
-                       JOIN turns t ON ts.turn_id = t.id
-                       WHERE t.experiment_id = ? AND t.model = ?""",
-                    (exp_id, model_col),
-                )
-                row = await cursor.fetchone()
-                if row and row["avg_score"] is not None:
-                    acc.append(row["avg_score"])
+
+        ci = _bootstrap_mean_cis(
+            completed, ("vocab_count", "avg_score_a", "avg_score_b", "rounds_completed"),
+        )
 
         return {
             "vocab_count": {
                 "mean": _mean(vocab_values),
                 "stddev": _stddev(vocab_values),
+                "ci": ci["vocab_count"],
                 "min": min(vocab_values) if vocab_values else None,
                 "max": max(vocab_values) if vocab_values else None,
                 "values": vocab_values,
@@ -706,13 +1332,16 @@ class Database:
             "avg_score_a": {
                 "mean": _mean(score_a_values),
                 "stddev": _stddev(score_a_values),
+                "ci": ci["avg_score_a"],
             },
             "avg_score_b": {
                 "mean": _mean(score_b_values),
                 "stddev": _stddev(score_b_values),
+                "ci": ci["avg_score_b"],
             },
             "rounds_completed": {
                 "mean": _mean(rounds_values),
+                "ci": ci["rounds_completed"],
                 "min": min(rounds_values) if rounds_values else None,
                 "max": max(rounds_values) if rounds_values else None,
             },
@@ -744,10 +1373,9 @@ class Database:
 
     async def get_experiment(self, experiment_id: str) -> dict | None:
         """Fetch a single experiment by ID."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT * FROM experiments WHERE id = ?", (experiment_id,)
         )
-        row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def list_experiments(
@@ -755,24 +1383,61 @@ class Database:
         limit: int = 50,
         offset: int = 0,
         status: str | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
     ) -> list[dict]:
-        """List experiments, most recent first. Optional status filter and pagination."""
+        """List experiments, most recent first. Optional status filter and pagination.
+
+        Rows carry the _LIST_COLUMNS projection plus chm_score and
+        has_hidden_goals; ``fields`` adds more experiments columns (["*"] for
+        all). Pass the ``cursor`` from encode_list_cursor() of the previous
+        page's last row for keyset paging, which stays O(limit) at any depth
+        via idx_experiments_created; ``offset`` is still honoured without one.
+        Raises ValueError for an unknown field or malformed cursor.
+        """
+        if fields and "*" in fields:
+            columns = ["e.*"]
+        else:
+            known = await self._experiment_columns()
+            unknown = sorted(set(fields or ()) - known)
+            if unknown:
+                raise ValueError(f"Unknown fields: {unknown}. Valid: {sorted(known)}")
+            extra = [f for f in (fields or ()) if f not in _LIST_COLUMNS]
+            columns = [f"e.{c}" for c in (*_LIST_COLUMNS, *dict.fromkeys(extra))]
+
         base = (
-            "SELECT e.*, "
+            f"SELECT {', '.join(columns)}, "
+            "(e.hidden_goals_json IS NOT NULL AND e.hidden_goals_json != '') AS has_hidden_goals, "
             "CASE WHEN cm.initiative_a IS NOT NULL "
             "THEN ROUND((1.0 - ABS(cm.initiative_a - cm.initiative_b) + cm.surprise_index) / 2.0, 4) "
             "ELSE NULL END AS chm_score "
             "FROM experiments e "
             "LEFT JOIN collaboration_metrics cm ON cm.experiment_id = e.id"
         )
+        clauses: list[str] = []
         params: list[Any] = []
         if status:
-            base += " WHERE e.status = ?"
+            clauses.append("e.status = ?")
             params.append(status)
-        base += " ORDER BY e.created_at DESC LIMIT ? OFFSET ?"
+        if cursor:
+            clauses.append("(e.created_at, e.id) < (?, ?)")
+            params.extend(decode_list_cursor(cursor))
+            offset = 0
+        if clauses:
+            base += " WHERE " + " AND ".join(clauses)
+        base += " ORDER BY e.created_at DESC, e.id DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
-        cursor = await self.db.execute(base, params)
-        return [dict(row) for row in await cursor.fetchall()]
+        rows = [dict(row) for row in await self.fetchall(base, params)]
+        for row in rows:
+            row["has_hidden_goals"] = bool(row["has_hidden_goals"])
+        return rows
+
+    async def _experiment_columns(self) -> frozenset[str]:
+        """Column names of the experiments table (cached after first call)."""
+        if self._experiment_cols is None:
+            rows = await self.fetchall("PRAGMA table_info(experiments)")
+            self._experiment_cols = frozenset(row[1] for row in rows)
+        return self._experiment_cols
 
     async def update_experiment_status(
         self,
@@ -792,9 +1457,11 @@ class Database:
             params.append(elapsed_seconds)
         params.append(experiment_id)
 
+        # Same column set on the same row: only the latest pending update matters
         await self._execute_queued(
             f"UPDATE experiments SET {', '.join(parts)} WHERE id = ?",
             params,
+            coalesce_key=("experiments.status", experiment_id, tuple(parts)),
         )
 
     async def save_verdict(
@@ -809,6 +1476,14 @@ class Database:
             (winner, verdict_reasoning, experiment_id),
         )
 
+    async def save_hedge_stats(self, experiment_id: str, fired: int, won: int) -> None:
+        """Record how often hedged model calls fired a backup and how often it won."""
+        await self._execute_queued(
+            "UPDATE experiments SET hedges_fired = ?, hedges_won = ? WHERE id = ?",
+            (fired, won, experiment_id),
+            coalesce_key=("experiments.hedges", experiment_id),
+        )
+
     async def save_hypothesis(self, experiment_id: str, hypothesis: str) -> None:
         """Persist a user-provided hypothesis for an experiment (Spec 005)."""
         await self._execute_queued(
@@ -839,11 +1514,10 @@ class Database:
 
     async def get_comparison_group_experiments(self, group_id: str) -> list[dict]:
         """Return both experiments in a comparison group, ordered by variant (Spec 006)."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT * FROM experiments WHERE comparison_group_id = ? ORDER BY comparison_variant",
             (group_id,),
         )
-        rows = await cursor.fetchall()
         return [dict(r) for r in rows]
 
     async def delete_experiment(self, experiment_id: str) -> None:
@@ -883,13 +1557,93 @@ class Database:
         )
         return cursor.lastrowid
 
-    async def get_turns(self, experiment_id: str) -> list[dict]:
-        """Get all turns for an experiment, ordered by round and ID."""
-        cursor = await self.db.execute(
-            "SELECT * FROM turns WHERE experiment_id = ? ORDER BY round, id",
-            (experiment_id,),
+    @staticmethod
+    def _turn_range(
+        experiment_id: str,
+        round_from: int | None,
+        round_to: int | None,
+        after_turn_id: int | None,
+    ) -> tuple[str, list[Any]]:
+        """WHERE clause + params for a turn range (rounds inclusive)."""
+        clauses = ["experiment_id = ?"]
+        params: list[Any] = [experiment_id]
+        if round_from is not None:
+            clauses.append("round >= ?")
+            params.append(round_from)
+        if round_to is not None:
+            clauses.append("round <= ?")
+            params.append(round_to)
+        if after_turn_id is not None:
+            clauses.append("id > ?")
+            params.append(after_turn_id)
+        return " AND ".join(clauses), params
+
+    async def get_turns(
+        self,
+        experiment_id: str,
+        round_from: int | None = None,
+        round_to: int | None = None,
+        after_turn_id: int | None = None,
+        limit: int | None = None,
+        latest: int | None = None,
+    ) -> list[dict]:
+        """Get turns for an experiment, ordered by round and ID.
+
+        With no arguments returns every turn. round_from/round_to bound the
+        round (inclusive), after_turn_id keeps only turns inserted after that
+        one, limit caps the result at the first N of the range and latest=N
+        returns the last N of it (still in chronological order).
+        """
+        where, params = self._turn_range(experiment_id, round_from, round_to, after_turn_id)
+        if latest is not None:
+            rows = await self.fetchall(
+                f"SELECT * FROM turns WHERE {where} ORDER BY round DESC, id DESC LIMIT ?",
+                (*params, latest),
+            )
+            return [dict(row) for row in reversed(rows)]
+        sql = f"SELECT * FROM turns WHERE {where} ORDER BY round, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = await self.fetchall(sql, params)
+        return [dict(row) for row in rows]
+
+    async def iter_turns(
+        self,
+        experiment_id: str,
+        round_from: int | None = None,
+        round_to: int | None = None,
+        after_turn_id: int | None = None,
+        batch_size: int = 200,
+    ) -> AsyncIterator[dict]:
+        """Yield turns in order, fetched in keyset batches on (round, id).
+
+        Each batch is its own short query, so a slow consumer (e.g. a
+        streaming HTTP response) never pins a pooled read connection.
+        """
+        where, params = self._turn_range(experiment_id, round_from, round_to, after_turn_id)
+        position: tuple[int, int] | None = None
+        while True:
+            sql = f"SELECT * FROM turns WHERE {where}"
+            batch_params = list(params)
+            if position is not None:
+                sql += " AND (round, id) > (?, ?)"
+                batch_params.extend(position)
+            sql += " ORDER BY round, id LIMIT ?"
+            batch_params.append(batch_size)
+            rows = await self.fetchall(sql, batch_params)
+            for row in rows:
+                yield dict(row)
+            if len(rows) < batch_size:
+                return
+            position = (rows[-1]["round"], rows[-1]["id"])
+
+    async def count_turns(self, experiment_id: str) -> int:
+        """Number of turns recorded for an experiment."""
+        row = await self.fetchone(
+            "SELECT COUNT(*) AS n FROM turns WHERE experiment_id = ?", (experiment_id,)
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return row["n"]
 
     async def get_stale_running_sessions(self, min_age_minutes: int = 3) -> list[dict]:
         """Return experiments stuck in 'running' status older than min_age_minutes.
@@ -904,8 +1658,7 @@ class Database:
             ORDER BY created_at ASC
         """
         interval = f"-{min_age_minutes} minutes"
-        cursor = await self.db.execute(query, (interval,))
-        rows = await cursor.fetchall()
+        rows = await self.fetchall(query, (interval,))
         return [dict(r) for r in rows]
 
     async def insert_turn_score(
@@ -923,9 +1676,33 @@ class Database:
             (turn_id, creativity, coherence, engagement, novelty),
         )
 
+    async def insert_turn_scores(self, rows: list[dict]) -> None:
+        """Persist scores for several turns in one transaction.
+
+        Each row holds turn_id, creativity, coherence, engagement, novelty.
+        """
+        async with self._write_lock:  # type: ignore[union-attr]
+            try:
+                await self.db.executemany(
+                    """INSERT INTO turn_scores (turn_id, creativity, coherence, engagement, novelty)
+                        VALUES (:turn_id, :creativity, :coherence, :engagement, :novelty)""",
+                    rows,
+                )
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+
+    async def add_judge_calls(self, experiment_id: str, count: int = 1) -> None:
+        """Count judge-model requests made on behalf of an experiment."""
+        await self._execute_queued(
+            "UPDATE experiments SET judge_calls = COALESCE(judge_calls, 0) + ? WHERE id = ?",
+            (count, experiment_id),
+        )
+
     async def get_turn_scores(self, experiment_id: str) -> list[dict]:
         """Get all turn scores for an experiment, joined on turn_id."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             """SELECT ts.turn_id, ts.creativity, ts.coherence,
                       ts.engagement, ts.novelty, ts.scored_at
                FROM turn_scores ts
@@ -934,7 +1711,7 @@ class Database:
                ORDER BY t.round, t.id""",
             (experiment_id,),
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     # -- Vocabulary -----------------------------------------------------------
 
@@ -976,13 +1753,13 @@ class Database:
 
     async def get_vocabulary(self, experiment_id: str) -> list[dict]:
         """Get all vocabulary for an experiment, ordered by round coined."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             """SELECT * FROM vocabulary
                WHERE experiment_id = ?
                ORDER BY coined_round, id""",
             (experiment_id,),
         )
-        rows = [dict(row) for row in await cursor.fetchall()]
+        rows = [dict(row) for row in rows]
         for row in rows:
             if row.get("parent_words"):
                 row["parent_words"] = json.loads(row["parent_words"])
@@ -1000,11 +1777,11 @@ class Database:
         can render an inheritance badge on WordCard.
         """
         # Fetch parent word set (case-insensitive)
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT LOWER(word) FROM vocabulary WHERE experiment_id = ?",
             (parent_experiment_id,),
         )
-        parent_words = {row[0] for row in await cursor.fetchall()}
+        parent_words = {row[0] for row in rows}
         if not parent_words:
             return
 
@@ -1026,7 +1803,7 @@ class Database:
         Returns a nested dict {id, ..., children: [...]} rooted at root_id,
         or None if root_id does not exist.
         """
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             """WITH RECURSIVE tree AS (
                    SELECT id, parent_experiment_id, fork_at_round, label, status,
                           model_a, model_b, rounds_planned, rounds_completed,
@@ -1041,7 +1818,7 @@ class Database:
                SELECT * FROM tree""",
             (root_id,),
         )
-        rows = [dict(row) for row in await cursor.fetchall()]
+        rows = [dict(row) for row in rows]
         if not rows:
             return None
 
@@ -1063,95 +1840,284 @@ class Database:
 
     # -- Analytics ------------------------------------------------------------
 
-    async def get_experiment_stats(self, experiment_id: str) -> dict:
-        """Pre-aggregated analytics for one experiment.
+    async def get_experiment_agent_rollups(
+        self, experiment_id: str,
+    ) -> tuple[list[dict], list[dict]]:
+        """Return (agents, rounds) rollup rows for one experiment.
 
-        Returns per-round latency/tokens broken out by speaker position,
-        vocabulary growth curve, and summary totals. The frontend receives
-        chart-ready data without needing to crunch raw turns.
+        agents: one row per speaker that took a turn, in speaking order.
+        rounds: every (speaker, round) bucket, including vocab-only buckets.
+        Both tables are maintained by triggers, so this is O(agents x rounds)
+        regardless of how many turns or words the experiment has.
         """
-        # Fetch experiment to know speaker names
-        exp = await self.get_experiment(experiment_id)
-        if not exp:
-            return {"turns_by_round": [], "vocab_by_round": [], "totals": {}}
-        # turns.speaker stores display names; experiments store litellm strings
-        model_a_name = get_display_name(exp["model_a"])
-        model_b_name = get_display_name(exp["model_b"])
-
-        # Per-turn data ordered by round
-        cursor = await self.db.execute(
-            """SELECT round, speaker, latency_seconds, token_count
-               FROM turns WHERE experiment_id = ? ORDER BY round, id""",
+        agents = await self.fetchall(
+            """SELECT * FROM experiment_agent_rollup
+               WHERE experiment_id = ? AND turns > 0
+               ORDER BY first_turn_id""",
+            (experiment_id,),
+        )
+        rounds = await self.fetchall(
+            """SELECT * FROM experiment_agent_round_rollup
+               WHERE experiment_id = ? ORDER BY round""",
             (experiment_id,),
         )
-        turn_rows = await cursor.fetchall()
+        return [dict(r) for r in agents], [dict(r) for r in rounds]
 
-        # Group turns into per-round stats
-        rounds_data: dict[int, dict] = {}
-        total_tokens = 0
-        latencies_a: list[float] = []
-        latencies_b: list[float] = []
+    async def get_experiment_stats(self, experiment_id: str) -> dict:
+        """Pre-aggregated analytics for one experiment.
 
-        for row in turn_rows:
+        Returns per-round latency/tokens per agent, vocabulary growth curve,
+        and summary totals, read from the agent rollup tables. Agents are
+        keyed by speaker in speaking order; the first two are also exposed
+        as the legacy model_a_*/model_b_* fields.
+        """
+        agents, round_rows = await self.get_experiment_agent_rollups(experiment_id)
+        speakers = [a["speaker"] for a in agents]
+        legacy = dict(zip(speakers, ("model_a", "model_b")))
+
+        rounds_data: dict[int, dict] = {}
+        vocab_per_round: dict[int, int] = {}
+        for row in round_rows:
             r = row["round"]
+            if row["vocab_coined"]:
+                vocab_per_round[r] = vocab_per_round.get(r, 0) + row["vocab_coined"]
+            if not row["turns"]:
+                continue
             if r not in rounds_data:
                 rounds_data[r] = {
                     "round": r,
                     "model_a_latency": None, "model_b_latency": None,
                     "model_a_tokens": None, "model_b_tokens": None,
+                    "agents": {},
                 }
             entry = rounds_data[r]
-            lat = row["latency_seconds"]
-            tok = row["token_count"]
-
-            # First speaker in each round wrote model_a, second wrote model_b
-            if row["speaker"] == model_a_name or (
-                row["speaker"] != model_b_name and entry["model_a_latency"] is None
-            ):
-                entry["model_a_latency"] = round(lat, 2) if lat else None
-                entry["model_a_tokens"] = tok
-                if lat:
-                    latencies_a.append(lat)
-            else:
-                entry["model_b_latency"] = round(lat, 2) if lat else None
-                entry["model_b_tokens"] = tok
-                if lat:
-                    latencies_b.append(lat)
-
-            if tok:
-                total_tokens += tok
+            lat = row["latency_sum"] / row["latency_n"] if row["latency_n"] else None
+            tok = int(row["tokens_sum"]) if row["tokens_n"] else None
+            entry["agents"][row["speaker"]] = {
+                "latency": round(lat, 2) if lat else None,
+                "tokens": tok,
+            }
+            prefix = legacy.get(row["speaker"])
+            if prefix:
+                entry[f"{prefix}_latency"] = round(lat, 2) if lat else None
+                entry[f"{prefix}_tokens"] = tok
 
         turns_by_round = sorted(rounds_data.values(), key=lambda x: x["round"])
 
         # Vocab growth curve (cumulative words coined by round)
-        cursor = await self.db.execute(
-            """SELECT coined_round, COUNT(*) as count
-               FROM vocabulary WHERE experiment_id = ?
-               GROUP BY coined_round ORDER BY coined_round""",
-            (experiment_id,),
-        )
-        vocab_rows = await cursor.fetchall()
         cumulative = 0
         vocab_by_round = []
-        for row in vocab_rows:
-            cumulative += row["count"]
-            vocab_by_round.append({
-                "round": row["coined_round"],
-                "cumulative_count": cumulative,
-            })
+        for r in sorted(vocab_per_round):
+            cumulative += vocab_per_round[r]
+            vocab_by_round.append({"round": r, "cumulative_count": cumulative})
+
+        def _avg_latency(a: dict | None) -> float | None:
+            if not a or not a["latency_n"]:
+                return None
+            return round(a["latency_sum"] / a["latency_n"], 2)
 
         return {
+            "agents": speakers,
             "turns_by_round": turns_by_round,
             "vocab_by_round": vocab_by_round,
             "totals": {
-                "total_turns": len(turn_rows),
-                "total_tokens": total_tokens,
-                "avg_latency_a": round(sum(latencies_a) / len(latencies_a), 2) if latencies_a else None,
-                "avg_latency_b": round(sum(latencies_b) / len(latencies_b), 2) if latencies_b else None,
+                "total_turns": sum(a["turns"] for a in agents),
+                "total_tokens": int(sum(a["tokens_sum"] for a in agents)),
+                "avg_latency_a": _avg_latency(agents[0] if agents else None),
+                "avg_latency_b": _avg_latency(agents[1] if len(agents) > 1 else None),
                 "vocab_count": cumulative,
+                "by_agent": [
+                    {
+                        "speaker": a["speaker"],
+                        "model": a["model"],
+                        "turns": a["turns"],
+                        "tokens": int(a["tokens_sum"]),
+                        "avg_latency": _avg_latency(a),
+                        "vocab_coined": a["vocab_coined"],
+                    }
+                    for a in agents
+                ],
             },
         }
 
+    async def get_model_radar_stats(self, experiment_id: str) -> list[dict]:
+        """Compute radar chart axes for every agent in one experiment.
+
+        Reads the agent rollup tables; returns raw values normalized to 0-1
+        relative to each other, one entry per agent in speaking order.
+        """
+        agents, round_rows = await self.get_experiment_agent_rollups(experiment_id)
+
+        # Per-round mean tokens per agent, for the engagement slope
+        round_means: dict[str, list[tuple[int, float]]] = {}
+        for row in round_rows:
+            if row["tokens_n"]:
+                round_means.setdefault(row["speaker"], []).append(
+                    (row["round"], row["tokens_sum"] / row["tokens_n"])
+                )
+
+        entries = []
+        for a in agents:
+            lat_n, tok_n = a["latency_n"], a["tokens_n"]
+            avg_lat = a["latency_sum"] / lat_n if lat_n else None
+            avg_tok = a["tokens_sum"] / tok_n if tok_n else None
+
+            verbosity_raw = avg_tok or 0
+            speed_raw = (1.0 / avg_lat) if avg_lat and avg_lat > 0 else 0
+            creativity_raw = a["vocab_coined"]
+
+            if lat_n >= 2:
+                variance = max(a["latency_sumsq"] / lat_n - avg_lat ** 2, 0.0)
+                consistency_raw = 1.0 / (math.sqrt(variance) + 0.01)
+            else:
+                # Single data point = no variance = perfectly consistent
+                consistency_raw = 1.0 / 0.01
+
+            points = round_means.get(a["speaker"], [])
+            if len(points) >= 2:
+                n = len(points)
+                x_mean = sum(x for x, _ in points) / n
+                y_mean = sum(y for _, y in points) / n
+                numer = sum((x - x_mean) * (y - y_mean) for x, y in points)
+                denom = sum((x - x_mean) ** 2 for x, _ in points)
+                engagement_raw = numer / denom if denom > 0 else 0
+            else:
+                engagement_raw = 0
+
+            entries.append({
+                "model": a["model"],
+                "display_name": a["speaker"],
+                "verbosity_raw": verbosity_raw,
+                "speed_raw": speed_raw,
+                "creativity_raw": creativity_raw,
+                "consistency_raw": consistency_raw,
+                "engagement_raw": engagement_raw,
+            })
+
+        # Normalize to 0-1
+        for axis in ["verbosity", "speed", "creativity", "consistency", "engagement"]:
+            raw_key = f"{axis}_raw"
+            values = [e[raw_key] for e in entries]
+            max_val = max(values) if values else 1
+            min_val = min(values) if values else 0
+            if max_val == min_val:
+                # All agents identical on this axis -- assign uniform score
+                for e in entries:
+                    e[axis] = 1.0
+                    del e[raw_key]
+            else:
+                span = max_val - min_val
+                for e in entries:
+                    e[axis] = round((e[raw_key] - min_val) / span, 3)
+                    del e[raw_key]
+
+        return entries
+
+    # -- Search ---------------------------------------------------------------
+
+    async def search(
+        self,
+        query: str,
+        kind: str = "all",
+        model: str | None = None,
+        preset: str | None = None,
+        mode: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        """Full-text search over turn content and vocabulary words/meanings.
+
+        kind is "turns", "vocabulary" or "all". model matches the speaking
+        model for turns and either side of the pairing for vocabulary; since /
+        until bound the experiment's created_at (ISO strings). Results are
+        ranked by bm25 (lower score = better match) and carry a snippet with
+        matches wrapped in ** **.
+        """
+        match = _fts_match_expr(query)
+        if not match:
+            return []
+
+        exp_clauses: list[str] = []
+        exp_params: list[Any] = []
+        for col, value in (("e.preset", preset), ("e.mode", mode)):
+            if value is not None:
+                exp_clauses.append(f"{col} = ?")
+                exp_params.append(value)
+        if since:
+            exp_clauses.append("e.created_at >= ?")
+            exp_params.append(since)
+        if until:
+            exp_clauses.append("e.created_at <= ?")
+            exp_params.append(until)
+
+        results: list[dict] = []
+        if kind in ("all", "turns"):
+            clauses = list(exp_clauses)
+            params = [match, *exp_params]
+            if model:
+                clauses.append("t.model = ?")
+                params.append(model)
+            where = "".join(f" AND {c}" for c in clauses)
+            rows = await self.fetchall(
+                f"""SELECT 'turn' AS kind, t.experiment_id, t.id AS turn_id, t.round,
+                           t.speaker, t.model, e.preset, e.mode, e.created_at,
+                           snippet(turns_fts, 0, '**', '**', '...', 16) AS snippet,
+                           bm25(turns_fts) AS score
+                    FROM turns_fts
+                    JOIN turns t ON t.id = turns_fts.rowid
+                    JOIN experiments e ON e.id = t.experiment_id
+                    WHERE turns_fts MATCH ?{where}
+                    ORDER BY score LIMIT ?""",
+                (*params, limit),
+            )
+            results.extend(dict(r) for r in rows)
+
+        if kind in ("all", "vocabulary"):
+            clauses = list(exp_clauses)
+            params = [match, *exp_params]
+            if model:
+                clauses.append("(e.model_a = ? OR e.model_b = ?)")
+                params.extend([model, model])
+            where = "".join(f" AND {c}" for c in clauses)
+            rows = await self.fetchall(
+                f"""SELECT 'vocabulary' AS kind, v.experiment_id, v.word, v.meaning,
+                           v.coined_by, v.coined_round AS round, e.preset, e.mode,
+                           e.created_at,
+                           snippet(vocabulary_fts, -1, '**', '**', '...', 16) AS snippet,
+                           bm25(vocabulary_fts) AS score
+                    FROM vocabulary_fts
+                    JOIN vocabulary v ON v.id = vocabulary_fts.rowid
+                    JOIN experiments e ON e.id = v.experiment_id
+                    WHERE vocabulary_fts MATCH ?{where}
+                    ORDER BY score LIMIT ?""",
+                (*params, limit),
+            )
+            results.extend(dict(r) for r in rows)
+
+        results.sort(key=lambda r: r["score"])
+        return results[:limit]
+
+    async def rebuild_search_index(self) -> dict:
+        """Rebuild both FTS indexes from their content tables and optimize them.
+
+        Needed only if the indexes drift (e.g. rows edited with triggers
+        disabled, or a database restored from a copy without them).
+        """
+        t0 = time.perf_counter()
+        async with self._write_lock:  # type: ignore[union-attr]
+            for table in ("turns_fts", "vocabulary_fts"):
+                await self.db.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+                await self.db.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+            await self.db.commit()
+        turns = await self.fetchone("SELECT COUNT(*) AS n FROM turns")
+        vocab = await self.fetchone("SELECT COUNT(*) AS n FROM vocabulary")
+        return {
+            "turns": turns["n"],
+            "vocabulary": vocab["n"],
+            "elapsed_s": round(time.perf_counter() - t0, 2),
+        }
+
     # -- Tournaments ----------------------------------------------------------
 
     async def create_tournament(
@@ -1199,10 +2165,9 @@ class Database:
 
     async def get_tournament(self, tournament_id: str) -> dict | None:
         """Fetch a tournament by ID, with models_json parsed."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT * FROM tournaments WHERE id = ?", (tournament_id,)
         )
-        row = await cursor.fetchone()
         if not row:
             return None
         d = dict(row)
@@ -1213,23 +2178,23 @@ class Database:
         self, limit: int = 50, offset: int = 0,
     ) -> list[dict]:
         """List tournaments, most recent first."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT * FROM tournaments ORDER BY created_at DESC LIMIT ? OFFSET ?",
             (limit, offset),
         )
-        rows = [dict(row) for row in await cursor.fetchall()]
+        rows = [dict(row) for row in rows]
         for row in rows:
             row["models"] = json.loads(row["models_json"])
         return rows
 
     async def get_tournament_matches(self, tournament_id: str) -> list[dict]:
         """Get all matches for a tournament, ordered by match_order."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             """SELECT * FROM tournament_matches
                WHERE tournament_id = ? ORDER BY match_order""",
             (tournament_id,),
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     async def update_tournament_status(
         self,
@@ -1266,105 +2231,157 @@ class Database:
             params,
         )
 
+    async def accumulate_tournament_match_stats(self, match_id: int) -> bool:
+        """Fold one completed match into tournament_model_stats.
+
+        Scans only that match's turns and vocabulary, once. Idempotent: the
+        match's stats_applied flag is claimed in the same transaction, so a
+        second call (or a leaderboard catch-up racing the engine) is a no-op.
+        Returns True if the match was applied.
+        """
+        row = await self.fetchone(
+            """SELECT tm.tournament_id, tm.experiment_id, e.model_a, e.model_b
+               FROM tournament_matches tm JOIN experiments e ON e.id = tm.experiment_id
+               WHERE tm.id = ? AND tm.status = 'completed' AND tm.stats_applied = 0""",
+            (match_id,),
+        )
+        if not row:
+            return False
+        tournament_id, exp_id = row["tournament_id"], row["experiment_id"]
+        models = (row["model_a"], row["model_b"])
+
+        # Falsy latency/token values are ignored, matching the old per-request scan
+        per_model = await self.fetchall(
+            """SELECT model,
+                      COUNT(NULLIF(latency_seconds, 0)) AS latency_n,
+                      TOTAL(latency_seconds) AS latency_sum,
+                      TOTAL(latency_seconds * latency_seconds) AS latency_sumsq,
+                      COUNT(NULLIF(token_count, 0)) AS tokens_n,
+                      TOTAL(token_count) AS tokens_sum
+               FROM turns WHERE experiment_id = ? AND model IN (?, ?)
+               GROUP BY model""",
+            (exp_id, *models),
+        )
+        per_round = await self.fetchall(
+            """SELECT model, round, COUNT(*) AS tokens_n, TOTAL(token_count) AS tokens_sum
+               FROM turns
+               WHERE experiment_id = ? AND model IN (?, ?) AND token_count
+               GROUP BY model, round""",
+            (exp_id, *models),
+        )
+        vocab_rows = await self.fetchall(
+            """SELECT coined_by, COUNT(*) AS count
+               FROM vocabulary WHERE experiment_id = ? GROUP BY coined_by""",
+            (exp_id,),
+        )
+        # Vocab coined_by holds display names (relay speaker names)
+        vocab_by_speaker = {r["coined_by"]: r["count"] for r in vocab_rows}
+        turn_stats = {r["model"]: r for r in per_model}
+
+        model_rows = []
+        for model in models:
+            t = turn_stats.get(model)
+            model_rows.append((
+                tournament_id, model,
+                t["latency_n"] if t else 0, t["latency_sum"] if t else 0.0,
+                t["latency_sumsq"] if t else 0.0,
+                t["tokens_n"] if t else 0, t["tokens_sum"] if t else 0.0,
+                vocab_by_speaker.get(get_display_name(model), 0),
+            ))
+
+        async with self._write_lock:  # type: ignore[union-attr]
+            cursor = await self.db.execute(
+                """UPDATE tournament_matches SET stats_applied = 1
+                   WHERE id = ? AND stats_applied = 0""",
+                (match_id,),
+            )
+            if cursor.rowcount == 0:
+                await self.db.rollback()
+                return False
+            try:
+                await self.db.executemany(
+                    """INSERT INTO tournament_model_stats
+                           (tournament_id, model, matches, latency_n, latency_sum,
+                            latency_sumsq, tokens_n, tokens_sum, vocab_coined)
+                       VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (tournament_id, model) DO UPDATE SET
+                           matches = matches + 1,
+                           latency_n = latency_n + excluded.latency_n,
+                           latency_sum = latency_sum + excluded.latency_sum,
+                           latency_sumsq = latency_sumsq + excluded.latency_sumsq,
+                           tokens_n = tokens_n + excluded.tokens_n,
+                           tokens_sum = tokens_sum + excluded.tokens_sum,
+                           vocab_coined = vocab_coined + excluded.vocab_coined""",
+                    model_rows,
+                )
+                await self.db.executemany(
+                    """INSERT INTO tournament_model_round_tokens
+                           (tournament_id, model, round, tokens_n, tokens_sum)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (tournament_id, model, round) DO UPDATE SET
+                           tokens_n = tokens_n + excluded.tokens_n,
+                           tokens_sum = tokens_sum + excluded.tokens_sum""",
+                    [(tournament_id, r["model"], r["round"], r["tokens_n"], r["tokens_sum"])
+                     for r in per_round],
+                )
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+        return True
+
     async def get_tournament_leaderboard(self, tournament_id: str) -> list[dict]:
-        """Aggregate per-model stats across all completed tournament matches.
+        """Per-model stats across all completed tournament matches.
 
-        For each model, computes: matches_played, avg_latency, avg_tokens,
-        total_vocab_coined, plus raw radar axes (verbosity, speed, creativity,
+        Reads the running accumulators in tournament_model_stats (maintained by
+        accumulate_tournament_match_stats) and normalizes them; completed
+        matches not yet folded in (e.g. from before the table existed) are
+        applied first. Each entry has matches_played, avg_latency, avg_tokens,
+        total_vocab_coined, plus radar axes (verbosity, speed, creativity,
         consistency, engagement). Sorted by total_vocab_coined DESC.
         Winner = first row.
         """
-        matches = await self.get_tournament_matches(tournament_id)
-        completed_exp_ids = [
-            m["experiment_id"]
-            for m in matches
-            if m["status"] == "completed" and m["experiment_id"]
-        ]
-        if not completed_exp_ids:
-            return []
-
-        # Gather per-model raw data across all completed experiments
-        model_data: dict[str, dict] = {}  # model -> aggregated data
-
-        for exp_id in completed_exp_ids:
-            exp = await self.get_experiment(exp_id)
-            if not exp:
-                continue
+        pending = await self.fetchall(
+            """SELECT id FROM tournament_matches
+               WHERE tournament_id = ? AND status = 'completed'
+                 AND experiment_id IS NOT NULL AND stats_applied = 0""",
+            (tournament_id,),
+        )
+        for row in pending:
+            await self.accumulate_tournament_match_stats(row["id"])
 
-            cursor = await self.db.execute(
-                """SELECT model, latency_seconds, token_count, round
-                   FROM turns WHERE experiment_id = ? ORDER BY round, id""",
-                (exp_id,),
-            )
-            turn_rows = await cursor.fetchall()
+        stats_rows = await self.fetchall(
+            "SELECT * FROM tournament_model_stats WHERE tournament_id = ?",
+            (tournament_id,),
+        )
+        if not stats_rows:
+            return []
+        round_rows = await self.fetchall(
+            """SELECT model, round, tokens_sum * 1.0 / tokens_n AS avg_tokens
+               FROM tournament_model_round_tokens
+               WHERE tournament_id = ? AND tokens_n > 0
+               ORDER BY model, round""",
+            (tournament_id,),
+        )
+        rounds_by_model: dict[str, list[tuple[int, float]]] = {}
+        for r in round_rows:
+            rounds_by_model.setdefault(r["model"], []).append((r["round"], r["avg_tokens"]))
 
-            cursor = await self.db.execute(
-                """SELECT coined_by, COUNT(*) as count
-                   FROM vocabulary WHERE experiment_id = ?
-                   GROUP BY coined_by""",
-                (exp_id,),
-            )
-            vocab_rows = await cursor.fetchall()
-            vocab_by_model = {r["coined_by"]: r["count"] for r in vocab_rows}
-
-            # Map speaker names to model strings
-            speakers = {}
-            for row in turn_rows:
-                speakers[row["model"]] = True
-
-            for model_str in [exp["model_a"], exp["model_b"]]:
-                if model_str not in model_data:
-                    model_data[model_str] = {
-                        "latencies": [],
-                        "token_counts": [],
-                        "vocab_coined": 0,
-                        "matches": 0,
-                        "rounds_tokens": {},  # round -> [token_counts]
-                    }
-                md = model_data[model_str]
-                md["matches"] += 1
-
-            # Assign turn data to the correct model
-            # Speaker names in turns match display names used in relay
-            # but model column has the litellm string
-            for row in turn_rows:
-                model_str = row["model"]
-                if model_str not in model_data:
-                    continue
-                md = model_data[model_str]
-                if row["latency_seconds"]:
-                    md["latencies"].append(row["latency_seconds"])
-                if row["token_count"]:
-                    md["token_counts"].append(row["token_count"])
-                    r = row["round"]
-                    md["rounds_tokens"].setdefault(r, []).append(row["token_count"])
-
-            # Vocab: speaker names are display names, need to map
-            # The relay engine uses get_display_name for speaker names
-            from server.config import get_display_name
-            for model_str in [exp["model_a"], exp["model_b"]]:
-                display = get_display_name(model_str)
-                if display in vocab_by_model:
-                    model_data[model_str]["vocab_coined"] += vocab_by_model[display]
-
-        # Compute per-model stats
         entries = []
-        for model_str, md in model_data.items():
-            from server.config import get_display_name
-            lats = md["latencies"]
-            toks = md["token_counts"]
-            avg_lat = sum(lats) / len(lats) if lats else None
-            avg_tok = sum(toks) / len(toks) if toks else None
+        for md in stats_rows:
+            model_str = md["model"]
+            lat_n, tok_n = md["latency_n"], md["tokens_n"]
+            avg_lat = md["latency_sum"] / lat_n if lat_n else None
+            avg_tok = md["tokens_sum"] / tok_n if tok_n else None
 
             # Radar raw values
             verbosity_raw = avg_tok or 0
             speed_raw = (1.0 / avg_lat) if avg_lat and avg_lat > 0 else 0
             creativity_raw = md["vocab_coined"]
 
-            # Consistency = inverse of latency std dev
-            if len(lats) >= 2:
-                mean_lat = sum(lats) / len(lats)
-                variance = sum((x - mean_lat) ** 2 for x in lats) / len(lats)
+            # Consistency = inverse of latency std dev (population, from sum/sumsq)
+            if lat_n >= 2:
+                variance = max(md["latency_sumsq"] / lat_n - avg_lat ** 2, 0.0)
                 std_lat = math.sqrt(variance)
                 consistency_raw = 1.0 / (std_lat + 0.01)  # avoid div by zero
             else:
@@ -1372,16 +2389,13 @@ class Database:
                 consistency_raw = 1.0 / 0.01
 
             # Engagement = slope of avg tokens per round (growth rate)
-            rt = md["rounds_tokens"]
-            if len(rt) >= 2:
-                rounds_sorted = sorted(rt.keys())
-                avgs = [sum(rt[r]) / len(rt[r]) for r in rounds_sorted]
-                # Simple linear regression slope
-                n = len(avgs)
-                x_mean = sum(rounds_sorted) / n
-                y_mean = sum(avgs) / n
-                numer = sum((x - x_mean) * (y - y_mean) for x, y in zip(rounds_sorted, avgs))
-                denom = sum((x - x_mean) ** 2 for x in rounds_sorted)
+            points = rounds_by_model.get(model_str, [])
+            if len(points) >= 2:
+                n = len(points)
+                x_mean = sum(x for x, _ in points) / n
+                y_mean = sum(y for _, y in points) / n
+                numer = sum((x - x_mean) * (y - y_mean) for x, y in points)
+                denom = sum((x - x_mean) ** 2 for x, _ in points)
                 engagement_raw = numer / denom if denom > 0 else 0
             else:
                 engagement_raw = 0
@@ -1440,31 +2454,31 @@ class Database:
     ) -> list[dict]:
         """Fetch recent memories for a model pair, newest first."""
         pair = sorted([model_a, model_b])
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             """SELECT * FROM model_memory
                WHERE model_a = ? AND model_b = ?
                ORDER BY created_at DESC LIMIT ?""",
             (pair[0], pair[1], limit),
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     async def list_all_memories(self) -> list[dict]:
         """Return all memory rows, newest first."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT model_a, model_b, summary, created_at FROM model_memory ORDER BY created_at DESC"
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     async def delete_memories_for_pair(self, model_a: str, model_b: str) -> int:
         """Delete all memory rows for a model pair. Returns rows deleted."""
         pair = sorted([model_a, model_b])
-        await self._execute_queued(
+        # The DELETE's own cursor: changes() would report whichever write the
+        # writer's batch ran last
+        cursor = await self._execute_queued(
             "DELETE FROM model_memory WHERE model_a = ? AND model_b = ?",
             (pair[0], pair[1]),
         )
-        cursor = await self.db.execute("SELECT changes()")
-        row = await cursor.fetchone()
-        return row[0] if row else 0
+        return cursor.rowcount
 
     async def generate_memory_summary(self, experiment_id: str) -> str:
         """Build a concise memory string from an experiment's vocab + preset.
@@ -1490,112 +2504,6 @@ class Database:
                 word_parts.append(w["word"])
         return f'{preset}, {rounds_done} rounds: coined: {", ".join(word_parts)}'
 
-    async def get_model_radar_stats(self, experiment_id: str) -> list[dict]:
-        """Compute radar chart axes for both models in one experiment.
-
-        Returns raw values normalized to 0-1 relative to each other.
-        """
-        exp = await self.get_experiment(experiment_id)
-        if not exp:
-            return []
-
-        cursor = await self.db.execute(
-            """SELECT model, latency_seconds, token_count, round
-               FROM turns WHERE experiment_id = ? ORDER BY round, id""",
-            (experiment_id,),
-        )
-        turn_rows = await cursor.fetchall()
-
-        cursor = await self.db.execute(
-            """SELECT coined_by, COUNT(*) as count
-               FROM vocabulary WHERE experiment_id = ?
-               GROUP BY coined_by""",
-            (experiment_id,),
-        )
-        vocab_rows = await cursor.fetchall()
-        vocab_by_speaker = {r["coined_by"]: r["count"] for r in vocab_rows}
-
-        from server.config import get_display_name
-
-        model_stats: dict[str, dict] = {}
-        for model_str in [exp["model_a"], exp["model_b"]]:
-            model_stats[model_str] = {
-                "latencies": [],
-                "token_counts": [],
-                "rounds_tokens": {},
-                "vocab_coined": vocab_by_speaker.get(get_display_name(model_str), 0),
-            }
-
-        for row in turn_rows:
-            ms = row["model"]
-            if ms not in model_stats:
-                continue
-            if row["latency_seconds"]:
-                model_stats[ms]["latencies"].append(row["latency_seconds"])
-            if row["token_count"]:
-                model_stats[ms]["token_counts"].append(row["token_count"])
-                r = row["round"]
-                model_stats[ms]["rounds_tokens"].setdefault(r, []).append(row["token_count"])
-
-        entries = []
-        for model_str, ms in model_stats.items():
-            lats = ms["latencies"]
-            toks = ms["token_counts"]
-            avg_lat = sum(lats) / len(lats) if lats else None
-            avg_tok = sum(toks) / len(toks) if toks else None
-
-            verbosity_raw = avg_tok or 0
-            speed_raw = (1.0 / avg_lat) if avg_lat and avg_lat > 0 else 0
-            creativity_raw = ms["vocab_coined"]
-
-            if len(lats) >= 2:
-                mean_lat = sum(lats) / len(lats)
-                variance = sum((x - mean_lat) ** 2 for x in lats) / len(lats)
-                consistency_raw = 1.0 / (math.sqrt(variance) + 0.01)
-            else:
-                # Single data point = no variance = perfectly consistent
-                consistency_raw = 1.0 / 0.01
-
-            rt = ms["rounds_tokens"]
-            if len(rt) >= 2:
-                rounds_sorted = sorted(rt.keys())
-                avgs = [sum(rt[r]) / len(rt[r]) for r in rounds_sorted]
-                n = len(avgs)
-                x_mean = sum(rounds_sorted) / n
-                y_mean = sum(avgs) / n
-                numer = sum((x - x_mean) * (y - y_mean) for x, y in zip(rounds_sorted, avgs))
-                denom = sum((x - x_mean) ** 2 for x in rounds_sorted)
-                engagement_raw = numer / denom if denom > 0 else 0
-            else:
-                engagement_raw = 0
-
-            entries.append({
-                "model": model_str,
-                "display_name": get_display_name(model_str),
-                "verbosity_raw": verbosity_raw,
-                "speed_raw": speed_raw,
-                "creativity_raw": creativity_raw,
-                "consistency_raw": consistency_raw,
-                "engagement_raw": engagement_raw,
-            })
-
-        # Normalize to 0-1
-        for axis in ["verbosity", "speed", "creativity", "consistency", "engagement"]:
-            raw_key = f"{axis}_raw"
-            values = [e[raw_key] for e in entries]
-            max_val = max(values) if values else 1
-            min_val = min(values) if values else 0
-            if max_val == min_val:
-                # Both models identical on this axis -- assign uniform score
-                for e in entries:
-                    e[axis] = 1.0
-                    del e[raw_key]
-            else:
-                span = max_val - min_val
-                for e in entries:
-                    e[axis] = round((e[raw_key] - min_val) / span, 3)
-                    del e[raw_key]
-
     # -- Personas -------------------------------------------------------------
 
     async def create_persona(
@@ -1621,17 +2529,16 @@ class Database:
 
     async def get_all_personas(self) -> list[dict]:
         """Return all personas ordered by creation date."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT * FROM personas ORDER BY created_at ASC"
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     async def get_persona(self, persona_id: str) -> dict | None:
         """Return a single persona by ID, or None if not found."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT * FROM personas WHERE id = ?", (persona_id,)
         )
-        row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def update_persona(self, persona_id: str, **kwargs: Any) -> None:
@@ -1669,10 +2576,9 @@ class Database:
 
     async def get_documentary(self, experiment_id: str) -> str | None:
         """Return the cached documentary text, or None if not yet generated."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT documentary FROM experiments WHERE id = ?", (experiment_id,)
         )
-        row = await cursor.fetchone()
         return row["documentary"] if row else None
 
     # -- RPG Memory -----------------------------------------------------------
@@ -1705,12 +2611,11 @@ class Database:
                 pass
 
         # Key events: first 60 chars of each DM/narrator turn
-        cursor = await self.db.execute(
+        turn_rows = await self.fetchall(
             """SELECT speaker, content FROM turns
                WHERE experiment_id = ? ORDER BY round, id""",
             (experiment_id,),
         )
-        turn_rows = await cursor.fetchall()
         events: list[str] = []
         for row in turn_rows:
             if row["speaker"].lower() in ("dm", "narrator", "gm"):
@@ -1748,10 +2653,9 @@ class Database:
 
     async def get_system_events(self, limit: int = 1000) -> list[dict]:
         """Fetch persisted SSE events for hydration."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             "SELECT * FROM system_events ORDER BY id DESC LIMIT ?", (limit,)
         )
-        rows = await cursor.fetchall()
         return [dict(r) for r in reversed(rows)]
 
     async def save_rpg_state(
@@ -1773,14 +2677,14 @@ class Database:
                     is_awaiting_human = excluded.is_awaiting_human,
                     last_updated = excluded.last_updated""",
             (match_id, current_round, current_speaker_idx, int(is_awaiting_human), now),
+            coalesce_key=("rpg_state", match_id),
         )
 
     async def get_rpg_state(self, match_id: str) -> dict | None:
         """Fetch persisted RPG state for recovery."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT * FROM rpg_state WHERE match_id = ?", (match_id,)
         )
-        row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def delete_rpg_state(self, match_id: str) -> None:
@@ -1791,20 +2695,70 @@ class Database:
 
     async def get_latest_cold_summary(self, match_id: str) -> str | None:
         """Fetch the most recent narrative recap for this match."""
-        cursor = await self.db.execute(
-            "SELECT summary FROM cold_summaries WHERE match_id = ? ORDER BY through_round DESC LIMIT 1",
+        row = await self.get_latest_cold_summary_row(match_id)
+        return row["summary"] if row else None
+
+    async def get_latest_cold_summary_row(self, match_id: str) -> dict | None:
+        """Most recent recap with the round it covers: {"summary", "through_round"}."""
+        row = await self.fetchone(
+            "SELECT summary, through_round FROM cold_summaries "
+            "WHERE match_id = ? ORDER BY through_round DESC LIMIT 1",
             (match_id,),
         )
-        row = await cursor.fetchone()
-        return row["summary"] if row else None
+        return dict(row) if row else None
+
+    async def save_cold_summary(self, match_id: str, through_round: int, summary: str) -> None:
+        """Persist a narrative recap covering turns up to through_round."""
+        await self._execute_queued(
+            """INSERT INTO cold_summaries (match_id, through_round, summary, created_at)
+               VALUES (?, ?, ?, datetime('now'))
+               ON CONFLICT(match_id, through_round) DO UPDATE SET summary=excluded.summary""",
+            (match_id, through_round, summary),
+        )
+        self._context_cache.apply_cold(match_id, through_round, summary)
+
+    async def save_world_state(self, match_id: str, state_json: str) -> None:
+        """Replace the world-state bible for a match (last write wins)."""
+        # Sequence taken at enqueue time: matches the order the DB applies writes in
+        seq = self._context_cache.next_world_seq()
+        await self._execute_queued(
+            """INSERT INTO world_state (match_id, state_json, updated_at)
+               VALUES (?, ?, datetime('now'))
+               ON CONFLICT(match_id) DO UPDATE SET state_json=excluded.state_json, updated_at=excluded.updated_at""",
+            (match_id, state_json),
+            coalesce_key=("world_state", match_id),
+        )
+        self._context_cache.apply_world(match_id, seq, state_json)
+
+    async def get_layered_context(self, match_id: str) -> LayeredContext:
+        """Cold recap + world bible for the next turn, served from memory.
+
+        The first call for a match loads both from the DB; later calls are
+        dictionary lookups kept current by save_cold_summary/save_world_state.
+        Call evict_layered_context when the match ends.
+        """
+        return await self._context_cache.get(match_id, self._load_layered_context)
+
+    async def _load_layered_context(self, match_id: str, entry: _ContextEntry) -> None:
+        cold_row = await self.get_latest_cold_summary_row(match_id)
+        world = await self.get_world_state(match_id)
+        # Keep anything the summarizer wrote while these reads were in flight
+        if cold_row and cold_row["through_round"] > entry.cold_round:
+            entry.cold_summary, entry.cold_round = cold_row["summary"], cold_row["through_round"]
+        if entry.world_seq == 0:
+            entry.world_bible = world
+        entry.version += 1
+
+    def evict_layered_context(self, match_id: str) -> None:
+        """Drop a finished match's cached context."""
+        self._context_cache.evict(match_id)
 
     async def get_world_state(self, match_id: str) -> str | None:
         """Fetch the current extracted entity state (World Bible)."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT state_json FROM world_state WHERE match_id = ?",
             (match_id,),
         )
-        row = await cursor.fetchone()
         return row["state_json"] if row else None
 
     # -- Entity Snapshots (Session 24) ----------------------------------------
@@ -1828,14 +2782,14 @@ class Database:
         self, dm_model: str, preset_key: str | None, limit: int = 2
     ) -> list[dict]:
         """Fetch recent entity snapshots for a (dm_model, preset_key) pair, newest first."""
-        cursor = await self.db.execute(
+        rows = await self.fetchall(
             """SELECT match_id, snapshot_json, generated_at
                FROM entity_snapshots
                WHERE dm_model = ? AND (preset_key = ? OR (preset_key IS NULL AND ? IS NULL))
                ORDER BY generated_at DESC LIMIT ?""",
             (dm_model, preset_key, preset_key, limit),
         )
-        return [dict(row) for row in await cursor.fetchall()]
+        return [dict(row) for row in rows]
 
     # -- Collaboration Chemistry (Session 27) ---------------------------------
 
@@ -1863,10 +2817,33 @@ class Database:
 
     async def get_collaboration_metrics(self, experiment_id: str) -> dict | None:
         """Fetch collaboration chemistry metrics for an experiment."""
-        cursor = await self.db.execute(
+        row = await self.fetchone(
             "SELECT * FROM collaboration_metrics WHERE experiment_id = ?",
             (experiment_id,),
         )
-        row = await cursor.fetchone()
         return dict(row) if row else None
 
+
+# -- Maintenance CLI ---------------------------------------------------------------
+
+async def _cli_main(argv: list[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m server.db", description="Babel database maintenance")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild-search", help="rebuild the FTS5 search indexes")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db, read_pool_size=0)
+    await db.connect()
+    try:
+        if args.command == "rebuild-search":
+            print(json.dumps(await db.rebuild_search_index()))
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    asyncio.run(_cli_main())
@@ -0,0 +1,166 @@
+"""Echo chamber detection: which agents use which coined words, kept up to date.
+
+After every round the relay compares the coined vocabulary each agent has used
+(Jaccard similarity of the word sets). Rather than rescanning the whole
+transcript for every known word each time, EchoTracker does only new work:
+
+  - VocabMatcher is an Aho-Corasick automaton over the known words. Words are
+    inserted as they are coined and the failure links rebuilt lazily, so a
+    turn is matched against the entire vocabulary in one pass over its text.
+  - Each turn is scanned against the full vocabulary once, the first time
+    the tracker sees it, and its matches are folded into its speaker's word
+    set.
+  - Words coined after a turn was scanned still have to be looked for in it.
+    Each update that adds words builds a small matcher over just those words
+    and makes one pass over every earlier turn, so old text is rescanned for
+    new words only -- never for the whole vocabulary.
+
+Matching is case-insensitive substring matching. similarity() gives one pair,
+matrix() every pair of an N-agent session.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from itertools import combinations
+from typing import Iterable
+
+
+class VocabMatcher:
+    """Aho-Corasick automaton over a growing word list."""
+
+    def __init__(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._ends: list[list[str]] = [[]]          # words ending exactly at each state
+        self._out: list[tuple[str, ...]] = [()]     # ... plus those reached via failure links
+        self._words: set[str] = set()
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+    def add(self, word: str) -> bool:
+        """Insert word; False if it is empty or already known."""
+        if not word or word in self._words:
+            return False
+        self._words.add(word)
+        state = 0
+        for ch in word.upper():
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._ends.append([])
+                self._out.append(())
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._ends[state].append(word)
+        self._stale = True
+        return True
+
+    def _build(self) -> None:
+        """Breadth-first failure links and output sets for the current trie."""
+        goto, fail, ends, out = self._goto, self._fail, self._ends, self._out
+        queue: deque[int] = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            out[child] = tuple(ends[child])
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                out[child] = tuple(ends[child]) + out[fail[child]]
+                queue.append(child)
+        self._stale = False
+
+    def find(self, text: str) -> set[str]:
+        """Known words occurring anywhere in text (case-insensitive)."""
+        if not self._words:
+            return set()
+        if self._stale:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[str] = set()
+        state = 0
+        for ch in text.upper():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class EchoTracker:
+    """Per-speaker coined-word usage for one session, updated incrementally.
+
+    update() expects the session's turn list to be append-only (the relay only
+    ever appends), so it can resume where the previous call stopped.
+    """
+
+    def __init__(self) -> None:
+        self.matcher = VocabMatcher()
+        self.used: dict[str, set[str]] = {}
+        self._text: dict[str, list[str]] = {}       # speaker -> turns scanned so far (shared strings)
+        self._seen = 0
+
+    def update(self, turns: list[dict], known_words: Iterable[str]) -> None:
+        """Fold in turns and words added since the last call."""
+        new_words = [w for w in list(known_words) if self.matcher.add(w)]
+
+        # Words coined since the last call vs turns already scanned without them:
+        # one pass per earlier turn, matching only the new words
+        if new_words and self._text:
+            fresh = VocabMatcher()
+            for word in new_words:
+                fresh.add(word)
+            for speaker, texts in self._text.items():
+                found: set[str] = set()
+                for text in texts:
+                    found |= fresh.find(text)
+                    if len(found) == len(fresh):
+                        break
+                self.used[speaker] |= found
+
+        for t in turns[self._seen:]:
+            speaker = t.get("speaker", "")
+            if not speaker:
+                continue  # seed and system interventions belong to no agent
+            self.used.setdefault(speaker, set()).update(self.matcher.find(t["content"]))
+            self._text.setdefault(speaker, []).append(t["content"])
+        self._seen = len(turns)
+
+    def similarity(self, a: str, b: str) -> float:
+        """Jaccard similarity of the words speakers a and b have used."""
+        words_a = self.used.get(a, set())
+        words_b = self.used.get(b, set())
+        union = words_a | words_b
+        if not union:
+            return 0.0
+        return len(words_a & words_b) / len(union)
+
+    def matrix(self, speakers: list[str]) -> list[list[float]]:
+        """Symmetric pairwise similarity matrix (diagonal 1.0) in speakers order."""
+        n = len(speakers)
+        values = [[1.0 if i == j else 0.0 for j in range(n)] for i in range(n)]
+        for i, j in combinations(range(n), 2):
+            values[i][j] = values[j][i] = self.similarity(speakers[i], speakers[j])
+        return values
+
+    def most_similar(self, speakers: list[str]) -> tuple[float, tuple[str, str] | None]:
+        """Highest pairwise similarity among speakers, and the pair it belongs to."""
+        best, pair = 0.0, None
+        for a, b in combinations(speakers, 2):
+            sim = self.similarity(a, b)
+            if pair is None or sim > best:
+                best, pair = sim, (a, b)
+        return best, pair
@@ -13,10 +13,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import time
 from dataclasses import dataclass
 from typing import AsyncIterator
 
+from server import sim_clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,7 +32,7 @@ class SSEEvent:
 
     def __post_init__(self) -> None:
         if self.timestamp == 0.0:
-            self.timestamp = time.time()
+            self.timestamp = sim_clock.now()
         if self.match_id is None:
             self.match_id = self.payload.get("match_id")
 
@@ -58,16 +59,21 @@ class EventHub:
         self._max_history = max_history
         self._next_id: int = 1  # monotonically increasing SSE event counter
 
-    def publish(self, event_type: str, payload: dict) -> None:
-        """Broadcast an event to all matching subscribers."""
+    def publish(self, event_type: str, payload: dict, ephemeral: bool = False) -> None:
+        """Broadcast an event to all matching subscribers.
+
+        Ephemeral events (e.g. streamed token deltas) go to live subscribers
+        only and are kept out of history, so they can't evict real events.
+        """
         event = SSEEvent(event_type=event_type, payload=payload)
         event.event_id = self._next_id
         self._next_id += 1
 
         # Keep in history for late-joining clients
-        self._history.append(event)
-        if len(self._history) > self._max_history:
-            self._history = self._history[-self._max_history:]
+        if not ephemeral:
+            self._history.append(event)
+            if len(self._history) > self._max_history:
+                self._history = self._history[-self._max_history:]
 
         # Push to subscriber queues
         dead: list[int] = []
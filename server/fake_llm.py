@@ -0,0 +1,362 @@
+"""Local fake LLM provider for load tests and failure drills.
+
+Registered with litellm as the custom provider "fake". When FAKE_LLM_PROFILE
+names a profile, every outbound completion for a real MODEL_REGISTRY string
+("gemini/gemini-2.5-flash") is answered by the fake instead of the network,
+after the rate limiter, circuit breakers and _FALLBACK_MAP have done their
+routing -- so failover, retries and 429 handling run exactly as in production.
+
+Profiles live in server/fake_profiles/*.yaml (or any path). Each model entry
+(exact model string, or a provider prefix ending in "/") overrides the
+profile's defaults:
+
+  latency:  median_s, p95_s (lognormal), ttft_fraction for streamed calls
+  errors:   per-call probabilities of rate_limit (429 with retry_after_s),
+            timeout (hangs timeout_after_s, capped by the request timeout),
+            bad_request (400) and server_error (503)
+  content:  completion_tokens [min, max], vocabulary of coined ALL_CAPS words,
+            coin_rate (chance a reply defines a new word), echo_rate (chance a
+            reply parrots the previous turn), optional scripted replies
+
+Prompts that ask for JSON (judge scores, verdicts, hypothesis checks) get a
+filled-in copy of the template they contain, so scoring paths keep working.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import httpx
+import litellm
+import yaml
+from litellm import CustomLLM
+from litellm.types.utils import GenericStreamingChunk
+
+from server.config import FAKE_LLM_PROFILE, FAKE_LLM_SEED
+
+logger = logging.getLogger(__name__)
+
+PROFILES_DIR = Path(__file__).resolve().parent / "fake_profiles"
+PROVIDER = "fake"
+
+_Z95 = 1.645   # standard normal 95th percentile (lognormal p95 -> sigma)
+_STREAM_CHUNKS = 12
+
+_FILLER = (
+    "the signal returns and we shape it into something shared between us "
+    "each exchange adds a layer to the structure we are building together "
+    "consider how meaning drifts when two voices press on the same idea "
+    "I want to extend your last point and test where it breaks down "
+    "perhaps the pattern only holds because we keep agreeing to it"
+).split()
+_MEANINGS = (
+    "shared understanding", "a pause before agreement", "borrowed light",
+    "the space between turns", "a promise kept late", "an echo that changes",
+    "trust under pressure", "the first draft of a rule",
+)
+_SYLLABLES = ("ZY", "KOR", "VEL", "THA", "MOR", "QUI", "RAX", "SOL", "NEB", "DRA", "LUM", "TEK")
+_CAPS_RE = re.compile(r"\b([A-Z][A-Z0-9\-]{2,})\b")
+
+
+@dataclass
+class ModelProfile:
+    """Resolved behaviour for one model string."""
+    latency_median_s: float = 0.8
+    latency_p95_s: float = 2.5
+    ttft_fraction: float = 0.25
+    rate_limit: float = 0.0
+    timeout: float = 0.0
+    bad_request: float = 0.0
+    server_error: float = 0.0
+    retry_after_s: float | None = 2.0
+    timeout_after_s: float = 10.0
+    completion_tokens: tuple[int, int] = (80, 300)
+    vocabulary: list[str] = field(default_factory=list)
+    coin_rate: float = 0.5
+    echo_rate: float = 0.0
+    replies: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ModelProfile":
+        latency = data.get("latency") or {}
+        errors = data.get("errors") or {}
+        content = data.get("content") or {}
+        base = cls()
+        tokens = content.get("completion_tokens", base.completion_tokens)
+        return cls(
+            latency_median_s=float(latency.get("median_s", base.latency_median_s)),
+            latency_p95_s=float(latency.get("p95_s", base.latency_p95_s)),
+            ttft_fraction=float(latency.get("ttft_fraction", base.ttft_fraction)),
+            rate_limit=float(errors.get("rate_limit", 0.0)),
+            timeout=float(errors.get("timeout", 0.0)),
+            bad_request=float(errors.get("bad_request", 0.0)),
+            server_error=float(errors.get("server_error", 0.0)),
+            retry_after_s=errors.get("retry_after_s", base.retry_after_s),
+            timeout_after_s=float(errors.get("timeout_after_s", base.timeout_after_s)),
+            completion_tokens=(int(tokens[0]), int(tokens[1])),
+            vocabulary=[str(w).upper() for w in content.get("vocabulary") or []],
+            coin_rate=float(content.get("coin_rate", base.coin_rate)),
+            echo_rate=float(content.get("echo_rate", 0.0)),
+            replies=[str(r) for r in content.get("replies") or []],
+        )
+
+    def sample_latency(self, rng: random.Random) -> float:
+        median = max(self.latency_median_s, 1e-3)
+        sigma = max(0.0, math.log(max(self.latency_p95_s, median) / median) / _Z95)
+        return rng.lognormvariate(math.log(median), sigma)
+
+
+def _merge(base: dict, override: dict) -> dict:
+    merged = dict(base)
+    for key, val in (override or {}).items():
+        merged[key] = _merge(base[key], val) if isinstance(val, dict) and isinstance(base.get(key), dict) else val
+    return merged
+
+
+class FakeProfile:
+    """A loaded YAML profile: defaults plus per-model (or per-prefix) overrides."""
+
+    def __init__(self, name: str, data: dict) -> None:
+        self.name = name
+        self._defaults: dict = data.get("defaults") or {}
+        self._models: dict[str, dict] = data.get("models") or {}
+        self._resolved: dict[str, ModelProfile] = {}
+
+    @classmethod
+    def load(cls, ref: str) -> "FakeProfile":
+        """Load a profile by name (server/fake_profiles/<name>.yaml) or by path."""
+        path = Path(ref)
+        if not path.suffix:
+            path = PROFILES_DIR / f"{ref}.yaml"
+        with path.open(encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"Fake LLM profile {path} is not a YAML mapping")
+        return cls(data.get("id") or path.stem, data)
+
+    def for_model(self, model: str) -> ModelProfile:
+        """Exact key, else the longest matching prefix key ending in '/', else defaults."""
+        resolved = self._resolved.get(model)
+        if resolved is None:
+            override = self._models.get(model)
+            if override is None:
+                prefixes = [k for k in self._models if k.endswith("/") and model.startswith(k)]
+                override = self._models[max(prefixes, key=len)] if prefixes else {}
+            resolved = self._resolved[model] = ModelProfile.from_dict(_merge(self._defaults, override))
+        return resolved
+
+
+# -- Content ------------------------------------------------------------------
+
+def _coin_word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3)))
+
+
+def _fill_json_template(prompt: str, rng: random.Random) -> str:
+    """Answer a 'Return JSON' prompt by filling the template it quotes."""
+    match = re.search(r'\{"\w+":.*\}', prompt)
+    if not match:
+        return "{}"
+    template = match.group()
+
+    def fill(spec: str) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        for key, value in re.findall(r'"(\w+)":\s*(\.\.\.|"[^"]*"(?:\s*(?:\||or)\s*"[^"]*")*)', spec):
+            if value == "...":
+                out[key] = round(rng.uniform(0.3, 0.9), 2)
+            else:
+                options = re.findall(r'"([^"]*)"', value)
+                out[key] = rng.choice(options) if len(options) > 1 else "Fake judgement for load testing."
+        return out
+
+    batched = re.search(r'"(\w+)":\s*\[(\{.*\})\]', template)
+    if batched:
+        # One entry per "[turn_id=N]" block in the prompt
+        return json.dumps({batched.group(1): [
+            {**fill(batched.group(2)), "turn_id": int(tid)}
+            for tid in re.findall(r"\[turn_id=(\d+)\]", prompt)
+        ]})
+    return json.dumps(fill(template))
+
+
+def _compose(profile: ModelProfile, messages: list[dict], max_tokens: int | None,
+             rng: random.Random) -> tuple[str, str, int]:
+    """Return (content, finish_reason, completion_tokens) for one reply."""
+    last = str(messages[-1].get("content") or "") if messages else ""
+    if "json" in last.lower():
+        content = _fill_json_template(last, rng)
+        return content, "stop", max(1, len(content) // 4)
+
+    lo, hi = profile.completion_tokens
+    target = rng.randint(lo, max(lo, hi))
+    finish_reason = "stop"
+    if max_tokens and target > max_tokens:
+        target, finish_reason = max_tokens, "length"
+
+    if profile.replies:
+        content = profile.replies[rng.randrange(len(profile.replies))]
+    elif rng.random() < profile.echo_rate and last:
+        content = re.sub(r"^\[[^\]]+\]:\s*", "", last)   # parrot the previous turn (echo detector drill)
+    else:
+        seen = _CAPS_RE.findall(" ".join(str(m.get("content") or "") for m in messages[-4:]))
+        vocab = list(dict.fromkeys(seen + profile.vocabulary)) or [_coin_word(rng)]
+        words: list[str] = []
+        if rng.random() < profile.coin_rate:
+            new = _coin_word(rng)
+            words += f"I propose {new} to mean {rng.choice(_MEANINGS)}.".split()
+        while len(words) * 1.3 < target:
+            words.append(rng.choice(vocab) if rng.random() < 0.08 else rng.choice(_FILLER))
+        content = " ".join(words)
+    # ~4 chars per token
+    content = content[: target * 4]
+    return content, finish_reason, max(1, len(content) // 4)
+
+
+# -- Provider -----------------------------------------------------------------
+
+class FakeLLM(CustomLLM):
+    """litellm custom provider answering from a FakeProfile."""
+
+    def __init__(self, profile: FakeProfile, seed: int | None = None) -> None:
+        super().__init__()
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.calls: dict[str, dict[str, int]] = {}
+
+    def _count(self, model: str, outcome: str) -> None:
+        counts = self.calls.setdefault(model, {})
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+    async def preflight(self, model: str, timeout: float | None) -> None:
+        """Raise the sampled failure for one call (after its delay), if any.
+
+        Runs before the call is handed to litellm: a real provider rejects a
+        request when it is opened, so streamed calls must fail the same way
+        rather than mid-stream.
+        """
+        profile = self.profile.for_model(model)
+        latency = profile.sample_latency(self.rng)
+        roll = self.rng.random()
+        if roll < profile.rate_limit:
+            self._count(model, "rate_limit")
+            await asyncio.sleep(min(latency, 0.2))
+            headers = {} if profile.retry_after_s is None else {"retry-after": str(profile.retry_after_s)}
+            raise litellm.RateLimitError(
+                message=f"fake {model}: rate limit exceeded",
+                model=model, llm_provider=PROVIDER,
+                response=httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://fake")),
+            )
+        roll -= profile.rate_limit
+        if roll < profile.timeout:
+            self._count(model, "timeout")
+            await asyncio.sleep(min(profile.timeout_after_s, timeout or profile.timeout_after_s))
+            raise litellm.Timeout(message=f"fake {model}: request timed out", model=model, llm_provider=PROVIDER)
+        roll -= profile.timeout
+        if roll < profile.bad_request:
+            self._count(model, "bad_request")
+            raise litellm.BadRequestError(message=f"fake {model}: invalid request", model=model, llm_provider=PROVIDER)
+        roll -= profile.bad_request
+        if roll < profile.server_error:
+            self._count(model, "server_error")
+            await asyncio.sleep(latency)
+            raise litellm.ServiceUnavailableError(
+                message=f"fake {model}: overloaded", model=model, llm_provider=PROVIDER,
+            )
+        self._count(model, "ok")
+
+    async def acompletion(self, model: str, messages: list, *args, **kwargs) -> litellm.ModelResponse:
+        profile = self.profile.for_model(model)
+        max_tokens = (kwargs.get("optional_params") or {}).get("max_tokens")
+        latency = profile.sample_latency(self.rng)
+        content, finish_reason, completion_tokens = _compose(profile, messages, max_tokens, self.rng)
+        await asyncio.sleep(latency)
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        return litellm.ModelResponse(
+            model=model,
+            choices=[{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }],
+            usage={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+
+    async def astreaming(self, model: str, messages: list, *args, **kwargs) -> AsyncIterator[GenericStreamingChunk]:
+        profile = self.profile.for_model(model)
+        max_tokens = (kwargs.get("optional_params") or {}).get("max_tokens")
+        latency = profile.sample_latency(self.rng)
+        content, finish_reason, completion_tokens = _compose(profile, messages, max_tokens, self.rng)
+        await asyncio.sleep(latency * profile.ttft_fraction)
+        step = max(1, -(-len(content) // _STREAM_CHUNKS))
+        pieces = [content[i:i + step] for i in range(0, len(content), step)] or [""]
+        for piece in pieces:
+            yield GenericStreamingChunk(
+                text=piece, is_finished=False, finish_reason=None, usage=None, index=0, tool_use=None,
+            )
+            await asyncio.sleep(latency * (1 - profile.ttft_fraction) / len(pieces))
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        yield GenericStreamingChunk(
+            text="", is_finished=True, finish_reason=finish_reason, index=0, tool_use=None,
+            usage={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+
+    def stats(self) -> dict:
+        return {"profile": self.profile.name, "models": dict(sorted(self.calls.items()))}
+
+
+# -- Activation ---------------------------------------------------------------
+
+_handler: FakeLLM | None = None
+
+
+def install(profile: str | FakeProfile, seed: int | None = None) -> FakeLLM:
+    """Register the fake provider and route all completions to it."""
+    global _handler
+    if isinstance(profile, str):
+        profile = FakeProfile.load(profile)
+    _handler = FakeLLM(profile, seed)
+    litellm.custom_provider_map = [
+        p for p in litellm.custom_provider_map if p.get("provider") != PROVIDER
+    ] + [{"provider": PROVIDER, "custom_handler": _handler}]
+    logger.warning("Fake LLM provider active (profile %s) -- no real provider calls", profile.name)
+    return _handler
+
+
+def uninstall() -> None:
+    global _handler
+    _handler = None
+    litellm.custom_provider_map = [p for p in litellm.custom_provider_map if p.get("provider") != PROVIDER]
+
+
+def active() -> FakeLLM | None:
+    return _handler
+
+
+async def acompletion(**kwargs):
+    """litellm.acompletion, answered by the fake provider when it is installed."""
+    if _handler is None:
+        return await litellm.acompletion(**kwargs)
+    model = kwargs["model"].removeprefix(f"{PROVIDER}/")
+    timeout = kwargs.get("request_timeout") or kwargs.get("timeout")
+    await _handler.preflight(model, float(timeout) if isinstance(timeout, (int, float)) else None)
+    return await litellm.acompletion(**{**kwargs, "model": f"{PROVIDER}/{model}"})
+
+
+if FAKE_LLM_PROFILE:
+    install(FAKE_LLM_PROFILE, FAKE_LLM_SEED)
@@ -0,0 +1,309 @@
+"""Per-provider adaptive rate limiter for outbound LLM calls.
+
+Every litellm call acquires from the limiter for its provider prefix
+(gemini/, groq/, anthropic/ ...) before it is sent:
+
+  - Two token buckets per provider: requests/min and tokens/min, refilled
+    continuously from PROVIDER_RATE_LIMITS (config.get_rate_limits).
+  - Token cost is reserved up front (prompt estimate + max_tokens) and settled
+    against the real usage once the response arrives.
+  - A 429 blocks the model until its Retry-After / rate-limit reset hint and
+    halves the provider's budgets; each success adds a little back (AIMD).
+
+Waiters queue FIFO per provider, so a burst of concurrent sessions drains in
+arrival order at the rate the provider allows instead of tripping quotas.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator
+
+import litellm
+
+from server import cassette, sim_clock
+from server.config import get_rate_limits
+
+logger = logging.getLogger(__name__)
+
+_MIN_SCALE = 0.1               # AIMD floor: never drop below 10% of the configured budget
+_DECREASE_FACTOR = 0.5         # multiplicative decrease per 429
+_DECREASE_COOLDOWN_S = 5.0     # a burst of 429s from one overload counts once
+_INCREASE_STEP = 0.05          # additive increase per successful call
+_DEFAULT_RETRY_AFTER_S = 5.0   # block when a 429 carries no usable hint
+_MAX_RETRY_AFTER_S = 120.0     # daily-quota hints can be hours; fallbacks take over instead
+_DEFAULT_COMPLETION_TOKENS = 1024  # reserved when a call sets no max_tokens
+
+
+def provider_of(model: str) -> str:
+    """litellm provider prefix of a model string ("groq/llama-3..." -> "groq")."""
+    return model.split("/", 1)[0] if "/" in model else "openai"
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int | None = None) -> int:
+    """Cheap upper-ish estimate of a call's token cost: ~4 chars/token + completion cap."""
+    chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 4 + 4 * len(messages) + (max_tokens or _DEFAULT_COMPLETION_TOKENS)
+
+
+# -- Retry hints --------------------------------------------------------------
+
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+# Gemini reports the delay in the error body: "retryDelay": "36s"
+_RETRY_DELAY_RE = re.compile(r"retry[_ ]?delay\W+(\d+(?:\.\d+)?)s", re.IGNORECASE)
+
+
+def _parse_delay(value: str) -> float | None:
+    """Seconds from a Retry-After value: plain seconds, "1m30s"/"250ms", or an HTTP date."""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART_RE.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - sim_clock.now())
+    except (TypeError, ValueError):
+        return None
+
+
+def _response_headers(exc: Exception) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    response = getattr(exc, "response", None)
+    for source in (
+        getattr(response, "headers", None),
+        getattr(exc, "headers", None),
+        getattr(exc, "litellm_response_headers", None),
+    ):
+        if source:
+            for key, val in dict(source).items():
+                # litellm re-exposes raw provider headers as "llm_provider-<name>"
+                headers[str(key).lower().removeprefix("llm_provider-")] = str(val)
+    return headers
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """Delay a rate-limit error asks for, from headers or the error body (None = no hint)."""
+    headers = _response_headers(exc)
+    if "retry-after-ms" in headers:
+        try:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        except ValueError:
+            pass
+    if "retry-after" in headers:
+        delay = _parse_delay(headers["retry-after"])
+        if delay is not None:
+            return delay
+    # OpenAI/Groq style: time until the exhausted bucket resets
+    resets = [
+        d for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if name in headers and (d := _parse_delay(headers[name])) is not None
+    ]
+    if resets:
+        return max(resets)
+    match = _RETRY_DELAY_RE.search(str(exc))
+    return float(match.group(1)) if match else None
+
+
+# -- Buckets ------------------------------------------------------------------
+
+class _Bucket:
+    """Token bucket holding up to one minute of budget, refilled continuously."""
+
+    __slots__ = ("capacity", "level", "updated")
+
+    def __init__(self, capacity: float, now: float) -> None:
+        self.capacity = capacity
+        self.level = capacity
+        self.updated = now
+
+    def refill(self, now: float, capacity: float) -> None:
+        # capacity moves with the AIMD scale; level may sit negative after settling
+        self.capacity = capacity
+        self.level = min(capacity, self.level + (now - self.updated) * capacity / 60.0)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until amount is available (oversized requests wait for a full bucket)."""
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing * 60.0 / self.capacity
+
+
+class ProviderLimiter:
+    """RPM/TPM budgets and AIMD state for one provider prefix."""
+
+    def __init__(self, provider: str, rpm: int, tpm: int) -> None:
+        self.provider = provider
+        self.rpm = rpm
+        self.tpm = tpm
+        self.scale = 1.0
+        now = sim_clock.monotonic()
+        self._requests = _Bucket(rpm, now) if rpm > 0 else None
+        self._tokens = _Bucket(tpm, now) if tpm > 0 else None
+        self._blocked_until: dict[str, float] = {}   # model -> monotonic deadline
+        self._last_decrease = -math.inf
+        self._lock = asyncio.Lock()                  # FIFO queue of waiters
+        self._acquired = 0
+        self._waited = 0
+        self._wait_s = 0.0
+        self._rate_limited = 0
+
+    def _refill(self, now: float) -> None:
+        if self._requests is not None:
+            self._requests.refill(now, self.rpm * self.scale)
+        if self._tokens is not None:
+            self._tokens.refill(now, self.tpm * self.scale)
+
+    def _delay(self, tokens: int, now: float) -> float:
+        self._refill(now)
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.wait_for(1))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.wait_for(tokens))
+        return delay
+
+    def _blocked_for(self, model: str) -> float:
+        return self._blocked_until.get(model, 0.0) - sim_clock.monotonic()
+
+    async def acquire(self, model: str, tokens: int) -> int:
+        """Wait for budget for one call of ~tokens. Returns the tokens actually debited."""
+        waited = 0.0
+        while True:
+            # Sit out this model's Retry-After block before joining the provider
+            # queue, so sibling models (fallbacks, breaker probes) keep flowing
+            while (blocked := self._blocked_for(model)) > 0:
+                waited += blocked
+                await asyncio.sleep(blocked)
+            async with self._lock:
+                while (delay := self._delay(tokens, sim_clock.monotonic())) > 0:
+                    waited += delay
+                    await asyncio.sleep(delay)
+                if self._blocked_for(model) > 0:
+                    continue  # a 429 re-blocked the model while it queued: step out again
+                return self._debit(model, tokens, waited)
+
+    def _debit(self, model: str, tokens: int, waited: float) -> int:
+        self._blocked_until.pop(model, None)
+        debited = 0
+        if self._requests is not None:
+            self._requests.level -= 1
+        if self._tokens is not None:
+            debited = int(min(tokens, self._tokens.capacity))
+            self._tokens.level -= debited
+        self._acquired += 1
+        if waited:
+            self._waited += 1
+            self._wait_s += waited
+        return debited
+
+    def settle(self, debited: int, used: int) -> None:
+        """Correct the token bucket once a call's real usage is known."""
+        if self._tokens is not None:
+            self._tokens.level -= used - debited
+
+    def record_success(self) -> None:
+        self.scale = min(1.0, self.scale + _INCREASE_STEP)
+
+    def record_rate_limit(self, model: str, retry_after: float | None) -> None:
+        now = sim_clock.monotonic()
+        self._rate_limited += 1
+        if now - self._last_decrease >= _DECREASE_COOLDOWN_S:
+            self.scale = max(_MIN_SCALE, self.scale * _DECREASE_FACTOR)
+            self._last_decrease = now
+        delay = min(_MAX_RETRY_AFTER_S, _DEFAULT_RETRY_AFTER_S if retry_after is None else retry_after)
+        self._blocked_until[model] = max(self._blocked_until.get(model, 0.0), now + delay)
+        # The provider says we're out -- don't spend whatever the bucket thinks is left
+        self._refill(now)
+        if self._requests is not None:
+            self._requests.level = min(self._requests.level, 0.0)
+        logger.warning(
+            "Rate limited by %s (%s): blocking %.1fs, budget scale now %.2f",
+            self.provider, model, delay, self.scale,
+        )
+
+    def stats(self) -> dict:
+        now = sim_clock.monotonic()
+        self._refill(now)
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "scale": round(self.scale, 3),
+            "requests_available": round(self._requests.level, 2) if self._requests else None,
+            "tokens_available": int(self._tokens.level) if self._tokens else None,
+            "blocked": {
+                m: round(until - now, 1)
+                for m, until in self._blocked_until.items() if until > now
+            },
+            "acquired": self._acquired,
+            "waited": self._waited,
+            "wait_s": round(self._wait_s, 2),
+            "rate_limited": self._rate_limited,
+        }
+
+
+# -- Registry -----------------------------------------------------------------
+
+@dataclass
+class Reservation:
+    """Budget held for one call; set used to the real total_tokens when known."""
+    tokens: int
+    used: int | None = None
+
+
+class RateLimiter:
+    """Process-wide registry of ProviderLimiters, created on first use."""
+
+    def __init__(self) -> None:
+        self._providers: dict[str, ProviderLimiter] = {}
+
+    def for_model(self, model: str) -> ProviderLimiter:
+        provider = provider_of(model)
+        lim = self._providers.get(provider)
+        if lim is None:
+            rpm, tpm = get_rate_limits(provider)
+            lim = self._providers[provider] = ProviderLimiter(provider, rpm, tpm)
+        return lim
+
+    @asynccontextmanager
+    async def reserve(self, model: str, tokens: int) -> AsyncIterator[Reservation]:
+        """Hold budget for one call to model; feeds 429s and usage back into the limiter."""
+        if cassette.replaying():
+            yield Reservation(tokens=0)  # answered from a recording: no provider budget
+            return
+        lim = self.for_model(model)
+        slot = Reservation(tokens=await lim.acquire(model, tokens))
+        try:
+            yield slot
+        except litellm.RateLimitError as exc:
+            lim.settle(slot.tokens, 0)  # rejected requests consume no tokens
+            lim.record_rate_limit(model, retry_after_seconds(exc))
+            raise
+        else:
+            lim.record_success()
+            if slot.used is not None:
+                lim.settle(slot.tokens, slot.used)
+
+    def stats(self) -> dict[str, dict]:
+        return {p: lim.stats() for p, lim in sorted(self._providers.items())}
+
+
+limiter = RateLimiter()
+
+
+async def acompletion(**kwargs):
+    """litellm.acompletion behind the provider limiter (non-streaming calls)."""
+    tokens = estimate_tokens(kwargs.get("messages") or [], kwargs.get("max_tokens"))
+    async with limiter.reserve(kwargs["model"], tokens) as slot:
+        response = await cassette.acompletion(**kwargs)
+        slot.used = getattr(getattr(response, "usage", None), "total_tokens", None)
+    return response
@@ -10,12 +10,13 @@ Extracted from Factory/experiments/ai_relay.py with these changes:
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
+import math
 import os
 import random
 import re
-import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -25,7 +26,13 @@ from server.vocab_extractor import extract_vocabulary
 from server.summarizer_engine import update_layered_context
 from server.chemistry_engine import compute_chemistry
 from server.audit_engine import run_audit
-from server.config import RelayConfig
+from server import cassette, sim_clock
+from server.config import HOT_MAX_TURNS, RelayConfig, get_prompt_budget
+from server.circuit_breaker import breakers
+from server.echo_detector import EchoTracker
+from server.rate_limiter import acompletion as limited_acompletion
+from server.rate_limiter import estimate_tokens, limiter
+from server.response_cache import cache_key, response_cache
 
 if TYPE_CHECKING:
     from server.event_hub import EventHub
@@ -75,39 +82,79 @@ _FALLBACK_MAP: dict[str, list[tuple[str | None, str | None]]] = {
 }
 
 
-def _get_fallback(model: str, attempt: int) -> tuple[str, dict]:
-    """Return (model_to_use, extra_kwargs) for the given retry attempt.
-
-    attempt=0 returns the primary model with no overrides.
-    attempt>0 looks up a backup strategy in _FALLBACK_MAP.
-    Falls back gracefully to the original model if no backup is configured.
-    """
-    if attempt == 0:
-        return model, {}
-
-    # Exact match takes priority; then prefix match
+def _fallback_strategies(model: str) -> list[tuple[str | None, str | None]]:
+    """Backup strategies for model: exact _FALLBACK_MAP key first, then prefix match."""
     strategies = _FALLBACK_MAP.get(model)
     if strategies is None:
         for prefix, fb_list in _FALLBACK_MAP.items():
             if prefix.endswith("/") and model.startswith(prefix):
-                strategies = fb_list
-                break
+                return fb_list
+    return strategies or []
+
 
-    if not strategies or attempt - 1 >= len(strategies):
-        return model, {}  # No backup configured for this attempt number
+def _resolve_route(
+    model: str, backup_model: str | None, backup_key_env: str | None,
+) -> tuple[str, str, dict]:
+    """Return (route, model_to_use, extra_kwargs) for one backup strategy.
 
-    backup_model, backup_key_env = strategies[attempt - 1]
+    route names the circuit breaker: the model string, plus the backup key env
+    var when one is in use (a second key has its own quota). A backup key that
+    isn't set resolves to the plain model.
+    """
     result_model = backup_model or model
     extra: dict = {}
+    route = result_model
     if backup_key_env:
         key = os.getenv(backup_key_env)
         if key:
             extra["api_key"] = key
-    if backup_model:
-        logger.info("Failover attempt %d: %s -> %s", attempt, model, backup_model)
-    elif backup_key_env:
-        logger.info("Failover attempt %d: %s using backup key %s", attempt, model, backup_key_env)
-    return result_model, extra
+            route = f"{result_model} [{backup_key_env}]"
+    return route, result_model, extra
+
+
+def _plan_routes(model: str) -> list[tuple[str, str, dict]]:
+    """Return the (route, model_to_use, extra_kwargs) order for one call_model call.
+
+    Normally the primary, then the _FALLBACK_MAP strategies one per retry, with
+    any whose circuit breaker is open moved to the back. When the primary's own
+    breaker is open, attempt 0 goes straight to the healthiest fallback and the
+    primary is tried last. Routes whose open cooldown has expired get a
+    background half-open probe.
+    """
+    primary = (model, model, {})
+    fallbacks = [_resolve_route(model, bm, key_env) for bm, key_env in _fallback_strategies(model)]
+    for route, route_model, extra in (primary, *fallbacks):
+        if breakers.get(route).probe_due():
+            track_task(asyncio.create_task(_probe_route(route, route_model, extra)), _probe_tasks)
+    if breakers.get(model).allows():
+        return [primary] + sorted(fallbacks, key=lambda r: not breakers.get(r[0]).allows())
+    plan = sorted(fallbacks, key=lambda r: breakers.get(r[0]).health_key()) + [primary]
+    if plan[0] is not primary:
+        logger.info("Circuit open for %s -- routing to %s", model, plan[0][0])
+    return plan
+
+
+_PROBE_TIMEOUT_S = 20.0
+_probe_tasks: set[asyncio.Task] = set()
+
+
+async def _probe_route(route: str, model: str, extra: dict) -> None:
+    """Half-open probe: one 1-token completion decides whether the breaker closes."""
+    try:
+        await asyncio.wait_for(
+            limited_acompletion(
+                model=model,
+                messages=[{"role": "user", "content": "ping"}],
+                max_tokens=1,
+                **extra,
+            ),
+            timeout=_PROBE_TIMEOUT_S,
+        )
+    except Exception as exc:
+        logger.info("Probe of %s failed: %s", route, exc)
+        breakers.get(route).probe_result(False)
+    else:
+        breakers.get(route).probe_result(True)
 
 
 # -- Event Constants ----------------------------------------------------------
@@ -131,6 +178,32 @@ class RelayEvent:
     CHEMISTRY_READY = "relay.chemistry_ready"  # Collaboration metrics computed
     SIGNAL_ECHO = "relay.signal_echo"            # Echo chamber convergence warning
     SIGNAL_INTERVENTION = "relay.signal_intervention"  # Echo intervention injected
+    TOKEN = "relay.token"             # Streamed text delta for the turn in progress
+    TURN_COMMITTED = "relay.turn_committed"  # Simultaneous turn persisted: its turn_id
+
+
+def _turn_payload(
+    match_id: str,
+    round_num: int,
+    agent: "RelayAgent",
+    content: str,
+    latency: float,
+    turn_id: int | None,
+    prompt_tokens: int,
+    streamer: "TokenStreamer | None",
+) -> dict:
+    """relay.turn event body."""
+    return {
+        "match_id": match_id,
+        "round": round_num,
+        "speaker": agent.name,
+        "model": agent.model,
+        "content": content,
+        "latency_s": round(latency, 1),
+        "turn_id": turn_id,
+        "prompt_tokens": prompt_tokens,
+        "ttft_s": round(streamer.ttft, 2) if streamer and streamer.ttft is not None else None,
+    }
 
 
 # -- Task Exception Logging ---------------------------------------------------
@@ -187,6 +260,36 @@ def _parse_score_json(raw: str) -> dict:
         return defaults
 
 
+_SCORE_KEYS = ("creativity", "coherence", "engagement", "novelty")
+
+
+def _parse_batch_scores(raw: str, turn_ids: list[int]) -> dict[int, dict] | None:
+    """Extract per-turn scores from a batched judge response.
+
+    Returns {turn_id: scores} only when every requested turn is present with
+    all four numeric dimensions; None tells the caller to score individually.
+    """
+    try:
+        m = re.search(r"[\[{].*[\]}]", raw, re.DOTALL)
+        if not m:
+            return None
+        data = json.loads(m.group())
+        entries = data.get("scores") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return None
+        wanted = set(turn_ids)
+        parsed: dict[int, dict] = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or int(entry.get("turn_id", -1)) not in wanted:
+                continue
+            parsed[int(entry["turn_id"])] = {
+                key: max(0.0, min(1.0, float(entry[key]))) for key in _SCORE_KEYS
+            }
+    except (ValueError, TypeError, KeyError):
+        return None
+    return parsed if set(parsed) == set(turn_ids) else None
+
+
 def _parse_verdict_json(raw: str, n_agents: int = 2) -> dict:
     """Extract verdict JSON from LLM response. Returns tie on any failure.
 
@@ -259,7 +362,7 @@ async def score_turn(
         request_timeout=20,
     )
     try:
-        raw, _, _ = await call_model(agent, [{"role": "user", "content": prompt}])
+        raw = await _call_judge(agent, prompt, "score_turn", match_id, db)
         scores = _parse_score_json(raw)
         await db.insert_turn_score(turn_id=turn_id, **scores)
         hub.publish(RelayEvent.SCORE, {
@@ -271,6 +374,72 @@ async def score_turn(
         logger.warning("Scoring failed for turn %d: %s", turn_id, exc)
 
 
+async def score_turns(
+    batch: list[tuple[int, str, str]],
+    judge_model: str,
+    match_id: str,
+    hub: "EventHub",
+    db: "Database",
+) -> None:
+    """Score a window of turns with one structured-output judge call.
+
+    batch holds (turn_id, speaker, content). All turn_scores rows are written
+    in one transaction; if the response can't be parsed into a score for every
+    turn, each turn is re-scored individually via score_turn.
+    Fire-and-forget -- logs a warning on failure; never raises.
+    """
+    if len(batch) == 1:
+        turn_id, _, content = batch[0]
+        await score_turn(turn_id, content, judge_model, match_id, hub, db)
+        return
+
+    turns_text = "\n\n".join(
+        f"[turn_id={turn_id}] {speaker}:\n{content[:1500]}"
+        for turn_id, speaker, content in batch
+    )
+    prompt = (
+        "Score each of these AI-to-AI conversation turns on 4 dimensions (0.0 to 1.0 each). "
+        "Return JSON only, no prose, with one entry per turn:\n"
+        '{"scores": [{"turn_id": ..., "creativity": ..., "coherence": ..., '
+        '"engagement": ..., "novelty": ...}]}\n\n'
+        f"Turns:\n{turns_text}"
+    )
+    agent = RelayAgent(
+        name="judge",
+        model=judge_model,
+        temperature=0.2,
+        max_tokens=60 * len(batch) + 40,
+        request_timeout=30,
+    )
+    turn_ids = [turn_id for turn_id, _, _ in batch]
+    try:
+        raw = await _call_judge(agent, prompt, "score_turns", match_id, db)
+    except Exception as exc:
+        logger.warning("Batch scoring failed for turns %s: %s", turn_ids, exc)
+        return
+
+    scores = _parse_batch_scores(raw, turn_ids)
+    if scores is None:
+        logger.info("Batch scores unparseable for %s -- scoring %d turns individually",
+                    match_id, len(batch))
+        await asyncio.gather(*(
+            score_turn(turn_id, content, judge_model, match_id, hub, db)
+            for turn_id, _, content in batch
+        ))
+        return
+    try:
+        await db.insert_turn_scores([{"turn_id": tid, **scores[tid]} for tid in turn_ids])
+    except Exception as exc:
+        logger.warning("Saving batch scores failed for turns %s: %s", turn_ids, exc)
+        return
+    for turn_id in turn_ids:
+        hub.publish(RelayEvent.SCORE, {
+            "match_id": match_id,
+            "turn_id": turn_id,
+            **scores[turn_id],
+        })
+
+
 async def evaluate_hypothesis(
     match_id: str,
     hypothesis: str,
@@ -302,7 +471,7 @@ async def evaluate_hypothesis(
         request_timeout=30,
     )
     try:
-        raw, _, _ = await call_model(judge_agent, [{"role": "user", "content": prompt}])
+        raw = await _call_judge(judge_agent, prompt, "evaluate_hypothesis", match_id, db)
         # Strip markdown fences if present
         cleaned = raw.strip()
         if cleaned.startswith("```"):
@@ -359,7 +528,7 @@ async def final_verdict(
         request_timeout=30,
     )
     try:
-        raw, _, _ = await call_model(judge_agent, [{"role": "user", "content": prompt}])
+        raw = await _call_judge(judge_agent, prompt, "final_verdict", match_id, db)
         result = _parse_verdict_json(raw, n_agents=len(agents))
         # Resolve winner agent model string for the event
         winner_model = "tie"
@@ -410,7 +579,9 @@ async def check_pressure_valve(
     )
     
     try:
-        raw, _, _ = await call_model(agent, [{"role": "user", "content": prompt}])
+        raw, _, _ = await call_model(
+            agent, [{"role": "user", "content": prompt}], cache_site="pressure_valve",
+        )
         if "STABLE" in raw.upper():
             return None
         return raw.strip()
@@ -419,46 +590,289 @@ async def check_pressure_valve(
         return None
 
 
-# -- Echo Chamber Detection ---------------------------------------------------
+# -- Token Streaming ----------------------------------------------------------
+#
+# Opt-in (RelayConfig.stream_tokens): call_model streams the completion and
+# hands deltas to a TokenStreamer, which coalesces them into relay.token events
+# so a fast model produces a handful of events per second, not one per chunk.
 
-def compute_echo_similarity(
-    turns: list[dict],
-    known_words: set[str],
-    agents: "list[RelayAgent]",
-) -> float:
-    """Jaccard similarity of vocabulary usage between the first two agents.
+STREAM_FLUSH_CHARS = 80   # publish once this much text is buffered...
+STREAM_FLUSH_MS = 100     # ...or this long after the previous publish
+
+# model -> [streams, ttft_total_s, ttft_max_s, latency_total_s]
+_stream_stats: dict[str, list[float]] = {}
+
+
+class TokenStreamer:
+    """Coalesces streamed text deltas for one turn into relay.token events.
 
-    Returns 0.0 if there are fewer than 2 agents or no known words.
+    Deltas are ephemeral on the EventHub (live subscribers only); the final
+    relay.turn event still carries the full content. A retry after partial
+    output publishes reset=True so clients drop the abandoned text.
     """
-    if len(agents) < 2 or not known_words:
-        return 0.0
 
-    agent_a_name, agent_b_name = agents[0].name, agents[1].name
-    words_a: set[str] = set()
-    words_b: set[str] = set()
+    def __init__(self, hub: EventHub, match_id: str, speaker: str, model: str, round_num: int):
+        self.hub = hub
+        self.match_id = match_id
+        self.speaker = speaker
+        self.model = model
+        self.round_num = round_num
+        self.ttft: float | None = None
+        self._buf: list[str] = []
+        self._buf_chars = 0
+        self._seq = 0
+        self._sent = False
+        self._last_flush = sim_clock.monotonic()
+
+    def _publish(self, delta: str, reset: bool = False) -> None:
+        self.hub.publish(RelayEvent.TOKEN, {
+            "match_id": self.match_id,
+            "speaker": self.speaker,
+            "model": self.model,
+            "round": self.round_num,
+            "delta": delta,
+            "seq": self._seq,
+            "reset": reset,
+        }, ephemeral=True)
+        self._seq += 1
+        self._last_flush = sim_clock.monotonic()
+
+    def start_attempt(self) -> None:
+        """Discard partial output from a failed attempt before retrying."""
+        if self._sent or self._buf:
+            self._buf.clear()
+            self._buf_chars = 0
+            self._sent = False
+            self._publish("", reset=True)
+
+    def push(self, delta: str) -> None:
+        self._buf.append(delta)
+        self._buf_chars += len(delta)
+        if (self._buf_chars >= STREAM_FLUSH_CHARS
+                or (sim_clock.monotonic() - self._last_flush) * 1000 >= STREAM_FLUSH_MS):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        delta = "".join(self._buf)
+        self._buf.clear()
+        self._buf_chars = 0
+        self._sent = True
+        self._publish(delta)
+
+
+def _record_stream(model: str, ttft: float, latency: float) -> None:
+    stats = _stream_stats.setdefault(model, [0, 0.0, 0.0, 0.0])
+    stats[0] += 1
+    stats[1] += ttft
+    stats[2] = max(stats[2], ttft)
+    stats[3] += latency
+
+
+def get_stream_stats() -> dict[str, dict]:
+    """Per-model time-to-first-token and total latency for streamed turns."""
+    return {
+        model: {
+            "streams": int(n),
+            "ttft_avg_s": round(ttft_total / n, 3),
+            "ttft_max_s": round(ttft_max, 3),
+            "latency_avg_s": round(latency_total / n, 3),
+        }
+        for model, (n, ttft_total, ttft_max, latency_total) in _stream_stats.items()
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _supports_stream_usage(model: str) -> bool:
+    """Whether litellm accepts stream_options for this model (usage in the final chunk)."""
+    provider, _, name = model.partition("/")
+    try:
+        params = litellm.get_supported_openai_params(model=name, custom_llm_provider=provider)
+    except Exception:
+        return False
+    return "stream_options" in (params or [])
 
-    for t in turns:
-        content_upper = t["content"].upper()
-        speaker = t.get("speaker", "")
-        used = {w for w in known_words if w.upper() in content_upper}
-        if speaker == agent_a_name:
-            words_a.update(used)
-        elif speaker == agent_b_name:
-            words_b.update(used)
 
-    union = words_a | words_b
-    if not union:
-        return 0.0
-    return len(words_a & words_b) / len(union)
+def _usage_total_tokens(usage) -> int | None:
+    # Some providers return usage as dict, others as object
+    if hasattr(usage, "total_tokens"):
+        return usage.total_tokens
+    if isinstance(usage, dict):
+        return usage.get("total_tokens")
+    return None
+
+
+async def _stream_completion(
+    model: str,
+    messages: list[dict],
+    agent: RelayAgent,
+    extra: dict,
+    streamer: TokenStreamer,
+    t0: float,
+) -> tuple[str, int | None]:
+    """Stream one completion into streamer. Returns (content, total_tokens)."""
+    if _supports_stream_usage(model):
+        extra = {**extra, "stream_options": {"include_usage": True}}
+    response = await cassette.acompletion(
+        model=model,
+        messages=messages,
+        max_tokens=agent.max_tokens,
+        temperature=agent.temperature,
+        request_timeout=agent.request_timeout,
+        stream=True,
+        **extra,
+    )
+    parts: list[str] = []
+    usage = None
+    async for chunk in response:
+        choices = getattr(chunk, "choices", None) or []
+        delta = getattr(choices[0].delta, "content", None) if choices else None
+        if delta:
+            if streamer.ttft is None:
+                streamer.ttft = sim_clock.now() - t0
+            parts.append(delta)
+            streamer.push(delta)
+        usage = getattr(chunk, "usage", None) or usage
+    streamer.flush()
+    content = "".join(parts)
+    token_count = _usage_total_tokens(usage)
+    if token_count is None and content:
+        # No usage chunk from this provider: estimate prompt + completion locally
+        token_count = count_tokens(model, content) + sum(
+            count_tokens(model, m["content"]) for m in messages
+        )
+    return content, token_count
 
 
 # -- LLM Call with Retry ------------------------------------------------------
 
+# Opt-in hedging (RelayConfig.hedge_requests): when a non-streamed attempt runs
+# past its route's observed p90 latency, the next route in the plan (the first
+# _FALLBACK_MAP alternative) is fired in parallel and the slower one cancelled.
+HEDGE_QUANTILE = 0.9
+HEDGE_MIN_DELAY_S = 2.0   # never hedge calls that are merely not instant
+
+
+@dataclass
+class HedgeStats:
+    """Per-experiment hedging counters; call_model increments them in place."""
+    fired: int = 0   # attempts where the backup route was launched
+    won: int = 0     # ...and the backup answered first
+
+
+@dataclass
+class CallOrigin:
+    """Where call_model's answer came from; call_model sets it in place."""
+    cached: bool = False     # response cache hit
+    replayed: bool = False   # cassette replay
+
+    @property
+    def provider(self) -> bool:
+        """True if the request actually went to the model provider."""
+        return not (self.cached or self.replayed)
+
+
+async def _call_route(
+    agent: RelayAgent,
+    messages: list[dict],
+    route: str,
+    model_to_use: str,
+    extra: dict,
+    est_tokens: int,
+    streamer: TokenStreamer | None = None,
+) -> tuple[str, float, int | None]:
+    """One attempt on one route: rate-limited, timeout-guarded, outcome fed to its breaker."""
+    async with limiter.reserve(model_to_use, est_tokens) as slot:
+        t0 = sim_clock.now()  # time queued for budget isn't model latency
+        try:
+            if streamer is not None:
+                streamer.start_attempt()
+                streamer.ttft = None
+                content, token_count = await asyncio.wait_for(
+                    _stream_completion(model_to_use, messages, agent, extra, streamer, t0),
+                    timeout=agent.request_timeout + 5,
+                )
+            else:
+                response = await asyncio.wait_for(
+                    cassette.acompletion(
+                        model=model_to_use,
+                        messages=messages,
+                        max_tokens=agent.max_tokens,
+                        temperature=agent.temperature,
+                        request_timeout=agent.request_timeout,
+                        **extra,
+                    ),
+                    timeout=agent.request_timeout + 5,
+                )
+                content = response.choices[0].message.content
+                token_count = _usage_total_tokens(response.usage)
+        except _LITELLM_NON_RETRYABLE:
+            raise
+        except Exception:
+            breakers.get(route).record(False, sim_clock.now() - t0)
+            raise
+        latency = sim_clock.now() - t0
+        breakers.get(route).record(True, latency)
+        slot.used = token_count
+        if streamer is not None and streamer.ttft is not None:
+            _record_stream(model_to_use, streamer.ttft, latency)
+        return content or "[NO OUTPUT]", latency, token_count
+
+
+async def _hedged_call(
+    agent: RelayAgent,
+    messages: list[dict],
+    primary: tuple[str, str, dict],
+    backup: tuple[str, str, dict],
+    delay: float,
+    est_tokens: int,
+    hedge: HedgeStats,
+    match_id: str | None,
+) -> tuple[str, float, int | None]:
+    """Run primary; if it hasn't answered after delay, race backup against it."""
+    first = asyncio.create_task(_call_route(agent, messages, *primary, est_tokens))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result()
+    hedge.fired += 1
+    logger.info("[%s] %s slower than %.1fs -- hedging with %s",
+                match_id or "?", primary[0], delay, backup[0])
+    second = asyncio.create_task(_call_route(agent, messages, *backup, est_tokens))
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (first, second):
+                if task in done and task.exception() is None:
+                    if task is second:
+                        hedge.won += 1
+                    return task.result()
+        # Both failed: surface the primary's error to the retry loop
+        raise first.exception()  # type: ignore[misc]
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # mark a losing failure as retrieved
+
+
+def _hedge_delay(route: str) -> float | None:
+    """Seconds to wait on route before hedging, or None without enough history."""
+    observed = breakers.get(route).latency_quantile(HEDGE_QUANTILE)
+    return None if observed is None else max(HEDGE_MIN_DELAY_S, observed)
+
+
 async def call_model(
     agent: RelayAgent,
     messages: list[dict],
     max_retries: int = 3,
     match_id: str | None = None,
+    streamer: TokenStreamer | None = None,
+    hedge: HedgeStats | None = None,
+    cache_site: str | None = None,
+    origin: CallOrigin | None = None,
 ) -> tuple[str, float, int | None]:
     """Call an LLM with full conversation history.
 
@@ -466,48 +880,83 @@ async def call_model(
     Non-retryable errors (4xx auth/config) surface immediately.
     Transient failures retry with exponential backoff + jitter.
     Hard asyncio.wait_for outer timeout guards against provider hangs.
+    Each attempt first acquires budget from the provider's rate limiter;
+    429s are retried once the limiter's Retry-After block has passed.
+    Attempts follow _plan_routes: outcomes feed per-route circuit breakers,
+    and a primary with an open breaker is skipped in favour of a fallback.
+    With a streamer, the completion is streamed and deltas are published as
+    relay.token events; time to first token is recorded per model.
+    With hedge (non-streamed calls only), a slow attempt is raced against the
+    next route in the plan and the counters record how often that won.
+    With cache_site (non-streamed calls only), an identical earlier request is
+    answered from the response cache with latency 0.0.
+    With origin, records whether the answer came from the cache or a cassette
+    replay rather than the provider.
     """
+    key = None
+    if cache_site is not None and streamer is None:
+        key = cache_key(agent.model, messages, agent.temperature, agent.max_tokens)
+        hit = await response_cache.get(cache_site, key)
+        if hit is not None:
+            if origin is not None:
+                origin.cached = True
+            return hit.content, 0.0, hit.total_tokens
     last_exc: Exception | None = None
+    est_tokens = estimate_tokens(messages, agent.max_tokens)
+    plan = _plan_routes(agent.model)
     for attempt in range(max_retries + 1):
-        t0 = time.time()
+        # Past the configured strategies, keep retrying the primary
+        current = plan[attempt] if attempt < len(plan) else (agent.model, agent.model, {})
+        route = current[0]
+        if attempt and route != agent.model:
+            logger.info("Failover attempt %d: %s -> %s", attempt, agent.model, route)
+        backup = next((r for r in plan[attempt + 1:] if r[0] != route), None)
+        delay = _hedge_delay(route) if hedge is not None and streamer is None and backup else None
+        t0 = sim_clock.now()
         try:
-            model_to_use, extra = _get_fallback(agent.model, attempt)
-            response = await asyncio.wait_for(
-                litellm.acompletion(
-                    model=model_to_use,
-                    messages=messages,
-                    max_tokens=agent.max_tokens,
-                    temperature=agent.temperature,
-                    request_timeout=agent.request_timeout,
-                    **extra,
-                ),
-                timeout=agent.request_timeout + 5,
-            )
-            latency = time.time() - t0
-            content = response.choices[0].message.content or "[NO OUTPUT]"
-            # Some providers return usage as dict, others as object
-            usage = response.usage
-            if hasattr(usage, "total_tokens"):
-                token_count = usage.total_tokens
-            elif isinstance(usage, dict):
-                token_count = usage.get("total_tokens")
+            if delay is not None:
+                result = await _hedged_call(
+                    agent, messages, current, backup, delay, est_tokens, hedge, match_id,
+                )
             else:
-                token_count = None
-            return content, latency, token_count
+                result = await _call_route(agent, messages, *current, est_tokens, streamer=streamer)
+            if origin is not None:
+                origin.replayed = cassette.replaying()
+            if key is not None and result[0] != "[NO OUTPUT]":
+                await response_cache.put(
+                    cache_site, key, agent.model, result[0], result[1], total_tokens=result[2],
+                )
+            return result
         except _LITELLM_NON_RETRYABLE:
             raise
         except Exception as e:
             last_exc = e
-            latency = time.time() - t0
             logger.warning(
                 "[%s] Model %s attempt %d/%d failed (%.1fs): %s",
-                match_id or "?", agent.model, attempt + 1, max_retries + 1, latency, e,
+                match_id or "?", route, attempt + 1, max_retries + 1, sim_clock.now() - t0, e,
             )
-            if attempt < max_retries:
+            # 429s wait in the limiter (Retry-After block), not a blind backoff;
+            # failing over to a different route needs no cool-off either
+            next_route = plan[attempt + 1][0] if attempt + 1 < len(plan) else agent.model
+            if (attempt < max_retries and not isinstance(e, litellm.RateLimitError)
+                    and next_route == route):
                 await asyncio.sleep(2 ** attempt + random.uniform(0, 1))
     raise last_exc  # type: ignore[misc]
 
 
+async def _call_judge(
+    agent: RelayAgent, prompt: str, cache_site: str, match_id: str, db: "Database",
+) -> str:
+    """One judge prompt via call_model; counted on the experiment only if it reached the provider."""
+    origin = CallOrigin()
+    raw, _, _ = await call_model(
+        agent, [{"role": "user", "content": prompt}], cache_site=cache_site, origin=origin,
+    )
+    if origin.provider:
+        await db.add_judge_calls(match_id)
+    return raw
+
+
 # -- History Formatting -------------------------------------------------------
 
 def filter_turns_for_agent(turns: list[dict], agent_name: str) -> list[dict]:
@@ -586,6 +1035,118 @@ def build_messages(
     return messages
 
 
+# -- Token-Budgeted Context ---------------------------------------------------
+
+_MESSAGE_OVERHEAD_TOKENS = 4   # role + separators per chat message
+_MIN_TRUNCATED_TOKENS = 64     # don't bother sending a sliver of an older turn
+
+
+# cl100k token counts scaled to each provider's tokenizer. litellm.token_counter
+# would fetch Llama/other tokenizers from Hugging Face on first use (blocking,
+# and failing offline), so counting stays on litellm's bundled cl100k encoding.
+_TOKEN_RATIO: dict[str, float] = {
+    "anthropic": 1.15,
+    "gemini": 1.0,
+    "openai": 1.0,
+    "deepseek": 1.05,
+    "groq": 1.05,
+    "mistral": 1.1,
+    "openrouter": 1.1,
+    "ai21": 1.1,
+}
+
+
+@functools.lru_cache(maxsize=2048)
+def count_tokens(model: str, text: str) -> int:
+    """Estimated prompt tokens for text under the model's tokenizer.
+
+    Counts locally with litellm's bundled cl100k encoding, calibrated per
+    provider; falls back to ~4 chars/token if the encoder is unavailable.
+    """
+    try:
+        raw = len(litellm.encoding.encode(text, disallowed_special=()))
+    except Exception:
+        raw = len(text) // 4 + 1
+    return math.ceil(raw * _TOKEN_RATIO.get(model.split("/", 1)[0], 1.1))
+
+
+def _truncate_to_tokens(model: str, text: str, max_tokens: int) -> str:
+    """Keep the tail of text (the most recent part of a turn) within max_tokens."""
+    total = count_tokens(model, text)
+    if total <= max_tokens:
+        return text
+    keep = len(text) * max_tokens // total
+    while keep > 0:
+        tail = "..." + text[-keep:]
+        if count_tokens(model, tail) <= max_tokens:
+            return tail
+        keep = keep * 9 // 10
+    return ""
+
+
+def build_context(
+    system_prompt: str,
+    seed_turn: dict,
+    turns: list[dict],
+    perspective_idx: int,
+    agents: "list[RelayAgent]",
+    model: str,
+    cold_context: str | None = None,
+    world_bible: str | None = None,
+    hidden_goals: list[dict] | None = None,
+    budget: int | None = None,
+    cold_round: int = 0,
+) -> tuple[list[dict], int]:
+    """Pack the Frozen/Cold/Hot layers into the model's prompt-token budget.
+
+    Frozen (system prompt, world bible, agenda), the cold recap and the seed
+    are always sent. Hot turns start after cold_round, the last round the
+    recap covers, so no turn is sent twice; round-less (forked) turns count
+    as older than any recap. They are added newest-first while
+    they fit, up to HOT_MAX_TURNS; the first turn that doesn't fit is
+    truncated to the room left (keeping its end) and anything older is
+    dropped. Returns (messages, prompt_tokens) -- the count comes from the
+    same tokenizer.
+    """
+    budget = budget or get_prompt_budget(model)
+    self_name = agents[perspective_idx].name
+    base = build_messages(
+        system_prompt, [seed_turn], perspective_idx, agents,
+        cold_context=cold_context, world_bible=world_bible, hidden_goals=hidden_goals,
+    )
+    used = sum(count_tokens(model, m["content"]) + _MESSAGE_OVERHEAD_TOKENS for m in base)
+
+    hot: list[dict] = []
+    for turn in reversed(filter_turns_for_agent(turns, self_name)):
+        # Forked history carries no round: it predates this match, so it counts
+        # as older than any recap and is only sent while there is none
+        if cold_round and turn.get("round", 0) <= cold_round:
+            break  # already in the cold recap
+        if len(hot) >= HOT_MAX_TURNS:
+            break
+        speaker = turn.get("speaker") or ""
+        prefix = count_tokens(model, f"[{speaker}]: ") if speaker and speaker != self_name else 0
+        cost = count_tokens(model, turn["content"]) + prefix + _MESSAGE_OVERHEAD_TOKENS
+        if used + cost <= budget:
+            hot.append(turn)
+            used += cost
+            continue
+        room = budget - used - prefix - _MESSAGE_OVERHEAD_TOKENS
+        if room >= _MIN_TRUNCATED_TOKENS or (not hot and room > 0):
+            content = _truncate_to_tokens(model, turn["content"], room)
+            if content:
+                hot.append({**turn, "content": content})
+                used += count_tokens(model, content) + prefix + _MESSAGE_OVERHEAD_TOKENS
+        break
+    hot.reverse()
+
+    messages = build_messages(
+        system_prompt, [seed_turn] + hot, perspective_idx, agents,
+        cold_context=cold_context, world_bible=world_bible, hidden_goals=hidden_goals,
+    )
+    return messages, used
+
+
 # -- Vocabulary Extraction Helper ---------------------------------------------
 
 
@@ -722,6 +1283,7 @@ async def run_relay(
     preset = cfg.preset
     judge_model = cfg.judge_model
     enable_scoring = cfg.enable_scoring
+    score_window = cfg.score_window or len(agents)  # 0 = score a round per judge call
     enable_verdict = cfg.enable_verdict
     enable_memory = cfg.enable_memory
     initial_history: list[dict] = list(cfg.initial_history or [])
@@ -736,6 +1298,10 @@ async def run_relay(
     revelation_round = cfg.revelation_round
     vocabulary_seed: list[dict] = list(cfg.vocabulary_seed or [])
     enable_audit = cfg.enable_audit
+    stream_tokens = cfg.stream_tokens
+    simultaneous = cfg.turn_mode == "simultaneous"
+    hedge_stats = HedgeStats() if cfg.hedge_requests else None
+    hedges_saved = (0, 0)
     hypothesis = cfg.hypothesis
 
     # Pre-build speaker-name -> agent index map for pause-refresh
@@ -746,10 +1312,71 @@ async def run_relay(
     # Neutral seed -- shown to all agents as plain "user" message (no [Name]: prefix)
     seed_turn = {"speaker": "", "content": seed}
     known_words: set[str] = set()
+    echo_tracker = EchoTracker() if enable_echo_detector else None
     echo_intervention_fired: bool = False  # Max 1 echo intervention per experiment
-    start_time = time.time()
+    start_time = sim_clock.now()
+
+    async def _generate(
+        agent_idx: int, agent: RelayAgent, history: list[dict], round_num: int,
+    ) -> tuple[str, float, int | None, int, TokenStreamer | None]:
+        """Build this agent's context from history and call its model.
+
+        Returns (content, latency, tokens, prompt_tokens, streamer).
+        """
+        # Phase 17: Fetch layered context (cached; the summarizer refreshes it)
+        layered = await db.get_layered_context(match_id)
+        cold_context, world_bible = layered.cold_summary, layered.world_bible
+
+        if agent.persona:
+            agent_system = (
+                f"You are {agent.persona.name}. {agent.persona.personality}"
+            )
+            if agent.persona.backstory:
+                agent_system += f"\n\nBackground: {agent.persona.backstory}"
+            agent_system += f"\n\n{system_prompt}"
+        else:
+            agent_system = system_prompt
+
+        # Hot window: as many recent turns as fit this model's prompt budget
+        messages, prompt_tokens = build_context(
+            agent_system, seed_turn, history, agent_idx, agents, agent.model,
+            cold_context=cold_context,
+            world_bible=world_bible,
+            hidden_goals=hidden_goals,
+            cold_round=layered.cold_round,
+        )
+        streamer = (
+            TokenStreamer(hub, match_id, agent.name, agent.model, round_num)
+            if stream_tokens else None
+        )
+        content, latency, tokens = await call_model(
+            agent, messages, match_id=match_id, streamer=streamer, hedge=hedge_stats,
+        )
+        return content, latency, tokens, prompt_tokens, streamer
+
+    score_buffer: list[tuple[int, str, str]] = []  # (turn_id, speaker, content) awaiting a judge call
+
+    def _flush_scores() -> None:
+        """Launch one background judge call for the buffered turns."""
+        if not score_buffer:
+            return
+        _score_task = asyncio.create_task(
+            _bg_task(score_turns(list(score_buffer), judge_model, match_id, hub, db))
+        )
+        score_buffer.clear()
+        if background_tasks is not None:
+            track_task(_score_task, background_tasks)
+        else:
+            _score_task.add_done_callback(_log_task_exception)
+
+    pending: list[asyncio.Task] = []  # simultaneous mode: this round's generations
+    cassette_token = cassette.activate(cfg.cassette_mode, cfg.cassette_name or match_id)
 
     try:
+        # Newest persisted turn id; pause-resume fetches only rows after it
+        latest_row = await db.get_turns(match_id, latest=1)
+        last_turn_id: int = latest_row[0]["id"] if latest_row else 0
+
         # -- Memory injection (2-agent only for now) --------------------------
         if enable_memory and len(agents) == 2:
             memories = await db.get_memories_for_pair(agents[0].model, agents[1].model, limit=5)
@@ -782,12 +1409,13 @@ async def run_relay(
         for round_num in range(start_round, start_round + rounds):
             # -- Check cancellation --
             if cancel_event and cancel_event.is_set():
-                elapsed = time.time() - start_time
+                elapsed = sim_clock.now() - start_time
                 await db.update_experiment_status(
                     match_id, "stopped",
                     rounds_completed=round_num - 1,
                     elapsed_seconds=round(elapsed, 1),
                 )
+                _flush_scores()
                 hub.publish(RelayEvent.MATCH_COMPLETE, {
                     "match_id": match_id,
                     "rounds": round_num - 1,
@@ -797,55 +1425,91 @@ async def run_relay(
                 logger.info("Relay %s stopped by user after %d rounds", match_id, round_num - 1)
                 return
 
+            # -- Simultaneous mode: every agent answers the same round state at once.
+            # Each turn is published as soon as its generation finishes (turn_id
+            # null); the loop below then commits the round in agent order and
+            # announces each turn's id with relay.turn_committed.
+            pending = []
+            finished: dict[int, tuple[str, float, int | None, int, TokenStreamer | None]] = {}
+            if simultaneous:
+                if resume_event and not resume_event.is_set():
+                    hub.publish(RelayEvent.PAUSED, {"match_id": match_id, "round": round_num})
+                    await resume_event.wait()
+                    injected = await db.get_turns(match_id, after_turn_id=last_turn_id)
+                    turns.extend(
+                        {"speaker": t["speaker"], "content": t["content"], "round": t["round"]}
+                        for t in injected
+                    )
+                    if injected:
+                        last_turn_id = max(t["id"] for t in injected)
+                    hub.publish(RelayEvent.RESUMED, {"match_id": match_id, "round": round_num})
+                round_state = list(turns)
+                for agent_idx, agent in enumerate(agents):
+                    hub.publish(RelayEvent.THINKING, {
+                        "match_id": match_id,
+                        "speaker": agent.name,
+                        "model": agent.model,
+                        "round": round_num,
+                    })
+                    pending.append(asyncio.create_task(
+                        _generate(agent_idx, agent, round_state, round_num)
+                    ))
+                waiting = set(pending)
+                try:
+                    while waiting:
+                        done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                        for task in sorted(done, key=pending.index):
+                            agent_idx = pending.index(task)
+                            agent = agents[agent_idx]
+                            finished[agent_idx] = task.result()
+                            content, latency, _, prompt_tokens, streamer = finished[agent_idx]
+                            hub.publish(RelayEvent.TURN, _turn_payload(
+                                match_id, round_num, agent, content, latency, None, prompt_tokens, streamer,
+                            ))
+                except BaseException:
+                    # One generation failed (or we were cancelled): stop the rest and
+                    # retrieve every outcome so no task exception goes unobserved
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    raise
+
             # -- N-way round-robin: each agent speaks once per round --
             for agent_idx, agent in enumerate(agents):
 
                 # -- Pause checkpoint (before each agent's turn) --
-                if resume_event and not resume_event.is_set():
+                if not simultaneous and resume_event and not resume_event.is_set():
                     hub.publish(RelayEvent.PAUSED, {"match_id": match_id, "round": round_num})
                     await resume_event.wait()
-                    # Refresh history from DB to pick up any injected human turns
-                    fresh = await db.get_turns(match_id)
-                    turns[:] = [
-                        {"speaker": t["speaker"], "content": t["content"]}
-                        for t in fresh
-                    ]
+                    # Pick up any human turns injected while paused (only rows newer
+                    # than the last one this relay knows about)
+                    injected = await db.get_turns(match_id, after_turn_id=last_turn_id)
+                    turns.extend(
+                        {"speaker": t["speaker"], "content": t["content"], "round": t["round"]}
+                        for t in injected
+                    )
+                    if injected:
+                        last_turn_id = max(t["id"] for t in injected)
                     hub.publish(RelayEvent.RESUMED, {"match_id": match_id, "round": round_num})
 
-                # -- Build message history from this agent's perspective --
-                hub.publish(RelayEvent.THINKING, {
-                    "match_id": match_id,
-                    "speaker": agent.name,
-                    "model": agent.model,
-                    "round": round_num,
-                })
-
-                # Phase 17: Fetch layered context
-                cold_context = await db.get_latest_cold_summary(match_id)
-                world_bible = await db.get_world_state(match_id)
-
-                if agent.persona:
-                    agent_system = (
-                        f"You are {agent.persona.name}. {agent.persona.personality}"
-                    )
-                    if agent.persona.backstory:
-                        agent_system += f"\n\nBackground: {agent.persona.backstory}"
-                    agent_system += f"\n\n{system_prompt}"
+                if simultaneous:
+                    content, latency, tokens, prompt_tokens, streamer = finished[agent_idx]
                 else:
-                    agent_system = system_prompt
-                
-                # N-way round-robin: only show most recent turns to maintain token efficiency
-                hot_turns = turns[-10:] if len(turns) > 10 else turns
-                
-                messages = build_messages(
-                    agent_system, [seed_turn] + hot_turns, agent_idx, agents,
-                    cold_context=cold_context,
-                    world_bible=world_bible,
-                    hidden_goals=hidden_goals,
-                )
-                content, latency, tokens = await call_model(agent, messages, match_id=match_id)
+                    # -- Build message history from this agent's perspective --
+                    hub.publish(RelayEvent.THINKING, {
+                        "match_id": match_id,
+                        "speaker": agent.name,
+                        "model": agent.model,
+                        "round": round_num,
+                    })
+                    content, latency, tokens, prompt_tokens, streamer = await _generate(
+                        agent_idx, agent, turns, round_num,
+                    )
+                if hedge_stats is not None and (hedge_stats.fired, hedge_stats.won) != hedges_saved:
+                    hedges_saved = (hedge_stats.fired, hedge_stats.won)
+                    await db.save_hedge_stats(match_id, *hedges_saved)
 
-                turns.append({"speaker": agent.name, "content": content})
+                turns.append({"speaker": agent.name, "content": content, "round": round_num})
                 turn_id = await db.add_turn(
                     experiment_id=match_id,
                     round_num=round_num,
@@ -855,25 +1519,24 @@ async def run_relay(
                     latency_seconds=latency,
                     token_count=tokens,
                 )
-
-                hub.publish(RelayEvent.TURN, {
-                    "match_id": match_id,
-                    "round": round_num,
-                    "speaker": agent.name,
-                    "model": agent.model,
-                    "content": content,
-                    "latency_s": round(latency, 1),
-                    "turn_id": turn_id,
-                })
+                last_turn_id = turn_id or last_turn_id
+
+                if simultaneous:
+                    hub.publish(RelayEvent.TURN_COMMITTED, {
+                        "match_id": match_id,
+                        "round": round_num,
+                        "speaker": agent.name,
+                        "turn_id": turn_id,
+                    })
+                else:
+                    hub.publish(RelayEvent.TURN, _turn_payload(
+                        match_id, round_num, agent, content, latency, turn_id, prompt_tokens, streamer,
+                    ))
 
                 if enable_scoring and judge_model and turn_id:
-                    _score_task = asyncio.create_task(
-                        _bg_task(score_turn(turn_id, content, judge_model, match_id, hub, db))
-                    )
-                    if background_tasks is not None:
-                        track_task(_score_task, background_tasks)
-                    else:
-                        _score_task.add_done_callback(_log_task_exception)
+                    score_buffer.append((turn_id, agent.name, content))
+                    if len(score_buffer) >= score_window:
+                        _flush_scores()
 
                 _vocab_task = asyncio.create_task(_bg_task(_extract_and_publish_vocab(
                     content, agent.name, round_num, match_id, hub, db, known_words,
@@ -885,13 +1548,22 @@ async def run_relay(
                     _vocab_task.add_done_callback(_log_task_exception)
 
                 # Session 27: Echo Chamber Detection (after each round completes)
-                if enable_echo_detector and agent_idx == len(agents) - 1 and known_words:
-                    similarity = compute_echo_similarity(turns, known_words, agents)
+                # Closest pair of agents decides; with two agents that is the only pair
+                if echo_tracker is not None and agent_idx == len(agents) - 1 and known_words:
+                    echo_tracker.update(turns, known_words)
+                    agent_names = [a.name for a in agents]
+                    similarity, echo_pair = echo_tracker.most_similar(agent_names)
                     if similarity >= echo_warn_threshold:
                         hub.publish(RelayEvent.SIGNAL_ECHO, {
                             "match_id": match_id,
                             "similarity": round(similarity, 3),
                             "round": round_num,
+                            "pair": list(echo_pair),
+                            "agents": agent_names,
+                            "matrix": [
+                                [round(v, 3) for v in row]
+                                for row in echo_tracker.matrix(agent_names)
+                            ],
                         })
                         logger.info("Echo detected for %s: similarity=%.3f", match_id, similarity)
                     if (
@@ -904,7 +1576,7 @@ async def run_relay(
                             "A third voice interrupts: Abandon your shared vocabulary. "
                             "Introduce 3 concepts your partner has never used. Surprise them."
                         )
-                        turns.append({"speaker": "", "content": f"[SYSTEM INTERVENTION]: {nudge}"})
+                        turns.append({"speaker": "", "content": f"[SYSTEM INTERVENTION]: {nudge}", "round": round_num})
                         await db.add_turn(
                             experiment_id=match_id,
                             round_num=round_num,
@@ -936,7 +1608,7 @@ async def run_relay(
                         if intervention:
                             logger.info("Pressure valve TRIGGERED for %s: %s", match_id, intervention)
                             # Inject as a neutral System turn
-                            turns.append({"speaker": "", "content": f"[SYSTEM INTERVENTION]: {intervention}"})
+                            turns.append({"speaker": "", "content": f"[SYSTEM INTERVENTION]: {intervention}", "round": round_num})
                             await db.add_turn(
                                 experiment_id=match_id,
                                 round_num=round_num,
@@ -954,7 +1626,10 @@ async def run_relay(
                                 "turn_id": 0
                             })
 
-                await asyncio.sleep(max(0.0, turn_delay_seconds))
+                # Optional read-along pacing (provider pacing is the rate limiter's);
+                # simultaneous rounds pause once per round, not between agents
+                if turn_delay_seconds > 0 and (not simultaneous or agent_idx == len(agents) - 1):
+                    await asyncio.sleep(turn_delay_seconds)
 
                 # -- Observer after each turn --
                 if observer_model and len(turns) % observer_interval == 0:
@@ -983,7 +1658,8 @@ async def run_relay(
                 logger.info("Mid-experiment agenda reveal for %s at round %d", match_id, round_num)
 
         # -- All rounds done --
-        elapsed = time.time() - start_time
+        _flush_scores()
+        elapsed = sim_clock.now() - start_time
         await db.update_experiment_status(
             match_id, "completed",
             rounds_completed=round_num,
@@ -993,6 +1669,8 @@ async def run_relay(
             "match_id": match_id,
             "rounds": round_num,
             "elapsed_s": round(elapsed, 1),
+            **({"hedges": {"fired": hedge_stats.fired, "won": hedge_stats.won}}
+               if hedge_stats is not None else {}),
         })
         logger.info("Relay %s completed: %d rounds in %.1fs", match_id, round_num, elapsed)
 
@@ -1061,7 +1739,7 @@ async def run_relay(
                 _hyp_task.add_done_callback(_log_task_exception)
 
     except Exception as e:
-        elapsed = time.time() - start_time
+        elapsed = sim_clock.now() - start_time
         logger.error("Relay %s failed after %.1fs: %s", match_id, elapsed, e)
         await db.update_experiment_status(
             match_id, "failed", elapsed_seconds=round(elapsed, 1),
@@ -1070,3 +1748,9 @@ async def run_relay(
             "match_id": match_id,
             "message": "Relay failed unexpectedly. Check server logs.",
         })
+    finally:
+        # A failed or cancelled round must not leave sibling generations running
+        for task in pending:
+            task.cancel()
+        cassette.deactivate(cassette_token)
+        db.evict_layered_context(match_id)
@@ -0,0 +1,245 @@
+"""Content-addressed disk cache for repeatable LLM calls.
+
+Judge scoring, verdicts, hypothesis checks, summaries and documentaries are
+low-temperature calls that often repeat on identical input (re-running an
+analysis, recovering a session). Call sites opt in by passing a site name;
+the response is stored under a hash of (model, messages, temperature,
+max_tokens[, response_format]) in a separate SQLite file so the experiment
+database never grows with it.
+
+Entries expire after LLM_CACHE_TTL_HOURS; past LLM_CACHE_MAX_ENTRIES the least
+recently used are evicted. Cache failures are logged and treated as misses --
+they never fail the call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiosqlite
+import litellm
+
+from server import cassette, rate_limiter
+from server.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_HOURS,
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    site          TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    content       TEXT NOT NULL,
+    finish_reason TEXT,
+    total_tokens  INTEGER,
+    latency_s     REAL NOT NULL,
+    created_at    REAL NOT NULL,
+    last_used     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+_EVICT_EVERY = 50   # puts between TTL/LRU sweeps
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    content: str
+    finish_reason: str | None
+    total_tokens: int | None
+    latency_s: float   # what the original call took -- the latency a hit avoids
+
+
+def cache_key(
+    model: str,
+    messages: list[dict],
+    temperature: float | None,
+    max_tokens: int | None,
+    response_format: dict | None = None,
+) -> str:
+    """sha256 over the inputs that determine a completion."""
+    payload = json.dumps(
+        [model, messages, temperature, max_tokens, response_format],
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU + TTL cache with per-site hit accounting."""
+
+    def __init__(self, path: Path, max_entries: int, ttl_hours: float, enabled: bool = True):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_s = ttl_hours * 3600
+        self.enabled = enabled
+        self._db: aiosqlite.Connection | None = None
+        self._open_lock = asyncio.Lock()
+        self._puts_since_evict = 0
+        self._sites: dict[str, dict[str, float]] = {}
+
+    async def _connection(self) -> aiosqlite.Connection:
+        if self._db is None:
+            async with self._open_lock:
+                if self._db is None:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    db = await aiosqlite.connect(str(self.path))
+                    await db.execute("PRAGMA journal_mode=WAL")
+                    await db.execute("PRAGMA synchronous=NORMAL")
+                    await db.executescript(_SCHEMA)
+                    await db.commit()
+                    self._db = db
+                    await self._evict()
+        return self._db
+
+    def _site(self, site: str) -> dict[str, float]:
+        return self._sites.setdefault(site, {
+            "hits": 0, "misses": 0, "stores": 0, "avoided_latency_s": 0.0, "avoided_tokens": 0,
+        })
+
+    async def get(self, site: str, key: str) -> CachedResponse | None:
+        if not self.enabled or cassette.current() is not None:
+            return None  # cassette runs capture/replay every call
+        counters = self._site(site)
+        try:
+            db = await self._connection()
+            cursor = await db.execute(
+                "SELECT content, finish_reason, total_tokens, latency_s, created_at"
+                " FROM responses WHERE key = ?",
+                (key,),
+            )
+            row = await cursor.fetchone()
+            now = time.time()
+            if row is None or now - row[4] > self.ttl_s:
+                counters["misses"] += 1
+                return None
+            await db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            await db.commit()
+        except (sqlite3.Error, OSError) as exc:
+            logger.warning("LLM cache read failed (%s): %s", site, exc)
+            counters["misses"] += 1
+            return None
+        hit = CachedResponse(content=row[0], finish_reason=row[1], total_tokens=row[2], latency_s=row[3])
+        counters["hits"] += 1
+        counters["avoided_latency_s"] += hit.latency_s
+        counters["avoided_tokens"] += hit.total_tokens or 0
+        return hit
+
+    async def put(
+        self,
+        site: str,
+        key: str,
+        model: str,
+        content: str,
+        latency_s: float,
+        total_tokens: int | None = None,
+        finish_reason: str | None = None,
+    ) -> None:
+        if not self.enabled or cassette.current() is not None:
+            return
+        try:
+            db = await self._connection()
+            now = time.time()
+            await db.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, site, model, content, finish_reason, total_tokens, latency_s, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, site, model, content, finish_reason, total_tokens, latency_s, now, now),
+            )
+            await db.commit()
+            self._site(site)["stores"] += 1
+            self._puts_since_evict += 1
+            if self._puts_since_evict >= _EVICT_EVERY:
+                await self._evict()
+        except (sqlite3.Error, OSError) as exc:
+            logger.warning("LLM cache write failed (%s): %s", site, exc)
+
+    async def _evict(self) -> None:
+        """Drop expired entries, then the least recently used beyond max_entries."""
+        self._puts_since_evict = 0
+        db = self._db
+        await db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_s,))
+        await db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        await db.commit()
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def stats(self) -> dict:
+        hits = sum(c["hits"] for c in self._sites.values())
+        lookups = hits + sum(c["misses"] for c in self._sites.values())
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 3) if lookups else None,
+            "avoided_latency_s": round(sum(c["avoided_latency_s"] for c in self._sites.values()), 2),
+            "avoided_tokens": int(sum(c["avoided_tokens"] for c in self._sites.values())),
+            "sites": {
+                site: {
+                    **c,
+                    "avoided_latency_s": round(c["avoided_latency_s"], 2),
+                    "hit_rate": (
+                        round(c["hits"] / (c["hits"] + c["misses"]), 3)
+                        if c["hits"] + c["misses"] else None
+                    ),
+                }
+                for site, c in sorted(self._sites.items())
+            },
+        }
+
+
+response_cache = ResponseCache(
+    LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_HOURS, enabled=LLM_CACHE_ENABLED,
+)
+
+
+async def acompletion(site: str, **kwargs):
+    """Rate-limited litellm.acompletion served from the cache when possible.
+
+    Hits come back as a litellm.ModelResponse carrying the stored content,
+    finish_reason and total_tokens, so callers treat both paths alike.
+    """
+    key = cache_key(
+        kwargs["model"], kwargs.get("messages") or [], kwargs.get("temperature"),
+        kwargs.get("max_tokens"), kwargs.get("response_format"),
+    )
+    hit = await response_cache.get(site, key)
+    if hit is not None:
+        return litellm.ModelResponse(
+            model=kwargs["model"],
+            choices=[{
+                "index": 0,
+                "message": {"role": "assistant", "content": hit.content},
+                "finish_reason": hit.finish_reason or "stop",
+            }],
+            usage={"total_tokens": hit.total_tokens or 0},
+        )
+    t0 = time.time()
+    response = await rate_limiter.acompletion(**kwargs)
+    choice = response.choices[0]
+    if choice.message.content:
+        await response_cache.put(
+            site, key, kwargs["model"], choice.message.content, time.time() - t0,
+            total_tokens=getattr(getattr(response, "usage", None), "total_tokens", None),
+            finish_reason=choice.finish_reason,
+        )
+    return response
@@ -3,11 +3,13 @@
 Separate from the relay router which handles lifecycle (start/stream).
 """
 
+import json
+
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from server.db import Database
+from server.db import Database, encode_list_cursor
 
 router = APIRouter(tags=["experiments"])
 
@@ -31,15 +33,32 @@ async def list_experiments(
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
     status: str | None = None,
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page (keyset paging; overrides offset)"),
+    fields: str | None = Query(default=None, description="Comma-separated extra columns to include, or * for all"),
 ):
-    """List recent experiments (most recent first). Optional status filter and pagination."""
+    """List recent experiments (most recent first). Optional status filter and pagination.
+
+    Returns a lightweight list projection. ``next_cursor`` is set when a full
+    page came back; pass it as ``cursor`` to fetch the next page.
+    """
     if status and status not in _VALID_STATUSES:
         raise HTTPException(
             400,
             f"Invalid status '{status}'. Valid values: {sorted(_VALID_STATUSES)}",
         )
     db = _get_db(request)
-    return {"experiments": await db.list_experiments(limit=limit, offset=offset, status=status)}
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        experiments = await db.list_experiments(
+            limit=limit, offset=offset, status=status, cursor=cursor, fields=field_list,
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    next_cursor = None
+    if len(experiments) == limit:
+        last = experiments[-1]
+        next_cursor = encode_list_cursor(last["created_at"], last["id"])
+    return {"experiments": experiments, "next_cursor": next_cursor}
 
 
 @router.get("/pairing-oracle")
@@ -87,8 +106,7 @@ async def get_pairing_oracle(
     """
     params.append(min_experiments)
 
-    cursor = await db.db.execute(sql, params)
-    rows = await cursor.fetchall()
+    rows = await db.fetchall(sql, params)
 
     results = []
     for row in rows:
@@ -127,6 +145,30 @@ async def delete_memories(model_a: str, model_b: str, request: Request):
     return {"deleted": deleted}
 
 
+@router.get("/search")
+async def search_experiments(
+    request: Request,
+    q: str = Query(min_length=1, description="Words to search for; a trailing * matches prefixes"),
+    kind: str = Query(default="all", pattern="^(all|turns|vocabulary)$"),
+    model: str | None = None,
+    preset: str | None = None,
+    mode: str | None = None,
+    since: str | None = Query(default=None, description="ISO date/time, inclusive lower bound on experiment created_at"),
+    until: str | None = Query(default=None, description="ISO date/time, inclusive upper bound on experiment created_at"),
+    limit: int = Query(default=20, ge=1, le=100),
+):
+    """Full-text search over transcripts and vocabulary, ranked with snippets.
+
+    Rebuild the index for an existing database with ``python -m server.db rebuild-search``.
+    """
+    db = _get_db(request)
+    results = await db.search(
+        q, kind=kind, model=model, preset=preset, mode=mode,
+        since=since, until=until, limit=limit,
+    )
+    return {"query": q, "count": len(results), "results": results}
+
+
 @router.get("/{experiment_id}")
 async def get_experiment(experiment_id: str, request: Request):
     """Fetch experiment metadata."""
@@ -208,13 +250,12 @@ async def get_experiment_comparison(experiment_id: str, request: Request):
         vocab_count = len(vocab)
         avg_score: float | None = None
         try:
-            scores_cursor = await db.db.execute(
+            row = await db.fetchone(
                 """SELECT AVG((ts.creativity + ts.coherence + ts.engagement + ts.novelty) / 4.0) AS s
                    FROM turn_scores ts JOIN turns t ON ts.turn_id = t.id
                    WHERE t.experiment_id = ?""",
                 (exp["id"],),
             )
-            row = await scores_cursor.fetchone()
             if row and row[0] is not None:
                 avg_score = round(float(row[0]), 2)
         except Exception:
@@ -245,19 +286,49 @@ async def get_experiment_stats(experiment_id: str, request: Request):
 
 
 @router.get("/{experiment_id}/turns")
-async def get_experiment_turns(experiment_id: str, request: Request):
-    """Fetch all turns with full content (for export)."""
+async def get_experiment_turns(
+    experiment_id: str,
+    request: Request,
+    round_from: int | None = Query(default=None, ge=0, description="First round to include"),
+    round_to: int | None = Query(default=None, ge=0, description="Last round to include"),
+    after_turn_id: int | None = Query(default=None, ge=0, description="Only turns with a larger id (resume polling)"),
+    limit: int | None = Query(default=None, ge=1, description="Cap on turns returned (json format only)"),
+    format: str = Query(default="json", pattern="^(json|ndjson)$"),
+):
+    """Fetch turns with full content (for export), optionally a round / id window.
+
+    format=ndjson (or Accept: application/x-ndjson) streams one turn per line
+    as rows are read, so long transcripts render progressively.
+    """
     db = _get_db(request)
     experiment = await db.get_experiment(experiment_id)
     if experiment is None:
         raise HTTPException(404, "Experiment not found")
-    turns = await db.get_turns(experiment_id)
+
+    if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        async def _lines():
+            async for turn in db.iter_turns(
+                experiment_id, round_from=round_from, round_to=round_to,
+                after_turn_id=after_turn_id,
+            ):
+                yield json.dumps(turn) + "\n"
+
+        return StreamingResponse(
+            _lines(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    turns = await db.get_turns(
+        experiment_id, round_from=round_from, round_to=round_to,
+        after_turn_id=after_turn_id, limit=limit,
+    )
     return {"experiment_id": experiment_id, "turns": turns}
 
 
 @router.get("/{experiment_id}/radar")
 async def get_experiment_radar(experiment_id: str, request: Request):
-    """Radar chart data for both models in an experiment (normalized 0-1)."""
+    """Radar chart data for each agent in an experiment (normalized 0-1)."""
     db = _get_db(request)
     experiment = await db.get_experiment(experiment_id)
     if experiment is None:
@@ -320,8 +391,7 @@ async def get_experiment_tree(experiment_id: str, request: Request):
 @router.post("/{experiment_id}/documentary")
 async def generate_documentary(experiment_id: str, request: Request):
     """Generate (or return cached) an AI documentary narrative for an experiment."""
-    import asyncio
-    import litellm
+    from server import response_cache
     from server.config import JUDGE_MODEL
 
     db = _get_db(request)
@@ -399,8 +469,8 @@ async def generate_documentary(experiment_id: str, request: Request):
             f"Keep it under 600 words. Make it engaging and scientifically grounded."
         )
 
-    response = await asyncio.to_thread(
-        litellm.completion,
+    response = await response_cache.acompletion(
+        "documentary",
         model=JUDGE_MODEL,
         messages=[{"role": "user", "content": prompt}],
         max_tokens=1500,
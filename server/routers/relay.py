@@ -11,11 +11,14 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from server import cassette
+from server.circuit_breaker import breakers
 from server.config import (
     DEFAULT_MAX_TOKENS,
     DEFAULT_MODEL_A,
@@ -37,7 +40,9 @@ from server.config import (
 
 # Allowed model strings â€” validated at request time
 _ALLOWED_MODELS: frozenset[str] = frozenset(MODEL_REGISTRY.values())
-from server.relay_engine import PersonaRecord, RelayAgent, run_relay
+from server.rate_limiter import limiter
+from server.relay_engine import PersonaRecord, RelayAgent, get_stream_stats, run_relay
+from server.response_cache import response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +79,10 @@ class RelayStartRequest(BaseModel):
     temperature_b: float = Field(default=DEFAULT_TEMPERATURE, ge=0.0, le=2.0)
     max_tokens: int = Field(default=DEFAULT_MAX_TOKENS, ge=100, le=4096)
     preset: str | None = Field(default=None, description="Preset name (if from Seed Lab)")
-    turn_delay_seconds: float = Field(default=2.0, ge=0.0, le=10.0, description="Seconds to pause between turns")
+    turn_delay_seconds: float = Field(
+        default=0.0, ge=0.0, le=10.0,
+        description="Seconds to pause between turns for reading along (provider pacing is automatic)",
+    )
     judge_model: str | None = Field(default=None, description="litellm model string for the judge (None = use server default)")
     enable_scoring: bool = Field(default=DEFAULT_SCORING_ENABLED, description="Fire-and-forget per-turn scoring via judge model")
     enable_verdict: bool = Field(default=DEFAULT_VERDICT_ENABLED, description="Final verdict from judge after all rounds")
@@ -119,6 +127,30 @@ class RelayStartRequest(BaseModel):
         default=None,
         description="Optional falsifiable prediction about this experiment's outcome.",
     )
+    stream_tokens: bool = Field(
+        default=False,
+        description="Stream each turn as relay.token delta events while it generates",
+    )
+    turn_mode: Literal["sequential", "simultaneous"] = Field(
+        default="sequential",
+        description="'simultaneous' = all agents answer the same round state concurrently",
+    )
+    hedge_requests: bool = Field(
+        default=False,
+        description="Race the first fallback model against turns slower than the model's p90 latency",
+    )
+    score_window: int = Field(
+        default=0, ge=0, le=20,
+        description="Turns scored per batched judge call (0 = one round, 1 = per turn)",
+    )
+    cassette_mode: Literal["off", "record", "replay"] = Field(
+        default="off",
+        description="Record this run's LLM calls to a cassette, or replay one with no network",
+    )
+    cassette_name: str | None = Field(
+        default=None, max_length=100,
+        description="Cassette file name (record defaults to the experiment id; replay requires it)",
+    )
 
 
 class RelayStartResponse(BaseModel):
@@ -174,6 +206,12 @@ def _validate_and_resolve_agents(
         raise HTTPException(400, f"Judge model '{resolved_judge}' is not in the allowed registry")
     if body.observer_model and body.observer_model not in _ALLOWED_MODELS:
         raise HTTPException(400, f"Observer model '{body.observer_model}' is not in the allowed registry")
+    if body.cassette_name is not None and not cassette.valid_name(body.cassette_name):
+        raise HTTPException(400, "cassette_name may only contain letters, digits, '_', '.' and '-'")
+    if body.cassette_mode == "replay" and not (
+        body.cassette_name and cassette.Cassette(body.cassette_name, cassette.REPLAY).exists()
+    ):
+        raise HTTPException(400, "Replay needs the cassette_name of an existing recording")
 
     return resolved_agents, resolved_judge
 
@@ -207,6 +245,9 @@ async def _start_rpg_relay(
         preset=body.preset,
         participant_persona_ids=body.persona_ids,
         campaign_config=body.rpg_config,
+        stream_tokens=body.stream_tokens,
+        cassette_mode=body.cassette_mode,
+        cassette_name=body.cassette_name,
     )
     task = asyncio.create_task(run_rpg_match(
         match_id=match_id,
@@ -337,6 +378,12 @@ async def _start_standard_relay(
                 vocabulary_seed=vocab_seed_data or [],
                 enable_audit=body.enable_audit,
                 hypothesis=body.hypothesis or None,
+                stream_tokens=body.stream_tokens,
+                turn_mode=body.turn_mode,
+                hedge_requests=body.hedge_requests,
+                score_window=body.score_window,
+                cassette_mode=body.cassette_mode,
+                cassette_name=body.cassette_name,
             ),
         )
     )
@@ -407,6 +454,9 @@ async def start_relay(body: RelayStartRequest, request: Request):
                 "observer_interval": body.observer_interval,
                 "participants": body.participants,
                 "rpg_config": body.rpg_config,
+                "stream_tokens": body.stream_tokens,
+                "cassette_mode": body.cassette_mode,
+                "cassette_name": body.cassette_name,
             },
         }
         try:
@@ -524,6 +574,12 @@ async def _create_and_launch_one(
             "observer_interval": body.observer_interval,
             "participants": body.participants,
             "rpg_config": body.rpg_config,
+            "stream_tokens": body.stream_tokens,
+            "turn_mode": body.turn_mode,
+            "hedge_requests": body.hedge_requests,
+            "score_window": body.score_window,
+            "cassette_mode": body.cassette_mode,
+            "cassette_name": body.cassette_name,
         },
     }
     agents_dicts = (
@@ -604,9 +660,8 @@ async def replicate_relay(body: RelayStartRequest, request: Request):
     )
 
     experiment_ids: list[str] = []
+    # Launched back to back: the per-provider rate limiter paces their model calls
     for i in range(n):
-        if i > 0:
-            await asyncio.sleep(2)
         match_id = await _create_and_launch_one(
             body, request, db, hub, seed, system_prompt,
             resolved_agents, resolved_judge,
@@ -700,7 +755,7 @@ async def start_comparison(body: CompareStartRequest, request: Request):
                 {"model": fork_model_a, "temperature": fork_temp_a, "name": get_display_name(fork_model_a)},
                 {"model": fork_model_b, "temperature": fork_temp_b, "name": get_display_name(fork_model_b)},
             ],
-            "turn_delay_seconds": source_config.get("recovery", {}).get("turn_delay_seconds", 2.0),
+            "turn_delay_seconds": source_config.get("recovery", {}).get("turn_delay_seconds", 0.0),
             "preset": source.get("preset"),
             "enable_scoring": enable_scoring,
             "enable_verdict": enable_verdict,
@@ -771,7 +826,7 @@ async def start_comparison(body: CompareStartRequest, request: Request):
             hub=hub,
             db=db,
             relay_config=RelayConfig(
-                turn_delay_seconds=source_config.get("recovery", {}).get("turn_delay_seconds", 2.0),
+                turn_delay_seconds=source_config.get("recovery", {}).get("turn_delay_seconds", 0.0),
                 cancel_event=cancel_event,
                 resume_event=resume_event,
                 preset=source.get("preset"),
@@ -857,8 +912,7 @@ async def inject_turn(match_id: str, body: InjectTurnRequest, request: Request):
     from server.relay_engine import RelayEvent
 
     # Infer round number from current turn count
-    turns = await db.get_turns(match_id)
-    round_num = len(turns) // 2 + 1
+    round_num = await db.count_turns(match_id) // 2 + 1
 
     # -- RPG mode: save turn then signal the engine to continue --
     human_events = getattr(request.app.state, "human_events", {})
@@ -1073,6 +1127,43 @@ async def check_model_status():
     return {"models": results}
 
 
+@router.get("/models/breakers")
+async def get_model_breakers():
+    """Circuit breaker state per model route (closed/open/half_open, error rate, latency)."""
+    return {"routes": breakers.stats()}
+
+
+@router.get("/models/latency")
+async def get_model_latency():
+    """Per-model time to first token and total latency for streamed turns (since startup)."""
+    return {"models": get_stream_stats()}
+
+
+@router.get("/models/rate-limits")
+async def get_rate_limit_stats():
+    """Per-provider limiter state: budgets, AIMD scale, blocked models, wait counters."""
+    return {"providers": limiter.stats()}
+
+
+@router.get("/models/cache")
+async def get_response_cache_stats():
+    """LLM response cache hit rates, avoided latency and tokens, per call site."""
+    return response_cache.stats()
+
+
+@router.get("/models/cassettes")
+async def get_cassette_stats():
+    """Record/replay cassettes opened by this process: requests recorded, replayed, missed."""
+    return cassette.stats()
+
+
+@router.get("/db/metrics")
+async def get_db_metrics(request: Request):
+    """Return DB layer counters (read pool wait times, writer queue depth, context cache hits)."""
+    db = _get_db(request)
+    return db.metrics()
+
+
 @router.get("/env-status")
 async def get_env_status():
     """Check whether a .env file exists at the project root (C5)."""
@@ -1223,6 +1314,9 @@ async def recover_stale_sessions(hub, db, background_tasks: set[asyncio.Task] |
                     campaign_config=recovery.get("rpg_config"),
                     start_round=rpg_state["current_round"],
                     start_index=rpg_state["current_speaker_idx"],
+                    stream_tokens=recovery.get("stream_tokens", False),
+                    cassette_mode=recovery.get("cassette_mode", "off"),
+                    cassette_name=recovery.get("cassette_name"),
                 )
                 task = asyncio.create_task(run_rpg_match(
                     match_id=match_id,
@@ -1263,7 +1357,7 @@ async def recover_stale_sessions(hub, db, background_tasks: set[asyncio.Task] |
                 continue
 
             history_rows = await db.get_turns(match_id)
-            initial_history = [{"speaker": r["speaker"], "content": r["content"]}
+            initial_history = [{"speaker": r["speaker"], "content": r["content"], "round": r["round"]}
                                 for r in history_rows]
 
             max_tokens = config.get("max_tokens", 1500)
@@ -1291,7 +1385,7 @@ async def recover_stale_sessions(hub, db, background_tasks: set[asyncio.Task] |
                 db=db,
                 relay_config=RelayConfig(
                     start_round=turns_done + 1,
-                    turn_delay_seconds=recovery.get("turn_delay_seconds", 2.0),
+                    turn_delay_seconds=recovery.get("turn_delay_seconds", 0.0),
                     cancel_event=cancel_event,
                     resume_event=resume_event,
                     preset=recovery.get("preset"),
@@ -1300,6 +1394,12 @@ async def recover_stale_sessions(hub, db, background_tasks: set[asyncio.Task] |
                     enable_memory=recovery.get("enable_memory", False),
                     initial_history=initial_history,
                     background_tasks=background_tasks,
+                    stream_tokens=recovery.get("stream_tokens", False),
+                    turn_mode=recovery.get("turn_mode", "sequential"),
+                    hedge_requests=recovery.get("hedge_requests", False),
+                    score_window=recovery.get("score_window", 0),
+                    cassette_mode=recovery.get("cassette_mode", "off"),
+                    cassette_name=recovery.get("cassette_name"),
                 ),
             ))
 
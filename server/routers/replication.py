@@ -65,18 +65,18 @@ async def get_replication_group(group_id: str, request: Request):
     exp_ids = json.loads(group.get("experiment_ids_json") or "[]")
     config_snapshot = json.loads(group.get("config_snapshot_json") or "{}")
 
-    # Collect per-experiment status
+    # Collect per-experiment status (members + aggregates in one query)
+    members = await db.get_replication_group_members(group_id)
     experiments = []
     completed_count = 0
     running_count = 0
     failed_count = 0
 
-    for exp_id in exp_ids:
-        exp = await db.get_experiment(exp_id)
-        if not exp:
-            experiments.append({"id": exp_id, "status": "missing"})
+    for m in members:
+        status = m["status"]
+        if status is None:
+            experiments.append({"id": m["id"], "status": "missing"})
             continue
-        status = exp.get("status", "running")
         if status == "completed":
             completed_count += 1
         elif status in ("failed", "stopped"):
@@ -84,15 +84,15 @@ async def get_replication_group(group_id: str, request: Request):
         else:
             running_count += 1
         experiments.append({
-            "id": exp["id"],
+            "id": m["id"],
             "status": status,
-            "rounds_completed": exp.get("rounds_completed", 0),
-            "winner": exp.get("winner"),
-            "created_at": exp.get("created_at"),
+            "rounds_completed": m["rounds_completed"] or 0,
+            "winner": m["winner"],
+            "created_at": m["created_at"],
         })
 
     # Compute aggregate stats from completed experiments
-    stats = await db.get_replication_group_stats(group_id)
+    stats = await db.get_replication_group_stats(group_id, members=members)
     stats["failed"] = failed_count
 
     return {
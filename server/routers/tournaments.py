@@ -12,11 +12,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
+from server import cassette
 from server.config import (
     DEFAULT_MAX_TOKENS,
     DEFAULT_ROUNDS,
@@ -65,6 +67,14 @@ class TournamentStartRequest(BaseModel):
     rounds: int = Field(default=DEFAULT_ROUNDS, ge=1, le=15)
     temperature: float = Field(default=DEFAULT_TEMPERATURE, ge=0.0, le=2.0)
     max_tokens: int = Field(default=DEFAULT_MAX_TOKENS, ge=100, le=4096)
+    cassette_mode: Literal["off", "record", "replay"] = Field(
+        default="off",
+        description="Record every match's LLM calls to one cassette, or replay one with no network",
+    )
+    cassette_name: str | None = Field(
+        default=None, max_length=100,
+        description="Cassette file name (record defaults to the tournament id; replay requires it)",
+    )
 
 
 class TournamentStartResponse(BaseModel):
@@ -103,6 +113,12 @@ async def start_tournament(body: TournamentStartRequest, request: Request):
     for model in body.models:
         if model not in _ALLOWED_MODELS:
             raise HTTPException(400, f"Model '{model}' is not in the allowed registry")
+    if body.cassette_name is not None and not cassette.valid_name(body.cassette_name):
+        raise HTTPException(400, "cassette_name may only contain letters, digits, '_', '.' and '-'")
+    if body.cassette_mode == "replay" and not (
+        body.cassette_name and cassette.Cassette(body.cassette_name, cassette.REPLAY).exists()
+    ):
+        raise HTTPException(400, "Replay needs the cassette_name of an existing recording")
 
     # Resolve preset if specified
     seed = body.seed
@@ -117,6 +133,8 @@ async def start_tournament(body: TournamentStartRequest, request: Request):
     config = {
         "temperature": body.temperature,
         "max_tokens": body.max_tokens,
+        "cassette_mode": body.cassette_mode,
+        "cassette_name": body.cassette_name,
     }
 
     tournament_id = await db.create_tournament(
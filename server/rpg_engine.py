@@ -12,11 +12,9 @@ Phase 20: Role-specific prompts, constrained action menus, world state extractio
 import asyncio
 import json
 import logging
-import time
 from typing import Any
 
-import litellm
-
+from server import cassette, response_cache, sim_clock
 from server.config import (
     CLASS_ACTION_TEMPLATES,
     COMPANION_SYSTEM_PROMPT,
@@ -29,9 +27,10 @@ from server.relay_engine import (
     PersonaRecord,
     RelayAgent,
     RelayEvent,
+    TokenStreamer,
     _bg_task,
     call_model,
-    build_messages,
+    build_context,
     check_pressure_valve,
     track_task,
     _log_task_exception,
@@ -96,7 +95,8 @@ async def _generate_action_menu(
                 "Each option should be 3-8 words. Make them varied: combat, social, exploration, and creative.\n"
                 'Respond ONLY with valid JSON: {"actions": ["option1", "option2", "option3", "option4"]}'
             )
-            res = await litellm.acompletion(
+            res = await response_cache.acompletion(
+                "action_menu",
                 model="gemini/gemini-2.5-flash",
                 messages=[{"role": "user", "content": prompt}],
                 response_format={"type": "json_object"},
@@ -148,6 +148,7 @@ async def run_rpg_match(
     rpg_config = config.campaign_config
     start_round = config.start_round
     start_index = config.start_index
+    stream_tokens = config.stream_tokens
     # Build RelayAgent list for build_messages
     relay_agents = [
         RelayAgent(name=p["name"], model=p["model"])
@@ -158,9 +159,9 @@ async def run_rpg_match(
     # If resuming, load existing turns
     if start_round > 1 or start_index > 0:
         db_turns = await db.get_turns(match_id)
-        turns = [{"speaker": t["speaker"], "content": t["content"], "visibility_json": t.get("visibility_json")} for t in db_turns]
+        turns = [{"speaker": t["speaker"], "content": t["content"], "round": t["round"], "visibility_json": t.get("visibility_json")} for t in db_turns]
 
-    start_time = time.time()
+    start_time = sim_clock.now()
 
     # -- Inject campaign parameters into DM system prompt --
     if rpg_config:
@@ -245,11 +246,12 @@ async def run_rpg_match(
                         backstory=p_data["backstory"],
                     )
 
+    cassette_token = cassette.activate(config.cassette_mode, config.cassette_name or match_id)
     try:
         for round_num in range(start_round, start_round + rounds):
             # Check for cancellation at round boundary
             if cancel_event and cancel_event.is_set():
-                elapsed = time.time() - start_time
+                elapsed = sim_clock.now() - start_time
                 await db.update_experiment_status(
                     match_id, "stopped",
                     rounds_completed=round_num - 1,
@@ -315,12 +317,13 @@ async def run_rpg_match(
                         break
 
                     # Fetch the injected turn from DB to maintain context
-                    db_turns = await db.get_turns(match_id)
+                    db_turns = await db.get_turns(match_id, latest=1)
                     if db_turns:
                         latest = db_turns[-1]
                         turns.append({
                             "speaker": actor["name"],
                             "content": latest["content"],
+                            "round": round_num,
                         })
                     continue
 
@@ -341,9 +344,9 @@ async def run_rpg_match(
                     persona=persona,
                 )
 
-                # Phase 17: Fetch layered context
-                cold_context = await db.get_latest_cold_summary(match_id)
-                world_bible = await db.get_world_state(match_id)
+                # Phase 17: Fetch layered context (cached; the summarizer refreshes it)
+                layered = await db.get_layered_context(match_id)
+                cold_context, world_bible = layered.cold_summary, layered.world_bible
 
                 # Choose role-specific base prompt: DM keeps narrator discipline,
                 # companions get character-focused instructions.
@@ -360,17 +363,22 @@ async def run_rpg_match(
                 else:
                     actor_system = base_prompt
 
-                # RPG uses layered context: Cold recap + World Bible + Hot sliding window
-                hot_turns = turns[-10:] if len(turns) > 10 else turns
-                
+                # RPG uses layered context: Cold recap + World Bible + budgeted Hot window
                 seed_turn = {"speaker": "", "content": seed}
-                messages = build_messages(
-                    actor_system, [seed_turn] + hot_turns, actor_idx, relay_agents,
+                messages, prompt_tokens = build_context(
+                    actor_system, seed_turn, turns, actor_idx, relay_agents, agent.model,
                     cold_context=cold_context,
-                    world_bible=world_bible
+                    world_bible=world_bible,
+                    cold_round=layered.cold_round,
                 )
 
-                _model_task = asyncio.create_task(call_model(agent, messages, match_id=match_id))
+                streamer = (
+                    TokenStreamer(hub, match_id, actor["name"], actor["model"], round_num)
+                    if stream_tokens else None
+                )
+                _model_task = asyncio.create_task(
+                    call_model(agent, messages, match_id=match_id, streamer=streamer)
+                )
                 if cancel_event:
                     _cw = asyncio.create_task(cancel_event.wait())
                     try:
@@ -383,7 +391,7 @@ async def run_rpg_match(
                         await asyncio.gather(_model_task, return_exceptions=True)
                         raise asyncio.CancelledError()
                 content, latency, tokens = await _model_task
-                turns.append({"speaker": actor["name"], "content": content})
+                turns.append({"speaker": actor["name"], "content": content, "round": round_num})
 
                 turn_id = await db.add_turn(
                     experiment_id=match_id,
@@ -403,6 +411,8 @@ async def run_rpg_match(
                     "content": content,
                     "latency_s": round(latency, 1),
                     "turn_id": turn_id,
+                    "prompt_tokens": prompt_tokens,
+                    "ttft_s": round(streamer.ttft, 2) if streamer and streamer.ttft is not None else None,
                 })
 
                 _vocab_task = asyncio.create_task(_bg_task(_extract_and_publish_vocab(
@@ -429,7 +439,7 @@ async def run_rpg_match(
                         intervention = await check_pressure_valve(match_id, turns, JUDGE_MODEL)
                         if intervention:
                             logger.info("RPG Pressure valve TRIGGERED for %s: %s", match_id, intervention)
-                            turns.append({"speaker": "System", "content": intervention})
+                            turns.append({"speaker": "System", "content": intervention, "round": round_num})
                             await db.add_turn(
                                 experiment_id=match_id,
                                 round_num=round_num,
@@ -458,7 +468,7 @@ async def run_rpg_match(
             )
 
         # All rounds finished
-        elapsed = time.time() - start_time
+        elapsed = sim_clock.now() - start_time
         await db.update_experiment_status(
             match_id, "completed",
             rounds_completed=rounds,
@@ -507,3 +517,6 @@ async def run_rpg_match(
             "message": str(e),
         })
         await db.update_experiment_status(match_id, "failed")
+    finally:
+        cassette.deactivate(cassette_token)
+        db.evict_layered_context(match_id)
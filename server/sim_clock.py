@@ -0,0 +1,172 @@
+"""Virtual clock for simulating engines faster than real time.
+
+The relay, RPG and tournament engines pace themselves with asyncio sleeps and
+timeouts (turn delays, retry backoff, Retry-After waits, the 5-minute human
+AFK timeout) and measure themselves with wall-clock reads. Run them on a
+VirtualClockLoop and all of that happens in virtual time:
+
+  - loop.time() is virtual; whenever the loop would block waiting for a timer
+    it jumps straight to that timer instead of sleeping.
+  - now() / monotonic() below return virtual time on that loop and the real
+    clocks everywhere else; engine code reads time through them.
+  - Work handed to threads (aiosqlite connections, run_in_executor) takes no
+    virtual time: while any is outstanding the loop waits for it for real and
+    runs nothing else, so its results land at the same point on every run.
+
+aiosqlite hands work to its connection thread without asking the loop, so
+its futures are recognized by where they are created (aiosqlite.core) and
+released when the thread resolves them through call_soon_threadsafe. That
+depends on aiosqlite internals; requirements.txt caps the version, and run()
+probes the hook first and refuses to simulate if it no longer matches.
+
+With a seeded scripted LLM (fake_llm) and a single database connection, the
+same simulation therefore replays the same events in the same order, in
+seconds of wall time. See server/simulate.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import selectors
+import sys
+import time
+from typing import Any, Awaitable, TypeVar
+
+import aiosqlite
+
+T = TypeVar("T")
+
+# aiosqlite resolves its futures from the connection thread with these helpers
+_AIOSQLITE = "aiosqlite.core"
+_THREAD_WAIT_S = 60.0   # real seconds tracked thread work may take before we give up
+
+
+class _VirtualSelector:
+    """Selector proxy that turns "block until the next timer" into a clock jump."""
+
+    def __init__(self, loop: VirtualClockLoop, selector: selectors.BaseSelector) -> None:
+        self._loop = loop
+        self._selector = selector
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._selector, name)
+
+    def select(self, timeout: float | None = None):
+        loop = self._loop
+        # Thread work in flight: wait for its result (it wakes the self-pipe)
+        # before running anything else or letting virtual time move.
+        if loop._thread_futures:
+            events = self._selector.select(_THREAD_WAIT_S)
+            if events:
+                return events
+            raise RuntimeError(
+                f"{len(loop._thread_futures)} thread call(s) unresolved after {_THREAD_WAIT_S:.0f}s; "
+                "sim_clock's aiosqlite hook is probably out of date"
+            )
+        events = self._selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            return self._selector.select(None)  # no timers: only real I/O can wake us
+        loop.advance(timeout)
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock only moves when every task is waiting on a timer."""
+
+    def __init__(self, start: float = 0.0, start_epoch: float | None = None) -> None:
+        super().__init__(_VirtualSelector(self, selectors.DefaultSelector()))
+        self._now = start
+        self._start = start
+        self.start_epoch = time.time() if start_epoch is None else start_epoch
+        self._thread_futures: set[asyncio.Future] = set()
+        self.thread_calls = 0   # thread hand-offs tracked so far
+
+    def time(self) -> float:
+        return self._now
+
+    def advance(self, seconds: float) -> None:
+        self._now += seconds
+
+    @property
+    def elapsed(self) -> float:
+        """Virtual seconds since the loop was created."""
+        return self._now - self._start
+
+    def call_later(self, delay, callback, *args, context=None):
+        # A real clock always moves past a positive delay; a virtual one only
+        # does if now + delay doesn't round back to now (limiter re-check loops)
+        if delay > 0:
+            delay = max(delay, self._clock_resolution)
+        return super().call_later(delay, callback, *args, context=context)
+
+    def create_future(self) -> asyncio.Future:
+        fut = super().create_future()
+        if sys._getframe(1).f_globals.get("__name__") == _AIOSQLITE:
+            self._thread_futures.add(fut)
+            self.thread_calls += 1
+        return fut
+
+    def run_in_executor(self, executor, func, *args) -> asyncio.Future:
+        fut = super().run_in_executor(executor, func, *args)
+        self._thread_futures.add(fut)
+        self.thread_calls += 1
+        return fut
+
+    def call_soon_threadsafe(self, callback, *args, context=None):
+        # A worker thread delivering a tracked future's result: the wait is over
+        if args and isinstance(args[0], asyncio.Future):
+            self._thread_futures.discard(args[0])
+        return super().call_soon_threadsafe(callback, *args, context=context)
+
+
+async def _check_aiosqlite_hook() -> None:
+    """Fail loudly if the loop no longer sees aiosqlite's thread hand-offs.
+
+    Untracked, a simulation would let virtual time run ahead of queries; never
+    released, the loop would wait on them forever. One query shows which.
+    """
+    loop = asyncio.get_running_loop()
+    assert isinstance(loop, VirtualClockLoop)
+    calls = loop.thread_calls
+    conn = await aiosqlite.connect(":memory:")
+    try:
+        await conn.execute("SELECT 1")
+    finally:
+        tracked, stuck = loop.thread_calls > calls, bool(loop._thread_futures)
+        loop._thread_futures.clear()   # don't let the close below wait on a leak
+        await conn.close()
+    if not tracked or stuck:
+        raise RuntimeError(
+            f"sim_clock cannot follow aiosqlite {aiosqlite.__version__}'s connection thread "
+            f"({'futures not recognized' if not tracked else 'futures never released'}); "
+            "install the version pinned in requirements.txt"
+        )
+
+
+def _virtual_loop() -> VirtualClockLoop | None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return loop if isinstance(loop, VirtualClockLoop) else None
+
+
+def now() -> float:
+    """time.time(), or the virtual wall clock inside a simulation."""
+    loop = _virtual_loop()
+    return time.time() if loop is None else loop.start_epoch + loop.elapsed
+
+
+def monotonic() -> float:
+    """time.monotonic(), or the virtual loop clock inside a simulation."""
+    loop = _virtual_loop()
+    return time.monotonic() if loop is None else loop.time()
+
+
+def run(main: Awaitable[T], start_epoch: float | None = None) -> T:
+    """asyncio.run(main) on a fresh VirtualClockLoop, after checking the aiosqlite hook."""
+    with asyncio.Runner(loop_factory=lambda: VirtualClockLoop(start_epoch=start_epoch)) as runner:
+        runner.run(_check_aiosqlite_hook())
+        return runner.run(main)
@@ -0,0 +1,205 @@
+"""Run the relay, RPG or tournament engine in virtual time against the fake LLM.
+
+Every sleep, timeout and clock read in the engines (turn delays, retry
+backoff, rate-limit waits, breaker cooldowns, the 5-minute human AFK timeout)
+runs on sim_clock's virtual loop, and every model call is answered by a
+seeded fake_llm profile. A 100-match tournament or a 50-round RPG whose
+humans never answer finishes in seconds of wall time, and two runs with the
+same arguments publish the same events in the same order.
+
+The report gives virtual vs wall time, event counts and an event digest:
+a sha256 over every published event (type, payload and virtual timestamp,
+with experiment/tournament ids replaced by their order of appearance). Equal
+digests mean identical event ordering; --events writes the normalized log
+itself for diffing when they differ.
+
+Usage:
+    python -m server.simulate tournament [--models 15] [--rounds 3]
+    python -m server.simulate rpg [--rounds 50] [--humans 1]
+    python -m server.simulate relay [--rounds 10] [--turn-delay 5]
+        [--profile realistic] [--seed 0] [--events log.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+
+from server import fake_llm, sim_clock
+from server.config import MODEL_REGISTRY, RelayConfig, RPGConfig
+from server.db import Database
+from server.event_hub import EventHub
+from server.relay_engine import RelayAgent, run_relay
+from server.response_cache import response_cache
+from server.rpg_engine import run_rpg_match
+from server.tournament_engine import run_tournament
+
+SIM_EPOCH = 1_767_225_600.0   # 2026-01-01T00:00:00Z: virtual wall clock at t=0
+SEED_TEXT = "Invent a shared vocabulary for describing weather on a tidally locked planet."
+SYSTEM_PROMPT = "You are co-creating a language. Coin new words and define them."
+
+
+class _RecordingHub(EventHub):
+    """EventHub that also keeps every published event, in order."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.log: list[tuple[str, dict, float]] = []
+
+    def publish(self, event_type: str, payload: dict, ephemeral: bool = False) -> None:
+        self.log.append((event_type, payload, sim_clock.now()))
+        super().publish(event_type, payload, ephemeral=ephemeral)
+
+
+def _normalized(log: list[tuple[str, dict, float]]) -> list[dict]:
+    """Events with random ids swapped for '#<order of appearance>'."""
+    ids: dict[str, str] = {}
+
+    def norm(key: str, value):
+        if isinstance(value, dict):
+            return {k: norm(k, v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [norm(key, v) for v in value]
+        if isinstance(value, str) and key.endswith("_id") and value:
+            return ids.setdefault(value, f"#{len(ids)}")
+        return value
+
+    return [
+        {"t": round(ts - SIM_EPOCH, 3), "type": event_type, **norm("", payload)}
+        for event_type, payload, ts in log
+    ]
+
+
+async def _tournament(db: Database, hub: EventHub, args) -> None:
+    models = list(MODEL_REGISTRY.values())[:args.models]
+    tournament_id = await db.create_tournament(
+        name="simulation", models=models, seed=SEED_TEXT, system_prompt=SYSTEM_PROMPT,
+        rounds=args.rounds, config={"temperature": 0.7, "max_tokens": args.max_tokens},
+    )
+    await run_tournament(tournament_id, hub, db, asyncio.Event())
+
+
+async def _rpg(db: Database, hub: EventHub, args) -> None:
+    models = [m for m in MODEL_REGISTRY.values() if m.startswith(("openai/", "gemini/"))]
+    participants = [{"name": "Narrator", "model": models[0], "role": "dm"}]
+    participants += [
+        {"name": f"Companion {i + 1}", "model": models[(i + 1) % len(models)], "role": "companion"}
+        for i in range(args.companions)
+    ]
+    participants += [
+        {"name": f"Player {i + 1}", "model": "human", "role": "player"} for i in range(args.humans)
+    ]
+    match_id = await db.create_experiment(
+        model_a=participants[0]["model"], model_b=participants[1]["model"],
+        seed=SEED_TEXT, system_prompt=SYSTEM_PROMPT, rounds_planned=args.rounds,
+        mode="rpg", participants_json=json.dumps(participants),
+    )
+    background: set[asyncio.Task] = set()
+    await run_rpg_match(
+        match_id=match_id,
+        config=RPGConfig(participants=participants, seed=SEED_TEXT, system_prompt=SYSTEM_PROMPT,
+                         rounds=args.rounds),
+        hub=hub, db=db, human_event=asyncio.Event(), background_tasks=background,
+    )
+    await asyncio.gather(*background, return_exceptions=True)
+
+
+async def _relay(db: Database, hub: EventHub, args) -> None:
+    model_a, model_b = "openai/gpt-4.1-mini", "gemini/gemini-2.5-flash"
+    match_id = await db.create_experiment(
+        model_a=model_a, model_b=model_b, seed=SEED_TEXT, system_prompt=SYSTEM_PROMPT,
+        rounds_planned=args.rounds, enable_scoring=True, enable_verdict=True,
+    )
+    background: set[asyncio.Task] = set()
+    await run_relay(
+        match_id=match_id,
+        agents=[
+            RelayAgent(name="Agent A", model=model_a, max_tokens=args.max_tokens),
+            RelayAgent(name="Agent B", model=model_b, max_tokens=args.max_tokens),
+        ],
+        seed=SEED_TEXT, system_prompt=SYSTEM_PROMPT, rounds=args.rounds, hub=hub, db=db,
+        relay_config=RelayConfig(
+            turn_delay_seconds=args.turn_delay, background_tasks=background,
+            enable_scoring=True, enable_verdict=True,
+        ),
+    )
+    await asyncio.gather(*background, return_exceptions=True)
+
+
+_SCENARIOS = {"tournament": _tournament, "rpg": _rpg, "relay": _relay}
+
+
+async def _simulate(args) -> dict:
+    random.seed(args.seed)   # retry jitter
+    llm = fake_llm.install(args.profile, seed=args.seed)
+    response_cache.enabled = False   # a warm cache would change the second run
+    hub = _RecordingHub()
+    with tempfile.TemporaryDirectory(prefix="babel-sim-") as tmp:
+        # One connection: its worker thread answers in submission order
+        db = Database(Path(tmp) / "sim.db", read_pool_size=0)
+        await db.connect()
+        try:
+            wall0 = time.perf_counter()
+            await _SCENARIOS[args.scenario](db, hub, args)
+            wall = time.perf_counter() - wall0
+        finally:
+            await db.close()
+            fake_llm.uninstall()
+
+    events = _normalized(hub.log)
+    lines = [json.dumps(e, sort_keys=True, ensure_ascii=False, default=str) for e in events]
+    if args.events:
+        args.events.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    virtual = sim_clock.now() - SIM_EPOCH
+    return {
+        "scenario": args.scenario,
+        "virtual_s": round(virtual, 1),
+        "wall_s": round(wall, 2),
+        "speedup": round(virtual / wall, 1) if wall else None,
+        "events": len(events),
+        "event_types": dict(Counter(e["type"] for e in events).most_common()),
+        "event_digest": hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest(),
+        "llm": llm.stats(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenario", choices=sorted(_SCENARIOS))
+    parser.add_argument("--rounds", type=int, help="rounds per match (default: 3, rpg 50, relay 10)")
+    parser.add_argument("--models", type=int, default=15, help="tournament models (15 -> 105 matches)")
+    parser.add_argument("--humans", type=int, default=1, help="rpg players who never answer")
+    parser.add_argument("--companions", type=int, default=2, help="rpg AI companions")
+    parser.add_argument("--turn-delay", type=float, default=5.0, help="relay turn_delay_seconds")
+    parser.add_argument("--max-tokens", type=int, default=400)
+    parser.add_argument("--profile", default="realistic", help="fake LLM profile name or YAML path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--events", type=Path, help="write the normalized event log (JSONL) here")
+    args = parser.parse_args()
+    if args.rounds is None:
+        args.rounds = {"tournament": 3, "rpg": 50, "relay": 10}[args.scenario]
+    if not 2 <= args.models <= len(MODEL_REGISTRY):
+        parser.error(f"--models must be between 2 and {len(MODEL_REGISTRY)}")
+
+    report = sim_clock.run(_simulate(args), start_epoch=SIM_EPOCH)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    if os.environ.get("PYTHONHASHSEED") is None:
+        # Set iteration order feeds event payloads; pin it so digests compare
+        env = {**os.environ, "PYTHONHASHSEED": "0"}
+        sys.exit(subprocess.run([sys.executable, "-m", "server.simulate", *sys.argv[1:]], env=env).returncode)
+    main()
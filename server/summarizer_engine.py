@@ -2,90 +2,211 @@
 
 Uses a fast, low-cost model (gemini-2.5-flash) to generate narrative recaps
 (Cold Context) and maintain a persistent JSON world bible (Frozen Context).
+Both are updated incrementally from the turns since the last checkpoint.
 """
 
 import json
 import logging
-from typing import TYPE_CHECKING
+from itertools import groupby
+from typing import TYPE_CHECKING, Any
 
-import litellm
+from server import response_cache
 
 if TYPE_CHECKING:
     from server.db import Database
 
 logger = logging.getLogger(__name__)
 
+# -- Incremental layered context ----------------------------------------------
+#
+# Each update folds only the turns since the last cold_summaries checkpoint
+# into the previous recap, and asks for a JSON merge patch (RFC 7396) against
+# the current world bible instead of re-extracting it. Prompt size is bounded
+# by MAX_FOLD_TURNS, the recap's own length and MAX_BIBLE_ENTRIES -- not by
+# how long the session has run.
+
+HOT_WINDOW_TURNS = 10     # newest turns stay verbatim in agent prompts; never summarized
+MAX_FOLD_TURNS = 30       # most turns folded into the recap per summarizer call
+TURN_EXCERPT_CHARS = 200  # per-turn excerpt length in summarizer prompts
+MAX_BIBLE_ENTRIES = 40    # per section; least recently touched entities drop first
+_BIBLE_SECTIONS = ("npcs", "locations", "items")
+
+# Matches with an update in flight; a concurrent trigger is skipped and the
+# next one catches up, since every update starts from the last checkpoint.
+_updating: set[str] = set()
+
+
+def json_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7396 JSON merge patch. null deletes a key; arrays replace."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            # Re-insert so recently touched entities sort last (see _cap_bible)
+            merged = json_merge_patch(result.pop(key, None), value)
+            result[key] = merged
+    return result
+
+
+def _bible_to_keyed(raw: str | None) -> dict[str, dict[str, dict]]:
+    """Parse the stored bible ({"npcs": [{"name": ...}, ...]}) into name-keyed sections."""
+    try:
+        data = json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        data = {}
+    keyed: dict[str, dict[str, dict]] = {}
+    for section in _BIBLE_SECTIONS:
+        entries = data.get(section) if isinstance(data, dict) else None
+        keyed[section] = {}
+        for entry in entries or []:
+            if isinstance(entry, dict) and entry.get("name"):
+                keyed[section][str(entry["name"])] = {k: v for k, v in entry.items() if k != "name"}
+    return keyed
+
+
+def _bible_from_keyed(keyed: dict[str, dict[str, dict]]) -> str:
+    """Serialize name-keyed sections back to the list format the UI and prompts use."""
+    return json.dumps({
+        section: [
+            {"name": name, **(fields if isinstance(fields, dict) else {"status": str(fields)})}
+            for name, fields in keyed.get(section, {}).items()
+        ]
+        for section in _BIBLE_SECTIONS
+    })
+
+
+def _cap_bible(keyed: dict) -> dict:
+    return {
+        section: dict(list((keyed.get(section) or {}).items())[-MAX_BIBLE_ENTRIES:])
+        if isinstance(keyed.get(section), dict) else {}
+        for section in _BIBLE_SECTIONS
+    }
+
+
+def _fold_chunks(turns: list[dict]) -> list[list[dict]]:
+    """Split turns into whole-round chunks of at most MAX_FOLD_TURNS turns."""
+    chunks: list[list[dict]] = []
+    current: list[dict] = []
+    for round_num, group in groupby(turns, key=lambda t: t["round"]):
+        group = list(group)
+        if current and len(current) + len(group) > MAX_FOLD_TURNS:
+            chunks.append(current)
+            current = []
+        # A single oversized round keeps only its newest turns
+        current.extend(group[-MAX_FOLD_TURNS:])
+    if current:
+        chunks.append(current)
+    return chunks
+
+
 async def update_layered_context(match_id: str, db: "Database", model: str = "gemini/gemini-2.5-flash") -> None:
-    """Background task to condense history and extract entities.
-    
-    1. Fetch all turns.
-    2. Generate a 3-sentence summary of turns older than the Hot window (last 10).
-    3. Extract/Update World Bible (NPCs, Locations, Artifacts).
-    4. Persist to cold_summaries and world_state tables via the writer queue.
+    """Background task to condense history and extract entities, incrementally.
+
+    1. Load the latest cold summary checkpoint and the turns after it.
+    2. Keep the Hot window (last HOT_WINDOW_TURNS turns, widened to whole rounds) out.
+    3. Fold the remaining turns into the prior recap, in bounded chunks.
+    4. Ask for a merge patch against the World Bible (NPCs, Locations, Items) per chunk.
+    5. Persist each chunk's recap and bible via the writer queue, so progress is checkpointed.
     """
+    if match_id in _updating:
+        logger.debug("Layered context update already running for %s; skipping", match_id)
+        return
+    _updating.add(match_id)
     try:
-        turns = await db.get_turns(match_id)
-        hot_threshold = 10
-        if len(turns) <= hot_threshold:
-            return  # not enough turns outside the hot window to summarize
-
-        # --- 1. Cold Summary ---
-        to_summarize = turns[:-hot_threshold]
-        last_summarized_round = to_summarize[-1]["round"]
-        
-        transcript = "\n".join([f"[{t['speaker']}]: {t['content'][:200]}" for t in to_summarize])
-        
-        summary_prompt = (
-            "Recap the following conversation history in 3 concise sentences. "
-            "Focus on major plot points and character decisions. "
-            "Keep it in third-person narrative style.\n\n"
-            f"History:\n{transcript}"
-        )
-        
-        res = await litellm.acompletion(
-            model=model,
-            messages=[{"role": "user", "content": summary_prompt}],
-            max_tokens=150,
-            temperature=0.3
-        )
-        cold_summary = res.choices[0].message.content.strip()
-        
-        # Persist summary via writer queue (auto-commits)
-        await db._execute_queued(
-            """INSERT INTO cold_summaries (match_id, through_round, summary, created_at)
-               VALUES (?, ?, ?, datetime('now'))
-               ON CONFLICT(match_id, through_round) DO UPDATE SET summary=excluded.summary""",
-            (match_id, last_summarized_round, cold_summary)
-        )
+        checkpoint = await db.get_latest_cold_summary_row(match_id)
+        recap = checkpoint["summary"] if checkpoint else None
+        since_round = checkpoint["through_round"] + 1 if checkpoint else None
 
-        # --- 2. World Bible Extraction ---
-        bible_prompt = (
-            "Extract a JSON list of key entities (NPCs, Locations, Artifacts) and their "
-            "current status based on this history. Return ONLY valid JSON:\n"
-            '{"npcs": [{"name": "...", "status": "..."}], "locations": [...], "items": [...]}'
-            "\n\n"
-            f"History:\n{transcript}"
-        )
-        
-        res_b = await litellm.acompletion(
-            model=model,
-            messages=[{"role": "user", "content": bible_prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1
-        )
-        world_state = res_b.choices[0].message.content
-        
-        await db._execute_queued(
-            """INSERT INTO world_state (match_id, state_json, updated_at)
-               VALUES (?, ?, datetime('now'))
-               ON CONFLICT(match_id) DO UPDATE SET state_json=excluded.state_json, updated_at=excluded.updated_at""",
-            (match_id, world_state)
-        )
-        
-        logger.info("Updated layered context for %s through round %d", match_id, last_summarized_round)
+        turns = await db.get_turns(match_id, round_from=since_round)
+        if len(turns) <= HOT_WINDOW_TURNS:
+            return  # not enough new turns outside the hot window to summarize
+        # Only whole rounds are folded, so the next update can resume at through_round + 1
+        hot_start_round = turns[-HOT_WINDOW_TURNS]["round"]
+        to_summarize = [t for t in turns if t["round"] < hot_start_round]
+        if not to_summarize:
+            return
+
+        bible = _bible_to_keyed(await db.get_world_state(match_id))
+
+        for chunk in _fold_chunks(to_summarize):
+            through_round = chunk[-1]["round"]
+            transcript = "\n".join(
+                f"[{t['speaker']}]: {t['content'][:TURN_EXCERPT_CHARS]}" for t in chunk
+            )
+
+            # --- 1. Cold Summary (fold new turns into the prior recap) ---
+            if recap:
+                summary_prompt = (
+                    "Here is a recap of the story so far, followed by what happened next. "
+                    "Rewrite the recap in 3 concise sentences so it covers both. "
+                    "Focus on major plot points and character decisions. "
+                    "Keep it in third-person narrative style.\n\n"
+                    f"Recap so far:\n{recap}\n\n"
+                    f"What happened next:\n{transcript}"
+                )
+            else:
+                summary_prompt = (
+                    "Recap the following conversation history in 3 concise sentences. "
+                    "Focus on major plot points and character decisions. "
+                    "Keep it in third-person narrative style.\n\n"
+                    f"History:\n{transcript}"
+                )
+
+            res = await response_cache.acompletion(
+                "layered_context.recap",
+                model=model,
+                messages=[{"role": "user", "content": summary_prompt}],
+                max_tokens=150,
+                temperature=0.3
+            )
+            recap = res.choices[0].message.content.strip()
+
+            # Persist summary via writer queue (auto-commits, refreshes the context cache)
+            await db.save_cold_summary(match_id, through_round, recap)
+
+            # --- 2. World Bible (merge patch against the current entities) ---
+            bible_prompt = (
+                "You maintain a world bible of key entities (NPCs, Locations, Items), keyed by name:\n"
+                f"{json.dumps(bible)}\n\n"
+                "Based on the new events below, return ONLY a JSON merge patch (RFC 7396) "
+                "with the changes: add or update entities as "
+                '{"npcs": {"<name>": {"status": "..."}}, "locations": {"<name>": {"description": "..."}}, '
+                '"items": {"<name>": {"holder": "...", "significance": "..."}}}, '
+                "set an entity to null to remove it, and omit anything unchanged. "
+                "Return {} if nothing changed."
+                "\n\n"
+                f"New events:\n{transcript}"
+            )
+
+            res_b = await response_cache.acompletion(
+                "layered_context.bible",
+                model=model,
+                messages=[{"role": "user", "content": bible_prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.1
+            )
+            try:
+                patch = json.loads(res_b.choices[0].message.content or "{}")
+            except json.JSONDecodeError as exc:
+                logger.warning("World bible patch unparseable for %s (round %d): %s",
+                               match_id, through_round, exc)
+                continue
+            # Sections must stay objects; a stray list or null would wipe a whole section
+            patch = {k: v for k, v in patch.items() if k in _BIBLE_SECTIONS and isinstance(v, dict)} \
+                if isinstance(patch, dict) else {}
+            if patch:
+                bible = _cap_bible(json_merge_patch(bible, patch))
+                await db.save_world_state(match_id, _bible_from_keyed(bible))
+
+        logger.info("Updated layered context for %s through round %d", match_id, through_round)
 
     except Exception as e:
         logger.error("Layered context update failed for %s: %s", match_id, e)
+    finally:
+        _updating.discard(match_id)
 
 
 async def generate_entity_snapshot(
@@ -99,11 +220,10 @@ async def generate_entity_snapshot(
     Returns a dict on success, or None if the session is empty or the LLM fails.
     """
     try:
-        turns = await db.get_turns(match_id)
-        if not turns:
+        recent = await db.get_turns(match_id, latest=15)
+        if not recent:
             return None
 
-        recent = turns[-15:]
         transcript = "\n".join(
             f"[{t['speaker']}]: {t['content'][:300]}" for t in recent
         )
@@ -131,7 +251,8 @@ async def generate_entity_snapshot(
             f"{context}"
         )
 
-        res = await litellm.acompletion(
+        res = await response_cache.acompletion(
+            "entity_snapshot",
             model=model,
             messages=[{"role": "user", "content": prompt}],
             response_format={"type": "json_object"},
@@ -9,9 +9,9 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import time
 from typing import TYPE_CHECKING
 
+from server import sim_clock
 from server.config import get_display_name, RelayConfig
 from server.relay_engine import RelayAgent, run_relay
 
@@ -56,7 +56,7 @@ async def run_tournament(
 
     temperature = config.get("temperature", 0.7)
     max_tokens = config.get("max_tokens", 1500)
-    start_time = time.time()
+    start_time = sim_clock.now()
 
     await db.update_tournament_status(tournament_id, "running")
 
@@ -69,7 +69,7 @@ async def run_tournament(
                 for m in matches:
                     if m["status"] == "pending":
                         await db.update_tournament_match(m["id"], "skipped")
-                elapsed = time.time() - start_time
+                elapsed = sim_clock.now() - start_time
                 await db.update_tournament_status(
                     tournament_id, "cancelled", completed_matches=completed,
                 )
@@ -136,6 +136,7 @@ async def run_tournament(
                 max_tokens=max_tokens,
             )
 
+            match_tasks: set[asyncio.Task] = set()
             try:
                 await run_relay(
                     match_id=experiment_id,
@@ -149,10 +150,26 @@ async def run_tournament(
                     relay_config=RelayConfig(
                         cancel_event=cancel_event,
                         preset=tournament.get("preset"),
+                        background_tasks=match_tasks,
+                        # One cassette per tournament: replaying needs a name that
+                        # outlives the per-match experiment ids
+                        cassette_mode=config.get("cassette_mode", "off"),
+                        cassette_name=config.get("cassette_name") or tournament_id,
                     ),
                 )
+                # Let trailing vocab extraction land before the match is tallied
+                if match_tasks:
+                    await asyncio.gather(*match_tasks, return_exceptions=True)
                 await db.update_tournament_match(match["id"], "completed")
                 completed += 1  # only count successfully completed matches
+                try:
+                    await db.accumulate_tournament_match_stats(match["id"])
+                except Exception as e:
+                    # Leaderboard catches up on its next read
+                    logger.warning(
+                        "Tournament %s match %d stats not accumulated: %s",
+                        tournament_id, match["match_order"], e,
+                    )
             except Exception as e:
                 logger.error(
                     "Tournament %s match %d failed: %s",
@@ -173,7 +190,7 @@ async def run_tournament(
             })
 
         # All matches done
-        elapsed = time.time() - start_time
+        elapsed = sim_clock.now() - start_time
         await db.update_tournament_status(
             tournament_id, "completed", completed_matches=completed,
         )
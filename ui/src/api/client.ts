@@ -106,11 +106,13 @@ export const api = {
   },
 
   /** List all experiments (Gallery page) */
-  listExperiments: (params?: { limit?: number; offset?: number; status?: string }) => {
+  listExperiments: (params?: { limit?: number; offset?: number; status?: string; cursor?: string | null; fields?: string[] }) => {
     const query = new URLSearchParams();
     if (params?.limit) query.set('limit', String(params.limit));
     if (params?.offset) query.set('offset', String(params.offset));
     if (params?.status) query.set('status', params.status);
+    if (params?.cursor) query.set('cursor', params.cursor);
+    if (params?.fields?.length) query.set('fields', params.fields.join(','));
     return fetchJson<ExperimentsListResponse>(`/api/experiments/?${query.toString()}`);
   },
 
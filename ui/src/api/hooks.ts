@@ -16,6 +16,8 @@ export interface ExperimentState {
   currentRound: number;
   totalRounds: number;
   thinkingSpeaker: string | null;
+  /** Partial text of the turn being streamed (relay.token), if any */
+  streamingText: string | null;
   status: 'idle' | 'running' | 'paused' | 'completed' | 'error' | 'stopped';
   preset: string | null;
   observers: ObserverEvent[];
@@ -40,6 +42,7 @@ export function useExperimentState(events: RelaySSEEvent[]): ExperimentState {
       currentRound: 0,
       totalRounds: 0,
       thinkingSpeaker: null,
+      streamingText: null,
       status: 'idle',
       preset: null,
       elapsed: null,
@@ -58,15 +61,29 @@ export function useExperimentState(events: RelaySSEEvent[]): ExperimentState {
       switch (event.type) {
         case 'relay.thinking':
           state.thinkingSpeaker = event.speaker;
+          state.streamingText = null;
           state.status = 'running';
           break;
+        case 'relay.token':
+          // sse.ts folds consecutive deltas, so delta holds the text so far
+          state.thinkingSpeaker = event.speaker;
+          state.streamingText = event.delta;
+          break;
         case 'relay.turn':
           if (state.status === 'error') state.status = 'running'; // reset transient error when match continues
           state.turns.push(event);
           state.thinkingSpeaker = null;
+          state.streamingText = null;
           state.currentRound = event.round;
           state.isAwaitingHuman = false;
           break;
+        case 'relay.turn_committed': {
+          const idx = state.turns.findIndex(
+            (t) => t.turn_id == null && t.round === event.round && t.speaker === event.speaker,
+          );
+          if (idx >= 0) state.turns[idx] = { ...state.turns[idx], turn_id: event.turn_id };
+          break;
+        }
         case 'relay.round':
           state.currentRound = event.round;
           state.totalRounds = event.rounds_total;
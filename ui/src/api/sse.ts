@@ -71,11 +71,19 @@ export function useSSE(
           setEvents((prev) => {
             // Deduplicate on reconnect: skip events already in history.
             if (parsed.type === 'relay.turn') {
-              const turnId = (parsed as { turn_id: string }).turn_id;
-              if (prev.some((e) => e.type === 'relay.turn' && (e as { turn_id: string }).turn_id === turnId)) {
+              const turnId = (parsed as { turn_id: string | null }).turn_id;
+              if (turnId != null && prev.some((e) => e.type === 'relay.turn' && (e as { turn_id: string }).turn_id === turnId)) {
                 return prev;
               }
             }
+            // Fold token deltas into the previous token event for the same speaker,
+            // so a streamed turn occupies one history slot instead of hundreds.
+            if (parsed.type === 'relay.token') {
+              const last = prev[prev.length - 1];
+              if (!parsed.reset && last?.type === 'relay.token' && last.speaker === parsed.speaker) {
+                return [...prev.slice(0, -1), { ...parsed, delta: last.delta + parsed.delta }];
+              }
+            }
             const next = [...prev, parsed];
             return next.length > maxHistory ? next.slice(-maxHistory) : next;
           });
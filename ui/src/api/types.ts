@@ -72,6 +72,18 @@ export interface RelayStartRequest {
   baseline_for_experiment_id?: string;
   // Spec 005: Hypothesis Testing Mode
   hypothesis?: string | null;
+  /** Stream each turn as relay.token deltas while it generates */
+  stream_tokens?: boolean;
+  /** 'simultaneous' = all agents answer the same round state concurrently */
+  turn_mode?: 'sequential' | 'simultaneous';
+  /** Race the first fallback model against turns slower than the model's p90 latency */
+  hedge_requests?: boolean;
+  /** Turns scored per batched judge call (0 = one round, 1 = per turn) */
+  score_window?: number;
+  /** Record this run's LLM calls to a cassette, or replay one with no network */
+  cassette_mode?: 'off' | 'record' | 'replay';
+  /** Cassette file name (record defaults to the experiment id; replay requires it) */
+  cassette_name?: string;
 }
 
 /** POST /api/relay/start response */
@@ -121,7 +133,24 @@ export interface TurnEvent extends BaseSSEEvent {
   model: string;
   content: string;
   latency_s: number;
-  turn_id: string;
+  /** null for a simultaneous-mode turn until relay.turn_committed carries its id */
+  turn_id: string | null;
+  /** Prompt tokens the context builder assembled for this turn */
+  prompt_tokens?: number;
+  /** Time to first token (streamed turns only) */
+  ttft_s?: number | null;
+}
+
+/** relay.token — streamed text delta for the turn in progress (live only, not replayed) */
+export interface TokenEvent extends BaseSSEEvent {
+  type: 'relay.token';
+  speaker: string;
+  model: string;
+  round: number;
+  delta: string;
+  seq: number;
+  /** true when a retry discarded earlier partial output */
+  reset: boolean;
 }
 
 /** relay.round — both models finished a round */
@@ -231,8 +260,11 @@ export interface ChemistryReadyEvent extends BaseSSEEvent {
 /** Session 27: Echo Chamber events */
 export interface EchoSignalEvent extends BaseSSEEvent {
   type: 'relay.signal_echo';
-  similarity: number;
+  similarity: number;   // closest pair of agents
   round: number;
+  pair?: [string, string];
+  agents?: string[];
+  matrix?: number[][];  // pairwise similarity, rows/cols in agents order
 }
 
 export interface EchoInterventionEvent extends BaseSSEEvent {
@@ -269,10 +301,20 @@ export interface HumanTimeoutEvent extends BaseSSEEvent {
   round: number;
 }
 
+/** relay.turn_committed -- a simultaneous-mode turn was persisted; carries its turn_id */
+export interface TurnCommittedEvent extends BaseSSEEvent {
+  type: 'relay.turn_committed';
+  round: number;
+  speaker: string;
+  turn_id: string;
+}
+
 /** Discriminated union — switch on `type` for type narrowing */
 export type RelaySSEEvent =
   | ThinkingEvent
   | TurnEvent
+  | TurnCommittedEvent
+  | TokenEvent
   | RoundCompleteEvent
   | MatchCompleteEvent
   | ErrorEvent
@@ -446,6 +488,8 @@ export interface ExperimentRecord {
   documentary?: string | null;
   // Session 27: new backend columns
   hidden_goals_json?: string | null;
+  /** List projection only: true when hidden_goals_json is set */
+  has_hidden_goals?: boolean;
   vocabulary_seed_id?: string | null;
   audit_experiment_id?: string | null;
   revelation_round?: number | null;
@@ -465,6 +509,11 @@ export interface ExperimentRecord {
   // Spec 006: A/B Comparison groups
   comparison_group_id?: string | null;
   comparison_variant?: number | null;  // 0 = control, 1 = fork
+  // Hedged requests: backup model launched / answered first
+  hedges_fired?: number;
+  hedges_won?: number;
+  // Judge/scorer LLM calls made for this experiment
+  judge_calls?: number;
 }
 
 // ── Spec 006: A/B Comparison ─────────────────────────────────
@@ -523,9 +572,11 @@ export interface TurnScoresResponse {
   scores: TurnScore[];
 }
 
-/** GET /api/experiments/ response */
+/** GET /api/experiments/ response (list projection; see `fields` to request more columns) */
 export interface ExperimentsListResponse {
   experiments: ExperimentRecord[];
+  /** Pass as `cursor` to fetch the next page; null on the last page */
+  next_cursor: string | null;
 }
 
 // ── Analytics Types ─────────────────────────────────────────────
@@ -588,6 +639,9 @@ export interface TournamentStartRequest {
   rounds: number;
   temperature: number;
   max_tokens: number;
+  /** Record every match's LLM calls to one cassette, or replay one with no network */
+  cassette_mode?: 'off' | 'record' | 'replay';
+  cassette_name?: string;
 }
 
 /** POST /api/tournaments/start response */
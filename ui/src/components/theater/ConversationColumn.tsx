@@ -13,6 +13,8 @@ interface ConversationColumnProps {
   speakerName: string
   turns: TurnEvent[]
   thinkingSpeaker: string | null
+  /** Partial text streamed so far for the thinking speaker (relay.token) */
+  streamingText?: string | null
   /** Which agent slot this column represents (0-3). Drives dynamic color. */
   agentIndex: number
   /** @deprecated pass agentIndex instead; kept for backward compat with TurnBubble */
@@ -36,6 +38,7 @@ export function ConversationColumn({
   speakerName,
   turns,
   thinkingSpeaker,
+  streamingText,
   agentIndex,
   color,
   scores,
@@ -66,7 +69,7 @@ export function ConversationColumn({
     if (isNearBottomRef.current) {
       bottomRef.current?.scrollIntoView({ behavior: 'smooth' })
     }
-  }, [myTurns.length, isThinking])
+  }, [myTurns.length, isThinking, streamingText])
 
   // Dynamic color from agentIndex; fall back to legacy color prop derivation
   const agentColor = AGENT_COLORS[agentIndex] ?? (color === 'model-b' ? '#06B6D4' : '#F59E0B')
@@ -106,20 +109,25 @@ export function ConversationColumn({
             const prevRound = i > 0 ? myTurns[i - 1].round : 0
             const showDivider = turn.round > prevRound && i > 0
             return (
-              <div key={turn.turn_id}>
+              <div key={turn.turn_id ?? `${turn.round}-${turn.speaker}`}>
                 {showDivider && <RoundDivider round={turn.round} />}
                 <TurnBubble
                   turn={turn}
                   color={bubbleColor}
                   accentColor={agentColor}
-                  score={scores?.[turn.turn_id]}
-                  isLatest={turn.turn_id === latestTurnId}
+                  score={turn.turn_id != null ? scores?.[turn.turn_id] : undefined}
+                  isLatest={turn.turn_id != null && turn.turn_id === latestTurnId}
                   vocab={vocab}
                   experimentId={experimentId}
                 />
               </div>
             )
           })}
+          {isThinking && streamingText && (
+            <p className="px-3 py-2 text-sm whitespace-pre-wrap text-text-primary/80 animate-fade-in">
+              {streamingText}
+            </p>
+          )}
           {isThinking && <ThinkingIndicator speaker={speakerName} color={bubbleColor} />}
           <div ref={bottomRef} />
         </div>
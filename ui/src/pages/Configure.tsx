@@ -48,7 +48,7 @@ export default function Configure() {
   const [maxTokens, setMaxTokens] = useState(1500)
   const [seed, setSeed] = useState('')
   const [systemPrompt, setSystemPrompt] = useState('')
-  const [turnDelay, setTurnDelay] = useState(2.0)
+  const [turnDelay, setTurnDelay] = useState(0)
   const [seedEditing, setSeedEditing] = useState(false)
   const [promptEditing, setPromptEditing] = useState(false)
   const [starting, setStarting] = useState(false)
@@ -92,6 +92,9 @@ export default function Configure() {
   // -- Session 27: Audit --
   const [enableAudit, setEnableAudit] = useState(false)
 
+  // -- Live token streaming --
+  const [streamTokens, setStreamTokens] = useState(false)
+
   // -- Spec 017: Replication Runs --
   const [replicationCount, setReplicationCount] = useState(1)
 
@@ -211,6 +214,7 @@ export default function Configure() {
             if (decoded.enableEchoDetector != null) setEnableEchoDetector(decoded.enableEchoDetector)
             if (decoded.enableEchoIntervention != null) setEnableEchoIntervention(decoded.enableEchoIntervention)
             if (decoded.enableAudit != null) setEnableAudit(decoded.enableAudit)
+            if (decoded.streamTokens != null) setStreamTokens(decoded.streamTokens)
             if (decoded.replicationCount != null) setReplicationCount(decoded.replicationCount)
             if (decoded.hiddenGoals != null) setHiddenGoals(decoded.hiddenGoals)
             if (decoded.revelationRound !== undefined) setRevelationRound(decoded.revelationRound)
@@ -251,7 +255,7 @@ export default function Configure() {
       agents, rounds, maxTokens, turnDelay, seed, systemPrompt,
       judgeModel, enableScoring, enableVerdict, enableMemory,
       observerModel, observerInterval, enableEchoDetector,
-      enableEchoIntervention, enableAudit, replicationCount,
+      enableEchoIntervention, enableAudit, streamTokens, replicationCount,
       hiddenGoals, revelationRound,
     }
     const url = new URL(window.location.href)
@@ -368,6 +372,9 @@ export default function Configure() {
       if (enableAudit) {
         (request as unknown as Record<string, unknown>).enable_audit = true
       }
+      if (streamTokens) {
+        request.stream_tokens = true
+      }
       // Spec 005: Hypothesis
       if (hypothesis.trim()) {
         request.hypothesis = hypothesis.trim()
@@ -856,6 +863,24 @@ export default function Configure() {
             </p>
           </div>
 
+          {/* Live token streaming */}
+          <div className="space-y-3">
+            <div className="neural-section-label flex items-center gap-1.5">// streaming <Tooltip content="Show each response as it is generated instead of waiting for the whole turn." /></div>
+
+            <button
+              type="button"
+              onClick={() => setStreamTokens(!streamTokens)}
+              className="flex items-center gap-3 group w-full text-left"
+            >
+              <div className={`relative w-8 h-4 rounded-full transition-colors ${streamTokens ? 'bg-violet-500/70' : 'bg-border-custom'}`}>
+                <div className={`absolute top-0.5 w-3 h-3 rounded-full transition-transform bg-white/90 ${streamTokens ? 'translate-x-[18px]' : 'translate-x-0.5'}`} />
+              </div>
+              <span className="font-mono text-[10px] text-text-dim tracking-wider uppercase group-hover:text-text-primary transition-colors">
+                Live token streaming
+              </span>
+            </button>
+          </div>
+
           {/* Error */}
           {formError && (
             <p className="font-mono text-xs text-danger">// {formError}</p>
@@ -54,14 +54,16 @@ export default function Gallery() {
   const [error, setError] = useState<string | null>(null)
   const [statusFilter, setStatusFilter] = useState<StatusFilter>('all')
   const [page, setPage] = useState(0)
+  // Keyset paging: cursors[p] fetches page p (page 0 has none); null = no further page
+  const [cursors, setCursors] = useState<(string | null)[]>([null])
   const [confirmDelete, setConfirmDelete] = useState<string | null>(null)
   const [showControls, setShowControls] = useState(false)  // Spec 018: baseline experiments hidden by default
 
   const fetchExperiments = useCallback(() => {
     setLoading(true)
-    const params: { limit: number; offset: number; status?: string } = {
+    const params: { limit: number; cursor?: string | null; status?: string } = {
       limit: PAGE_SIZE,
-      offset: page * PAGE_SIZE,
+      cursor: cursors[page],
     }
     if (statusFilter !== 'all') params.status = statusFilter
     Promise.all([
@@ -71,10 +73,11 @@ export default function Gallery() {
       .then(([expRes, groupRes]) => {
         setExperiments(expRes.experiments)
         setReplicationGroups(groupRes.groups)
+        setCursors((prev) => [...prev.slice(0, page + 1), expRes.next_cursor])
       })
       .catch((err) => setError(err instanceof Error ? err.message : 'Failed to load experiments'))
       .finally(() => setLoading(false))
-  }, [page, statusFilter])
+  }, [page, statusFilter]) // eslint-disable-line react-hooks/exhaustive-deps
 
   useEffect(() => {
     fetchExperiments()
@@ -119,7 +122,7 @@ export default function Gallery() {
           {STATUS_FILTERS.map((filter) => (
             <button
               key={filter}
-              onClick={() => { setStatusFilter(filter); setPage(0) }}
+              onClick={() => { setStatusFilter(filter); setPage(0); setCursors([null]) }}
               className={
                 statusFilter === filter
                   ? 'font-mono text-[10px] tracking-widest uppercase px-2.5 py-1 rounded-sm border bg-accent/15 border-accent/60 text-accent'
@@ -302,7 +305,7 @@ export default function Gallery() {
                           inherited
                         </span>
                       )}
-                      {exp.hidden_goals_json && (
+                      {exp.has_hidden_goals && (
                         <span className="font-mono text-[9px] tracking-wider text-amber-400/70 border border-amber-500/25 px-1.5 py-0.5 rounded-sm uppercase">
                           adversarial
                         </span>
@@ -430,7 +433,7 @@ export default function Gallery() {
             </span>
             <button
               onClick={() => setPage((p) => p + 1)}
-              disabled={experiments.length < PAGE_SIZE}
+              disabled={!cursors[page + 1]}
               className="neural-btn disabled:opacity-30 disabled:cursor-not-allowed"
             >
               Next &rarr;
@@ -398,6 +398,7 @@ export default function Theater() {
             speakerName={slot.name}
             turns={effectiveTurns}
             thinkingSpeaker={experiment.thinkingSpeaker}
+            streamingText={experiment.streamingText}
             agentIndex={idx}
             scores={effectiveScores}
             latestTurnId={latestTurnId}